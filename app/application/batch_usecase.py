@@ -0,0 +1,65 @@
+from __future__ import annotations
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit
+from ..domain.models import BatchItemResult, BatchResult
+from .extract_usecase import ExtractUseCase, safe_filename
+import asyncio
+import hashlib
+import os
+import time
+
+
+def batch_folder_name(url: str) -> str:
+    """Sub-destination of one batch URL: readable, and unique per URL.
+
+    safe_filename() truncates and maps every punctuation character to "-", so
+    distinct URLs can share it (long common prefixes, "?id=1" vs "/id=1"); a
+    short hash of the full URL keeps their folders apart.
+    """
+    return f"{safe_filename(url)}-{hashlib.sha256(url.encode('utf-8')).hexdigest()[:10]}"
+
+
+class BatchExtractUseCase:
+    """Runs ExtractUseCase for many URLs with a global and a per-host concurrency cap.
+
+    Each URL is written to its own sub-destination (see batch_folder_name) so image
+    filenames and manifests from different pages never collide.
+    """
+
+    def __init__(self, usecase: ExtractUseCase, concurrency: int = 8, per_host_concurrency: int = 2):
+        self.usecase = usecase
+        self.concurrency = max(1, concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+
+
+    async def execute(self, urls: Iterable[str], destination_name: str = "") -> BatchResult:
+        # De-dup while preserving order
+        unique: List[str] = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        global_slots = asyncio.Semaphore(self.concurrency)
+        host_slots: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host_concurrency))
+
+        started = time.perf_counter()
+        items = await asyncio.gather(*[
+            self._run_one(url, destination_name, global_slots, host_slots[urlsplit(url).netloc.lower()])
+            for url in unique
+        ])
+        return BatchResult(items=list(items), elapsed_s=round(time.perf_counter() - started, 3))
+
+
+    async def _run_one(self, url: str, destination_name: str, global_slots: asyncio.Semaphore,
+                       host_slot: asyncio.Semaphore) -> BatchItemResult:
+        folder = batch_folder_name(url)
+        destination = os.path.join(destination_name, folder) if destination_name else folder
+        # Take the host slot first so a busy host does not hold global slots while it waits
+        async with host_slot:
+            async with global_slots:
+                started = time.perf_counter()
+                try:
+                    result = await self.usecase.execute(url, destination)
+                except Exception as e:
+                    return BatchItemResult(url=url, status="error", destination=destination,
+                                           elapsed_s=round(time.perf_counter() - started, 3), error=str(e) or type(e).__name__)
+        return BatchItemResult(url=url, status="ok", destination=destination,
+                               elapsed_s=round(time.perf_counter() - started, 3), image_count=len(result.image_filenames),
+                               skipped=result.skipped)
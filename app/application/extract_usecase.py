@@ -1,41 +1,192 @@
 from __future__ import annotations
-from typing import List
-from ..domain.ports import HttpClientPort, ContentExtractorPort, ImageExtractorPort, StoragePort
-from ..domain.models import ExtractionResult
+from concurrent.futures import Executor
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from ..domain.errors import FetchRejected
+from ..domain.ports import HttpClientPort, HtmlParserPort, ContentExtractorPort, ImageExtractorPort, ImageStorePort, MetricsPort, StoragePort
+from ..domain.models import ExtractionEvent, ExtractionFinished, ExtractionResult, ImageProcessed, MarkdownReady
+from .instrumentation import ExtractionTrace, NullMetrics
+from .manifest import ExtractionManifest, ManifestImage, manifest_filename
+import asyncio
+import hashlib
 import os
+import time
+
+
+# Called with (images done, images total) once the image list is known and after each image
+ProgressCallback = Callable[[int, int], None]
+
+
+def analyze_page(parser: HtmlParserPort, content_ext: ContentExtractorPort, image_ext: ImageExtractorPort,
+                 html: str, url: str) -> Tuple[str, List[str], Dict[str, float]]:
+    """CPU-bound part of an extraction: parse once, extract markdown and image URLs.
+
+    Kept at module level with picklable arguments so it can run in a process pool;
+    the parsed tree never leaves the worker. Stage timings are measured here and
+    returned because the worker cannot reach the caller's metrics.
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    page = parser.parse(html, url)
+    timings["parse"] = time.perf_counter() - started
+    started = time.perf_counter()
+    markdown = content_ext.extract_markdown(page)
+    timings["extract_content"] = time.perf_counter() - started
+    started = time.perf_counter()
+    image_urls = list(image_ext.discover_image_urls(page))
+    timings["discover_images"] = time.perf_counter() - started
+    return markdown, image_urls, timings
+
+
+def image_cache_key(source: bytes, variant: str) -> str:
+    """Key a resized image by the hash of its source bytes and the resize parameters."""
+    digest = hashlib.sha256(source)
+    digest.update(b"\0" + variant.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def safe_filename(url: str) -> str:
+    keep = [c if c.isalnum() else "-" for c in url]
+    out = "".join(keep).strip("-")
+    return out[:80] or "page"
 
 
 class ExtractUseCase:
-    def __init__(self, http: HttpClientPort, content_ext: ContentExtractorPort, image_ext: ImageExtractorPort, storage: StoragePort):
+    def __init__(self, http: HttpClientPort, parser: HtmlParserPort, content_ext: ContentExtractorPort, image_ext: ImageExtractorPort,
+                 storage: StoragePort, image_concurrency: int = 8, cpu_executor: Optional[Executor] = None,
+                 image_store: Optional[ImageStorePort] = None, image_max_bytes: Optional[int] = None,
+                 metrics: Optional[MetricsPort] = None, trace_logs: bool = False, incremental: bool = False):
         self.http = http
+        self.parser = parser
         self.content_ext = content_ext
         self.image_ext = image_ext
         self.storage = storage
+        # Max parallel image downloads, and the largest image body accepted
+        self.image_concurrency = max(1, image_concurrency)
+        self.image_max_bytes = image_max_bytes
+        # Extraction and resizing run on cpu_executor (thread or process pool);
+        # None runs them inline on the event loop.
+        self.cpu_executor = cpu_executor
+        # Optional content-addressed cache of resized images shared across extractions
+        self.image_store = image_store
+        # Stage timings and counters; trace_logs adds one JSON log line per extraction
+        self.metrics = metrics or NullMetrics()
+        self.trace_logs = trace_logs
+        # Keep a manifest per page and skip unchanged pages and images on re-runs
+        self.incremental = incremental
+
 
+    async def execute(self, url: str, destination_name: str,
+                      progress: Optional[ProgressCallback] = None) -> ExtractionResult:
+        result: Optional[ExtractionResult] = None
+        async with aclosing(self.stream(url, destination_name)) as events:
+            async for event in events:
+                if isinstance(event, ExtractionFinished):
+                    result = event.result
+                elif progress is not None:
+                    if isinstance(event, MarkdownReady):
+                        progress(0, event.image_count)
+                    else:
+                        progress(event.done, event.total)
+        assert result is not None
+        return result
 
-    async def execute(self, url: str, destination_name: str) -> ExtractionResult:
-        dest = self.storage.ensure_destination(destination_name)
 
+    async def stream(self, url: str, destination_name: str) -> AsyncIterator[ExtractionEvent]:
+        """Run one extraction as a sequence of events: the markdown as soon as it is
+        extracted, an ImageProcessed per image in completion order, then the result.
 
-        html = await self.http.get_text(url)
-        markdown = self.content_ext.extract_markdown(html, url)
+        Closing the generator early cancels the image work still in flight.
+        """
+        trace = ExtractionTrace(url, self.metrics, enabled=self.trace_logs)
+        try:
+            async with aclosing(self._stream(url, destination_name, trace)) as events:
+                async for event in events:
+                    if isinstance(event, ExtractionFinished):
+                        result = event.result
+                        trace.finish("ok", images=len(result.image_filenames), skipped=result.skipped,
+                                     skipped_images=len(result.skipped_images))
+                    yield event
+        except Exception as e:
+            trace.finish("error", error=str(e) or type(e).__name__)
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            trace.finish("cancelled")
+            raise
+
+
+    async def _stream(self, url: str, destination_name: str,
+                      trace: ExtractionTrace) -> AsyncIterator[ExtractionEvent]:
+        dest = await self.storage.aensure_destination(destination_name)
+        try:
+            async with aclosing(self._extract(url, dest, trace)) as events:
+                async for event in events:
+                    yield event
+        except BaseException:
+            # Failed, cancelled, or closed by the consumer: let the backend drop partial output
+            await self.storage.aabort(dest)
+            raise
+
+
+    async def _extract(self, url: str, dest: str, trace: ExtractionTrace) -> AsyncIterator[ExtractionEvent]:
+        base_name = self._safe_filename(url)
+        variant = self.image_ext.output_variant(800)
+        previous = await self._load_manifest(dest, base_name, variant) if self.incremental else None
+
+
+        with trace.stage("fetch_page"):
+            html = await self.http.get_text(url)
+        self.metrics.add_bytes_fetched("page", len(html.encode("utf-8")))
+        page_sha256 = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        if previous is not None and previous.page_sha256 == page_sha256:
+            unchanged = await self._unchanged_result(dest, previous)
+            if unchanged is not None:
+                total = len(previous.images)
+                yield MarkdownReady(markdown=unchanged.markdown, image_count=total)
+                # The manifest keeps saved images only, so their page positions are not known
+                for done, image in enumerate(previous.images, start=1):
+                    yield ImageProcessed(index=done, url=image.url, filename=image.filename, kept=True,
+                                         done=done, total=total)
+                yield ExtractionFinished(unchanged)
+                return
+
+        with trace.stage("analyze_page"):
+            markdown, image_urls, timings = await self._run_cpu(
+                analyze_page, self.parser, self.content_ext, self.image_ext, html, url
+            )
+        for stage, seconds in timings.items():
+            trace.record(stage, seconds)
         if not markdown:
             markdown = f"# Extracted Content\n\n_Source:_ {url}\n\n(No main content detected.)\n"
+        total = len(image_urls)
+        yield MarkdownReady(markdown=markdown, image_count=total)
 
 
-        # Discover & download images
-        image_urls = list(self.image_ext.discover_image_urls(html, url))
-        saved_images: List[str] = []
-        for idx, img_url in enumerate(image_urls, start=1):
-            try:
-                content = await self.http.get_bytes(img_url)
-                resized, ext = self.image_ext.resize_image_square_max(content, 800)
-                fname = f"images/img_{idx:03d}.{ext}"
-                self.storage.save_binary(dest, fname, resized)
-                saved_images.append(fname)
-            except Exception:
-                # Best-effort; skip broken images
-                continue
+        # Download images
+        semaphore = asyncio.Semaphore(self.image_concurrency)
+
+        async def process(idx: int, img_url: str) -> Tuple[int, str, Optional[Tuple[ManifestImage, bool]]]:
+            previous_image = previous.image_at(idx) if previous is not None else None
+            return idx, img_url, await self._process_image(dest, idx, img_url, semaphore, trace, previous_image)
+
+        tasks = [asyncio.create_task(process(idx, img_url)) for idx, img_url in enumerate(image_urls, start=1)]
+        outcomes: Dict[int, Optional[Tuple[ManifestImage, bool]]] = {}
+        try:
+            for done, next_image in enumerate(asyncio.as_completed(tasks), start=1):
+                idx, img_url, outcome = await next_image
+                outcomes[idx] = outcome
+                yield ImageProcessed(index=idx, url=img_url, filename=outcome[0].filename if outcome else None,
+                                     kept=outcome is not None and outcome[1], done=done, total=total)
+        finally:
+            # Only does anything if the consumer stopped early or an image task raised
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        # Back in page order for the markdown and the manifest
+        results = [outcomes[idx] for idx in sorted(outcomes)]
+        images: List[ManifestImage] = [image for image, _ in filter(None, results)]
+        saved_images: List[str] = [image.filename for image in images]
+        kept_images: List[str] = [image.filename for image, kept in filter(None, results) if kept]
 
 
         # Enhance markdown with local image references (append section)
@@ -44,13 +195,106 @@ class ExtractUseCase:
             markdown = markdown.rstrip() + "\n\n## Extracted Images\n\n" + md_images + "\n"
 
 
-        base_name = self._safe_filename(url)
-        self.storage.save_markdown(dest, f"{base_name}.md", markdown)
+        with trace.stage("save_markdown"):
+            await self.storage.asave_markdown(dest, f"{base_name}.md", markdown)
+            if self.incremental:
+                # Written last: a run interrupted earlier leaves the old manifest, which no longer matches
+                manifest = ExtractionManifest(url=url, page_sha256=page_sha256, markdown=f"{base_name}.md",
+                                              output_variant=variant, images=images)
+                await self.storage.asave_markdown(dest, manifest_filename(base_name), manifest.to_json())
+            await self.storage.afinalize(dest)
+
+        yield ExtractionFinished(
+            ExtractionResult(markdown=markdown, image_filenames=saved_images, skipped_images=kept_images)
+        )
+
+
+    async def _load_manifest(self, dest: str, base_name: str, variant: str) -> Optional[ExtractionManifest]:
+        text = await self.storage.aload_text(dest, manifest_filename(base_name))
+        manifest = ExtractionManifest.from_json(text) if text else None
+        # Images resized with other settings cannot be reused
+        if manifest is None or manifest.output_variant != variant:
+            return None
+        return manifest
+
+
+    async def _unchanged_result(self, dest: str, previous: ExtractionManifest) -> Optional[ExtractionResult]:
+        """The previous output, if the page is unchanged and every file it wrote is still there."""
+        markdown = await self.storage.aload_text(dest, previous.markdown)
+        if markdown is None:
+            return None
+        present = await asyncio.gather(*[self.storage.aexists(dest, image.filename) for image in previous.images])
+        if not all(present):
+            return None
+        filenames = [image.filename for image in previous.images]
+        return ExtractionResult(markdown=markdown, image_filenames=filenames, skipped=True, skipped_images=filenames)
+
+
+    async def _process_image(self, dest: str, idx: int, img_url: str, semaphore: asyncio.Semaphore,
+                             trace: ExtractionTrace,
+                             previous: Optional[ManifestImage] = None) -> Optional[Tuple[ManifestImage, bool]]:
+        """Download, resize and save one image; returns its manifest entry and whether
+        the previous run's file was kept, or None if the image is skipped."""
+        # Always fetched: CDNs replace images at stable URLs. With HTTP_CACHE_DIR an
+        # unchanged image costs a 304; only changed bytes are resized and written again.
+        stage = "download_image"
+        try:
+            async with semaphore:
+                with trace.stage(stage, count_errors=False, url=img_url):
+                    content = await self.http.get_image_bytes(img_url, max_bytes=self.image_max_bytes)
+            self.metrics.add_bytes_fetched("image", len(content))
+            source_sha256 = await asyncio.to_thread(lambda: hashlib.sha256(content).hexdigest())
+            if (previous is not None and previous.sha256 == source_sha256
+                    and await self.storage.aexists(dest, previous.filename)):
+                # Same bytes as last time, at the same or a new URL (e.g. a changed CDN query string)
+                return ManifestImage(url=img_url, sha256=source_sha256, filename=previous.filename), True
+            if self.image_store is not None:
+                stage = "store_image"
+                fname = await self._store_image(dest, idx, content, trace)
+            else:
+                stage = "resize_image"
+                with trace.stage(stage, count_errors=False):
+                    resized, ext = await self._run_cpu(self.image_ext.resize_image_square_max, content, 800)
+                fname = f"images/img_{idx:03d}.{ext}"
+                stage = "save_image"
+                with trace.stage(stage, count_errors=False):
+                    await self.storage.asave_binary(dest, fname, resized)
+            return ManifestImage(url=img_url, sha256=source_sha256, filename=fname), False
+        except Exception as e:
+            # Best-effort; skip broken images
+            self.metrics.image_skipped(e.reason if isinstance(e, FetchRejected) else f"{stage}_failed")
+            return None
+
+
+    async def _store_image(self, dest: str, idx: int, content: bytes, trace: ExtractionTrace) -> str:
+        # hashlib releases the GIL, so hashing in a thread keeps large images off the loop
+        key = await asyncio.to_thread(image_cache_key, content, self.image_ext.output_variant(800))
+        blob = await asyncio.to_thread(self.image_store.lookup, key)
+        if blob is not None:
+            try:
+                return await self._link_blob(dest, idx, blob, trace)
+            except FileNotFoundError:
+                pass  # garbage-collected between lookup and link: a miss after all
+        with trace.stage("resize_image", count_errors=False):
+            resized, ext = await self._run_cpu(self.image_ext.resize_image_square_max, content, 800)
+        blob = await asyncio.to_thread(self.image_store.put, key, resized, ext)
+        return await self._link_blob(dest, idx, blob, trace)
+
+
+    async def _link_blob(self, dest: str, idx: int, blob: str, trace: ExtractionTrace) -> str:
+        ext = os.path.splitext(blob)[1].lstrip(".")
+        fname = f"images/img_{idx:03d}.{ext}"
+        with trace.stage("save_image", count_errors=False):
+            await self.storage.asave_link(dest, fname, blob)
+        return fname
+
 
-        return ExtractionResult(markdown=markdown, image_filenames=saved_images)
+    async def _run_cpu(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.cpu_executor is None:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.cpu_executor, fn, *args)
 
 
     def _safe_filename(self, url: str) -> str:
-        keep = [c if c.isalnum() else "-" for c in url]
-        out = "".join(keep).strip("-")
-        return out[:80] or "page"
\ No newline at end of file
+        return safe_filename(url)
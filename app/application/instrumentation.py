@@ -0,0 +1,74 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+from urllib.parse import urlsplit
+from ..domain.ports import MetricsPort
+import json
+import logging
+import time
+
+
+trace_logger = logging.getLogger("app.trace")
+
+
+class NullMetrics(MetricsPort):
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        pass
+
+    def add_bytes_fetched(self, kind: str, count: int) -> None:
+        pass
+
+    def image_skipped(self, reason: str) -> None:
+        pass
+
+    def error(self, stage: str) -> None:
+        pass
+
+
+class ExtractionTrace:
+    """Per-request timing record: every stage feeds the metrics histogram and,
+    when enabled, one structured JSON log line is emitted for the whole request."""
+
+    def __init__(self, url: str, metrics: MetricsPort, enabled: bool = False) -> None:
+        self.url = url
+        self.metrics = metrics
+        self.enabled = enabled
+        self.spans: List[Dict[str, Any]] = []
+        self.started = time.perf_counter()
+
+
+    @contextmanager
+    def stage(self, name: str, count_errors: bool = True, **attrs: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, time.perf_counter() - started, ok=ok, **attrs)
+            if not ok and count_errors:
+                self.metrics.error(name)
+
+
+    def record(self, name: str, seconds: float, **attrs: Any) -> None:
+        self.metrics.observe_stage(name, seconds)
+        if self.enabled:
+            self.spans.append({"stage": name, "ms": round(seconds * 1000, 2), **attrs})
+
+
+    def finish(self, status: str, **fields: Any) -> None:
+        if not self.enabled:
+            return
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span["stage"]] = round(totals.get(span["stage"], 0.0) + span["ms"], 2)
+        trace_logger.info(json.dumps({
+            "event": "extraction",
+            "url": self.url,
+            "host": urlsplit(self.url).netloc,
+            "status": status,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "stage_totals_ms": totals,
+            "spans": self.spans,
+            **fields,
+        }))
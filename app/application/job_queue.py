@@ -0,0 +1,163 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from ..domain.errors import JobQueueFull
+from ..domain.models import ExtractionJob
+from ..domain.ports import JobStorePort
+from .extract_usecase import ExtractUseCase
+import asyncio
+import logging
+import time
+import uuid
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _QueuedJob:
+    job: ExtractionJob
+    usecase: ExtractUseCase
+
+
+class ExtractionJobQueue:
+    """Fixed-size pool of worker tasks draining a bounded queue of extractions.
+
+    At most ``workers`` extractions run at once; ``submit`` raises JobQueueFull
+    once ``max_queued`` jobs are waiting. Finished jobs stay visible for
+    ``retention_s`` seconds so clients can poll for the result.
+    """
+
+    def __init__(self, workers: int = 4, max_queued: int = 100, retention_s: float = 3600.0) -> None:
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self.retention_s = retention_s
+        self._queue: asyncio.Queue[_QueuedJob] = asyncio.Queue(maxsize=self.max_queued)
+        self._jobs: Dict[str, ExtractionJob] = {}
+        self._tasks: List[asyncio.Task] = []
+
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(), name=f"extract-job-{i}") for i in range(self.workers)]
+
+
+    async def stop(self) -> None:
+        # Running extractions are cancelled; queued jobs are dropped with the process
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+    def submit(self, url: str, destination: str, usecase: ExtractUseCase) -> ExtractionJob:
+        self._prune()
+        job = ExtractionJob(id=uuid.uuid4().hex, url=url, destination=destination)
+        try:
+            self._queue.put_nowait(_QueuedJob(job, usecase))
+        except asyncio.QueueFull:
+            raise JobQueueFull(self.max_queued) from None
+        self._jobs[job.id] = job
+        return job
+
+
+    def get(self, job_id: str) -> Optional[ExtractionJob]:
+        self._prune()
+        return self._jobs.get(job_id)
+
+
+    async def asubmit(self, url: str, destination: str, usecase: ExtractUseCase) -> ExtractionJob:
+        return self.submit(url, destination, usecase)
+
+
+    async def aget(self, job_id: str) -> Optional[ExtractionJob]:
+        return self.get(job_id)
+
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+
+    async def _worker(self) -> None:
+        while True:
+            queued = await self._queue.get()
+            try:
+                await self._run(queued.job, queued.usecase)
+            finally:
+                self._queue.task_done()
+
+
+    async def _run(self, job: ExtractionJob, usecase: ExtractUseCase) -> None:
+        def progress(done: int, total: int) -> None:
+            job.images_done, job.images_total = done, total
+
+        job.status = "running"
+        job.started_at = time.time()
+        job.attempts += 1
+        try:
+            # Images are written directly into the storage's base directory, as for /extract
+            job.result = await usecase.execute(job.url, "", progress=progress)
+            job.status = "done"
+        except Exception as e:
+            logger.exception("Job %s failed for %s", job.id, job.url)
+            job.error = str(e) or type(e).__name__
+            job.status = "error"
+        finally:
+            job.finished_at = time.time()
+
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_s
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class DurableJobQueue:
+    """API side of the worker mode (JOB_BACKEND=sqlite): jobs are only recorded in
+    a JobStorePort and run by separate worker processes (``python -m app.worker``).
+
+    Same interface as ExtractionJobQueue; the store is blocking, so the API uses
+    ``asubmit``/``aget``.
+    """
+
+    def __init__(self, store: JobStorePort, max_queued: int = 100, retention_s: float = 3600.0) -> None:
+        self.store = store
+        self.max_queued = max(1, max_queued)
+        self.retention_s = retention_s
+
+
+    def start(self) -> None:
+        """Nothing runs in the API process."""
+
+
+    async def stop(self) -> None:
+        """Queued and running jobs stay in the store."""
+
+
+    def submit(self, url: str, destination: str, usecase: Optional[ExtractUseCase] = None) -> ExtractionJob:
+        # usecase is not needed: workers build their own for the destination
+        self.store.prune(self.retention_s)
+        if self.store.count_queued() >= self.max_queued:
+            raise JobQueueFull(self.max_queued)
+        return self.store.enqueue(url, destination)
+
+
+    def get(self, job_id: str) -> Optional[ExtractionJob]:
+        return self.store.get(job_id)
+
+
+    async def asubmit(self, url: str, destination: str, usecase: Optional[ExtractUseCase] = None) -> ExtractionJob:
+        return await asyncio.to_thread(self.submit, url, destination, usecase)
+
+
+    async def aget(self, job_id: str) -> Optional[ExtractionJob]:
+        return await asyncio.to_thread(self.get, job_id)
+
+
+    @property
+    def queued(self) -> int:
+        return self.store.count_queued()
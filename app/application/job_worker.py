@@ -0,0 +1,108 @@
+from __future__ import annotations
+from typing import Callable, List, Optional
+from ..domain.models import ExtractionJob
+from ..domain.ports import JobStorePort
+from .extract_usecase import ExtractUseCase
+import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Runs extraction jobs claimed from a JobStorePort, ``concurrency`` at a time.
+
+    This is the loop behind ``python -m app.worker``; throughput scales by
+    starting more worker processes against the same store. While a job runs its
+    lease is renewed (with the image progress) every few seconds; if the lease
+    is lost the extraction is abandoned, and on shutdown running jobs are handed
+    back to the queue.
+    """
+
+    def __init__(self, store: JobStorePort, usecase_factory: Callable[[str], ExtractUseCase], worker_id: str,
+                 concurrency: int = 1, lease_s: float = 60.0, poll_interval_s: float = 1.0,
+                 retry_delay_s: float = 10.0) -> None:
+        self.store = store
+        # Builds the use case writing into a job's destination
+        self.usecase_factory = usecase_factory
+        self.worker_id = worker_id
+        self.concurrency = max(1, concurrency)
+        self.lease_s = lease_s
+        self.heartbeat_s = min(2.0, lease_s / 3)
+        self.poll_interval_s = poll_interval_s
+        # A failed job waits retry_delay_s times its attempt number before it runs again
+        self.retry_delay_s = retry_delay_s
+        self.processed = 0
+        self.failed = 0
+
+
+    async def run(self, stop: Optional[asyncio.Event] = None, drain: bool = False) -> None:
+        """Claim and run jobs until ``stop`` is set; with ``drain``, return once no
+        job is ready to run (jobs waiting for a retry delay are left queued)."""
+        stop = stop or asyncio.Event()
+        await asyncio.gather(*[self._slot(stop, drain) for _ in range(self.concurrency)])
+
+
+    async def _slot(self, stop: asyncio.Event, drain: bool) -> None:
+        while not stop.is_set():
+            job = await asyncio.to_thread(self.store.claim, self.worker_id, self.lease_s)
+            if job is None:
+                if drain:
+                    return
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job, stop)
+
+
+    async def _run(self, job: ExtractionJob, stop: asyncio.Event) -> None:
+        progress: List[Optional[int]] = [0, None]
+
+        def report(done: int, total: int) -> None:
+            progress[0], progress[1] = done, total
+
+        logger.info("Worker %s running job %s for %s (attempt %d)", self.worker_id, job.id, job.url, job.attempts)
+        task = asyncio.create_task(self._execute(job, report))
+        stopping = asyncio.create_task(stop.wait())
+        try:
+            while True:
+                await asyncio.wait({task, stopping}, timeout=self.heartbeat_s, return_when=asyncio.FIRST_COMPLETED)
+                if task.done():
+                    break
+                if stop.is_set():
+                    await self._abandon(task)
+                    await asyncio.to_thread(self.store.release, job.id, self.worker_id)
+                    logger.info("Worker %s released job %s on shutdown", self.worker_id, job.id)
+                    return
+                if not await asyncio.to_thread(self.store.renew, job.id, self.worker_id, self.lease_s,
+                                               progress[0], progress[1]):
+                    await self._abandon(task)
+                    logger.warning("Worker %s lost the lease on job %s; abandoning it", self.worker_id, job.id)
+                    return
+        finally:
+            stopping.cancel()
+
+        try:
+            result = task.result()
+        except Exception as e:
+            logger.exception("Job %s failed for %s", job.id, job.url)
+            self.failed += 1
+            await asyncio.to_thread(self.store.fail, job.id, self.worker_id, str(e) or type(e).__name__,
+                                    self.retry_delay_s * job.attempts)
+            return
+        if await asyncio.to_thread(self.store.complete, job.id, self.worker_id, result):
+            self.processed += 1
+
+
+    async def _execute(self, job: ExtractionJob, report: Callable[[int, int], None]):
+        usecase = self.usecase_factory(job.destination)
+        # As for the in-process queue, files go directly into the destination's base directory
+        return await usecase.execute(job.url, "", progress=report)
+
+
+    async def _abandon(self, task: asyncio.Task) -> None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
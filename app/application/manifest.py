@@ -0,0 +1,56 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+import json
+
+
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ManifestImage:
+    url: str
+    sha256: str  # hash of the downloaded source bytes
+    filename: str
+
+
+@dataclass(frozen=True)
+class ExtractionManifest:
+    """What the previous extraction of a page wrote to its destination.
+
+    Stored as ``<page>.manifest.json`` next to the markdown so a re-run can skip
+    an unchanged page, and reuse images whose source did not change.
+    """
+    url: str
+    page_sha256: str
+    markdown: str
+    # ImageExtractorPort.output_variant of the images; other resize settings invalidate them
+    output_variant: str
+    images: List[ManifestImage] = field(default_factory=list)
+
+    def image_at(self, idx: int) -> Optional[ManifestImage]:
+        """The image written for the idx-th (1-based) image URL of the page, if any."""
+        for image in self.images:
+            if image.filename.startswith(f"images/img_{idx:03d}."):
+                return image
+        return None
+
+    def to_json(self) -> str:
+        return json.dumps({"version": MANIFEST_VERSION, **asdict(self)}, indent=2) + "\n"
+
+    @classmethod
+    def from_json(cls, text: str) -> Optional["ExtractionManifest"]:
+        """Parse a manifest; unreadable or older-format manifests count as absent."""
+        try:
+            data = json.loads(text)
+            if data.get("version") != MANIFEST_VERSION:
+                return None
+            return cls(url=data["url"], page_sha256=data["page_sha256"], markdown=data["markdown"],
+                       output_variant=data["output_variant"],
+                       images=[ManifestImage(**image) for image in data.get("images", [])])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+
+def manifest_filename(base_name: str) -> str:
+    return f"{base_name}.manifest.json"
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, Sequence
+from ..domain.ports import ContentExtractorPort, HtmlParserPort, ImageExtractorPort
+from .extract_usecase import analyze_page
+import asyncio
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_URL = "https://warmup.invalid/products/sample"
+# Small, but touches every path the extractors have: main content for trafilatura,
+# accordions, and images in <img>, srcset and <picture> form
+SAMPLE_PAGE = """<!doctype html>
+<html lang="en"><head><meta charset="utf-8"><title>Sample product</title></head>
+<body>
+<header><nav><a href="/">Home</a> <a href="/products">Products</a></nav></header>
+<main>
+<article>
+<h1>Hydrating Day Cream</h1>
+<p>A light, fast-absorbing cream that keeps dry skin soft and comfortable all day long.
+It is made with shea butter and glycerin and suits even sensitive skin.</p>
+<p>Apply a small amount to clean skin every morning. See <a href="/guide">our skincare guide</a> for more.</p>
+<img src="/img/cream.jpg" alt="Cream" width="600" height="600">
+<img srcset="/img/cream-400.jpg 400w, /img/cream-1200.jpg 1200w" alt="Texture">
+<picture>
+<source type="image/webp" srcset="/img/jar-800.webp 800w">
+<img src="/img/jar.jpg" alt="Jar">
+</picture>
+<details><summary><h3>Ingredients</h3></summary>
+<div class="accordion__content">Aqua, Glycerin, Butyrospermum Parkii Butter, Parfum</div></details>
+<details><summary>How to use</summary><p>Apply morning and evening to face and neck.</p></details>
+</article>
+</main>
+<footer><p>&copy; Sample shop</p></footer>
+</body></html>
+"""
+# A 64x48 gradient as binary PPM: a format Pillow reads without extra libraries
+SAMPLE_IMAGE = b"P6 64 48 255\n" + bytes(v for y in range(48) for x in range(64) for v in (x * 4, y * 5, 128))
+
+
+def prime_extractors(parser: HtmlParserPort, content_extractors: Sequence[ContentExtractorPort],
+                     image_ext: ImageExtractorPort) -> None:
+    """Run each CPU-bound step once on the sample page and image."""
+    for content_ext in content_extractors:
+        analyze_page(parser, content_ext, image_ext, SAMPLE_PAGE, SAMPLE_URL)
+    # Smaller than the sample, so it is decoded, resampled and encoded rather than passed through
+    image_ext.resize_image_square_max(SAMPLE_IMAGE, 32)
+
+
+async def warm_up(parser: HtmlParserPort, content_extractors: Sequence[ContentExtractorPort],
+                  image_ext: ImageExtractorPort, cpu_executor: Optional[Executor] = None, copies: int = 1) -> float:
+    """
+    Pay the one-time costs of the extraction stack before the first real request:
+    the heavy libraries the extractors import on first use, and trafilatura's own
+    initialisation on its first extract. Runs where extractions run (on
+    ``cpu_executor``, ``copies`` times at once so that each process of a pool gets
+    a share). A failure is logged and left to the first request to hit again.
+
+    Returns the seconds it took.
+    """
+    started = time.perf_counter()
+
+    async def run(fn: Callable[..., Any], *args: Any) -> Any:
+        if cpu_executor is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(cpu_executor, fn, *args)
+
+    try:
+        await asyncio.gather(*[run(prime_extractors, parser, content_extractors, image_ext)
+                               for _ in range(max(1, copies))])
+    except Exception:
+        logger.warning("Warm-up failed; extractors initialise on the first request instead", exc_info=True)
+    elapsed = time.perf_counter() - started
+    logger.info("Warm-up finished in %.2fs", elapsed)
+    return elapsed
@@ -0,0 +1,29 @@
+"""Remove image blobs that no extraction output references any more.
+
+    python -m app.blob_gc [--store DIR] [--roots DIR ...] [--min-age SECONDS] [--dry-run]
+"""
+import argparse
+from .config import settings
+from .infrastructure.storage.blob_store import ContentAddressedImageStore, collect_garbage
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Garbage-collect unreferenced image blobs.")
+    parser.add_argument("--store", default=settings.image_store_dir, help="blob store directory (default: IMAGE_STORE_DIR)")
+    parser.add_argument("--roots", nargs="*", default=[settings.base_data_dir],
+                        help="trees scanned for symlinks into the store written by earlier versions (default: BASE_DATA_DIR)")
+    parser.add_argument("--min-age", type=float, default=3600.0, help="never remove blobs younger than this many seconds")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be removed")
+    args = parser.parse_args(argv)
+    if not args.store:
+        parser.error("no blob store configured; pass --store or set IMAGE_STORE_DIR")
+
+    report = collect_garbage(ContentAddressedImageStore(args.store), roots=args.roots,
+                             min_age=args.min_age, dry_run=args.dry_run)
+    action = "Would remove" if args.dry_run else "Removed"
+    print(f"{action} {len(report.removed)} blobs ({report.bytes_freed} bytes); kept {report.kept}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,65 @@ import os
 class Settings(BaseModel):
     base_data_dir: str = os.getenv("BASE_DATA_DIR", "/data")
     default_data_dir: str = os.getenv("DEFAULT_DATA_DIR", "/data")
+    # Logging: TRACE_LOGS emits one structured JSON line per extraction (logger "app.trace")
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    trace_logs: bool = os.getenv("TRACE_LOGS", "false").lower() in ("1", "true", "yes")
+    # Shared HTTP connection pool
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "5.0"))
+    http2: bool = os.getenv("HTTP2", "false").lower() in ("1", "true", "yes")
+    # Per-host scheduling: adaptive concurrency, Retry-After, retries with backoff within a deadline
+    http_scheduler: bool = os.getenv("HTTP_SCHEDULER", "true").lower() in ("1", "true", "yes")
+    http_host_initial_concurrency: int = int(os.getenv("HTTP_HOST_INITIAL_CONCURRENCY", "8"))
+    http_host_max_concurrency: int = int(os.getenv("HTTP_HOST_MAX_CONCURRENCY", "32"))
+    http_retry_attempts: int = int(os.getenv("HTTP_RETRY_ATTEMPTS", "4"))
+    http_retry_base_delay_s: float = float(os.getenv("HTTP_RETRY_BASE_DELAY_S", "0.5"))
+    http_retry_deadline_s: float = float(os.getenv("HTTP_RETRY_DEADLINE_S", "60"))
+    # Image pipeline
+    image_download_concurrency: int = int(os.getenv("IMAGE_DOWNLOAD_CONCURRENCY", "8"))
+    image_max_bytes: int = int(os.getenv("IMAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+    # Output encoding: IMAGE_FORMAT jpeg or webp, IMAGE_PRESET fast, balanced or small,
+    # IMAGE_QUALITY overrides the preset's quality (0 keeps it)
+    image_format: str = os.getenv("IMAGE_FORMAT", "jpeg")
+    image_preset: str = os.getenv("IMAGE_PRESET", "balanced")
+    image_quality: int = int(os.getenv("IMAGE_QUALITY", "0"))
+    image_keep_alpha: bool = os.getenv("IMAGE_KEEP_ALPHA", "true").lower() in ("1", "true", "yes")
+    image_passthrough: bool = os.getenv("IMAGE_PASSTHROUGH", "true").lower() in ("1", "true", "yes")
+    # On-disk HTTP cache for pages and images (disabled when HTTP_CACHE_DIR is empty)
+    http_cache_dir: str = os.getenv("HTTP_CACHE_DIR", "")
+    http_cache_max_mb: int = int(os.getenv("HTTP_CACHE_MAX_MB", "512"))
+    # Content-addressed store of resized images shared by all extractions (disabled when empty)
+    image_store_dir: str = os.getenv("IMAGE_STORE_DIR", "")
+    # Output layout: "filesystem" (a folder per destination) or "zip" (one <destination>.zip each)
+    storage_backend: str = os.getenv("STORAGE_BACKEND", "filesystem")
+    # Filesystem output: write in worker threads, and optionally fsync once per extraction
+    storage_async_writes: bool = os.getenv("STORAGE_ASYNC_WRITES", "true").lower() in ("1", "true", "yes")
+    storage_fsync: bool = os.getenv("STORAGE_FSYNC", "false").lower() in ("1", "true", "yes")
+    # Opt-in: re-runs skip pages whose HTML is unchanged and rewrite only changed images (per-page manifest)
+    incremental_extraction: bool = os.getenv("INCREMENTAL_EXTRACTION", "false").lower() in ("1", "true", "yes")
+    # Batch extraction
+    batch_concurrency: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    batch_per_host_concurrency: int = int(os.getenv("BATCH_PER_HOST_CONCURRENCY", "2"))
+    batch_max_urls: int = int(os.getenv("BATCH_MAX_URLS", "5000"))
+    # Asynchronous jobs: worker pool size, waiting jobs before 429, how long finished jobs are kept
+    job_workers: int = int(os.getenv("JOB_WORKERS", "4"))
+    job_queue_size: int = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    job_retention_s: float = float(os.getenv("JOB_RETENTION_S", "3600"))
+    # JOB_BACKEND "memory" runs jobs in the API process; "sqlite" only records them in
+    # JOB_DB_PATH for separate worker processes (python -m app.worker)
+    job_backend: str = os.getenv("JOB_BACKEND", "memory")
+    job_db_path: str = os.getenv("JOB_DB_PATH", os.path.join(os.getenv("BASE_DATA_DIR", "/data"), "jobs.sqlite3"))
+    job_db_journal_mode: str = os.getenv("JOB_DB_JOURNAL_MODE", "WAL")
+    job_lease_s: float = float(os.getenv("JOB_LEASE_S", "60"))
+    job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    job_retry_delay_s: float = float(os.getenv("JOB_RETRY_DELAY_S", "10"))
+    worker_concurrency: int = int(os.getenv("WORKER_CONCURRENCY", "2"))
+    # CPU-bound stages (parsing, extraction, resizing): "inline", "thread" or "process"
+    extraction_engine: str = os.getenv("EXTRACTION_ENGINE", "thread")
+    extraction_workers: int = int(os.getenv("EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Prime the extractors on a built-in sample page at startup; GET /ready answers 503 until done
+    warmup: bool = os.getenv("WARMUP", "true").lower() in ("1", "true", "yes")
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -1,17 +1,171 @@
-from fastapi import Depends
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Union
+import asyncio
+import multiprocessing
+from fastapi import Depends, Request
+from .domain.ports import HttpClientPort, HtmlParserPort, ContentExtractorPort, ImageExtractorPort, ImageStorePort, MetricsPort, StoragePort
 from .infrastructure.http.httpx_client import HttpxClient
+from .infrastructure.http.disk_cache import DiskCache
+from .infrastructure.http.host_scheduler import AdaptiveHostScheduler
+from .infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
 from .infrastructure.extraction.trafilatura_markdown_extractor import TrafilaturaMarkdownExtractor
+from .infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
 from .infrastructure.extraction.image_extractor import ImageExtractor
 from .infrastructure.storage.filesystem_storage import FilesystemStorage
+from .infrastructure.storage.archive_storage import ArchiveStream, ZipArchiveStorage
+from .infrastructure.storage.blob_store import ContentAddressedImageStore
+from .infrastructure.observability.prometheus_metrics import PrometheusMetrics
+from .infrastructure.jobs.sqlite_job_store import SqliteJobStore
 from .application.extract_usecase import ExtractUseCase
+from .application.job_queue import DurableJobQueue, ExtractionJobQueue
+from .application.warmup import warm_up
+from .config import settings
 
 
-async def usecase_provider():
-    http = HttpxClient()
+def create_http_client() -> Union[HttpxClient, AdaptiveHostScheduler]:
+    cache = None
+    if settings.http_cache_dir:
+        cache = DiskCache(settings.http_cache_dir, max_bytes=settings.http_cache_max_mb * 1024 * 1024)
+    client = HttpxClient(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        http2=settings.http2,
+        cache=cache,
+    )
+    if not settings.http_scheduler:
+        return client
+    return AdaptiveHostScheduler(client,
+                                 initial_concurrency=settings.http_host_initial_concurrency,
+                                 max_concurrency=settings.http_host_max_concurrency,
+                                 max_attempts=settings.http_retry_attempts,
+                                 base_delay_s=settings.http_retry_base_delay_s,
+                                 deadline_s=settings.http_retry_deadline_s)
+
+
+def create_cpu_executor(engine: str, workers: int) -> Optional[Executor]:
+    if engine == "inline":
+        return None
+    if engine == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract-cpu")
+    if engine == "process":
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    raise ValueError(f"Unknown extraction engine '{engine}' (expected inline, thread or process)")
+
+
+def create_metrics(http: Union[HttpxClient, AdaptiveHostScheduler]) -> PrometheusMetrics:
+    metrics = PrometheusMetrics()
+    metrics.register_http_cache(http.cache_stats)
+    return metrics
+
+
+def create_image_extractor() -> ImageExtractor:
+    return ImageExtractor(output_format=settings.image_format, preset=settings.image_preset,
+                          quality=settings.image_quality or None, keep_alpha=settings.image_keep_alpha,
+                          passthrough=settings.image_passthrough)
+
+
+def create_storage(base_dir: Optional[str] = None) -> StoragePort:
+    if settings.storage_backend == "zip":
+        return ZipArchiveStorage(base_dir=base_dir, async_writes=settings.storage_async_writes,
+                                 fsync=settings.storage_fsync)
+    if settings.storage_backend == "filesystem":
+        return FilesystemStorage(base_dir=base_dir, async_writes=settings.storage_async_writes,
+                                 fsync=settings.storage_fsync)
+    raise ValueError(f"Unknown storage backend '{settings.storage_backend}' (expected filesystem or zip)")
+
+
+def create_archive_stream_storage(sink: ArchiveStream) -> ZipArchiveStorage:
+    """Storage writing one zip into ``sink`` and nothing to disk (the /extract/archive download)."""
+    return ZipArchiveStorage(sink=sink, async_writes=settings.storage_async_writes)
+
+
+def create_image_store() -> Optional[ImageStorePort]:
+    if not settings.image_store_dir:
+        return None
+    return ContentAddressedImageStore(settings.image_store_dir)
+
+
+def build_usecase(http: HttpClientPort, content_ext: ContentExtractorPort, image_ext: ImageExtractorPort,
+                  storage: StoragePort, cpu_executor: Optional[Executor] = None,
+                  parser: Optional[HtmlParserPort] = None, metrics: Optional[MetricsPort] = None) -> ExtractUseCase:
+    return ExtractUseCase(http, parser or LxmlHtmlParser(), content_ext, image_ext, storage,
+                          image_concurrency=settings.image_download_concurrency,
+                          cpu_executor=cpu_executor,
+                          image_store=create_image_store(),
+                          image_max_bytes=settings.image_max_bytes,
+                          metrics=metrics,
+                          trace_logs=settings.trace_logs,
+                          incremental=settings.incremental_extraction)
+
+
+def build_page_usecase(http: HttpClientPort, dest_path: str, cpu_executor: Optional[Executor] = None,
+                       metrics: Optional[MetricsPort] = None) -> ExtractUseCase:
+    """Use case for one page written directly into ``dest_path`` (the /extract flavour)."""
+    storage = create_storage(base_dir=dest_path)
+    return build_usecase(http, AccordionContentExtractor(), create_image_extractor(), storage, cpu_executor,
+                         metrics=metrics)
+
+
+def create_job_store(path: Optional[str] = None) -> SqliteJobStore:
+    return SqliteJobStore(path or settings.job_db_path, max_attempts=settings.job_max_attempts,
+                          journal_mode=settings.job_db_journal_mode)
+
+
+def create_job_queue() -> Union[ExtractionJobQueue, DurableJobQueue]:
+    if settings.job_backend == "sqlite":
+        return DurableJobQueue(create_job_store(), max_queued=settings.job_queue_size,
+                               retention_s=settings.job_retention_s)
+    if settings.job_backend == "memory":
+        return ExtractionJobQueue(workers=settings.job_workers, max_queued=settings.job_queue_size,
+                                  retention_s=settings.job_retention_s)
+    raise ValueError(f"Unknown job backend '{settings.job_backend}' (expected memory or sqlite)")
+
+
+async def warm_up_extractors(cpu_executor: Optional[Executor]) -> float:
+    """Warm up the extractors the API builds, on the executor extractions run on."""
+    # Each process of a pool imports and initialises its own copy
+    copies = settings.extraction_workers if settings.extraction_engine == "process" else 1
+    return await warm_up(LxmlHtmlParser(), [TrafilaturaMarkdownExtractor(), AccordionContentExtractor()],
+                         create_image_extractor(), cpu_executor, copies=copies)
+
+
+# Process-wide resources are created in the app lifespan (see main.py)
+def http_client_provider(request: Request) -> HttpClientPort:
+    return request.app.state.http_client
+
+
+def cpu_executor_provider(request: Request) -> Optional[Executor]:
+    return request.app.state.cpu_executor
+
+
+def metrics_provider(request: Request) -> MetricsPort:
+    return request.app.state.metrics
+
+
+def job_queue_provider(request: Request) -> Union[ExtractionJobQueue, DurableJobQueue]:
+    return request.app.state.job_queue
+
+
+def warmup_provider(request: Request) -> Optional[asyncio.Task]:
+    return request.app.state.warmup
+
+
+HttpClientDep = Depends(http_client_provider)
+CpuExecutorDep = Depends(cpu_executor_provider)
+MetricsDep = Depends(metrics_provider)
+JobQueueDep = Depends(job_queue_provider)
+WarmupDep = Depends(warmup_provider)
+
+
+async def usecase_provider(http: HttpClientPort = HttpClientDep,
+                           cpu_executor: Optional[Executor] = CpuExecutorDep,
+                           metrics: MetricsPort = MetricsDep):
     content_ext = TrafilaturaMarkdownExtractor()
-    image_ext = ImageExtractor()
-    storage = FilesystemStorage()
-    return ExtractUseCase(http, content_ext, image_ext, storage)
+    image_ext = create_image_extractor()
+    storage = create_storage()
+    return build_usecase(http, content_ext, image_ext, storage, cpu_executor, metrics=metrics)
 
 
-UseCaseDep = Depends(usecase_provider)
\ No newline at end of file
+UseCaseDep = Depends(usecase_provider)
@@ -0,0 +1,16 @@
+class FetchRejected(ValueError):
+    """A response was refused before (or while) downloading its body."""
+
+    def __init__(self, url: str, reason: str, detail: str = "") -> None:
+        self.url = url
+        # Short machine-readable cause, e.g. "too-large" or "content-type"
+        self.reason = reason
+        super().__init__(f"Rejected {url}: {detail or reason}")
+
+
+class JobQueueFull(RuntimeError):
+    """The extraction job queue is at capacity; the caller should retry later."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        super().__init__(f"Job queue is full ({capacity} jobs waiting)")
@@ -1,14 +1,104 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Union
+import time
 
 
 @dataclass(frozen=True)
 class ExtractionResult:
     markdown: str
     image_filenames: List[str]
+    # Incremental re-extraction: the page was unchanged and nothing was rewritten,
+    # or these images were kept from the previous run
+    skipped: bool = False
+    skipped_images: List[str] = field(default_factory=list)
+
+
+# Events of a streamed extraction (ExtractUseCase.stream), in order: one
+# MarkdownReady, one ImageProcessed per image as it completes, ExtractionFinished.
+@dataclass(frozen=True)
+class MarkdownReady:
+    markdown: str  # extracted content, before the image section is appended
+    image_count: int
+
+
+@dataclass(frozen=True)
+class ImageProcessed:
+    index: int  # 1-based position of the image on the page
+    url: str
+    filename: Optional[str]  # None if the image was skipped as broken or rejected
+    kept: bool  # file left in place from a previous run (incremental re-extraction)
+    done: int
+    total: int
+
+
+@dataclass(frozen=True)
+class ExtractionFinished:
+    result: ExtractionResult
+
+
+ExtractionEvent = Union[MarkdownReady, ImageProcessed, ExtractionFinished]
+
+
+@dataclass
+class ExtractionJob:
+    """State of one queued extraction; updated in place by the worker running it."""
+    id: str
+    url: str
+    destination: str
+    status: str = "queued"  # "queued", "running", "done" or "error"
+    images_done: int = 0
+    images_total: Optional[int] = None  # unknown until the page has been analysed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[ExtractionResult] = None
+    error: Optional[str] = None
+    attempts: int = 0  # runs started so far, including ones lost with their worker
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
 
 
 @dataclass(frozen=True)
 class PageAssets:
     html: str
-    url: str
\ No newline at end of file
+    url: str
+
+
+@dataclass(frozen=True)
+class ParsedPage:
+    """A fetched page parsed once and shared by every extractor.
+
+    ``tree`` is the parser's document root (an ``lxml.html.HtmlElement`` for
+    the default parser). Extractors must treat it as read-only.
+    """
+    url: str
+    html: str
+    tree: Any
+
+
+
+@dataclass(frozen=True)
+class BatchItemResult:
+    url: str
+    status: str  # "ok" or "error"
+    destination: str
+    elapsed_s: float
+    image_count: int = 0
+    error: Optional[str] = None
+    skipped: bool = False
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    items: List[BatchItemResult]
+    elapsed_s: float
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for item in self.items if item.status == "ok")
+
+    @property
+    def failed(self) -> int:
+        return len(self.items) - self.succeeded
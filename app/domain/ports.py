@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Tuple
-from .models import PageAssets
+from typing import Iterable, Optional, Tuple
+from .errors import FetchRejected
+from .models import ExtractionJob, ExtractionResult, PageAssets, ParsedPage
 
 
 class HttpClientPort(ABC):
@@ -12,14 +13,31 @@ class HttpClientPort(ABC):
     async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes: ...
 
 
+    async def get_image_bytes(self, url: str, max_bytes: Optional[int] = None, timeout: float = 20.0) -> bytes:
+        """
+        Fetch an image body. Implementations should stream and reject non-image
+        responses and bodies over max_bytes (FetchRejected) before buffering them;
+        this default only checks the size after a full download.
+        """
+        content = await self.get_bytes(url, timeout)
+        if max_bytes is not None and len(content) > max_bytes:
+            raise FetchRejected(url, "too-large", f"{len(content)} bytes exceeds limit of {max_bytes}")
+        return content
+
+
+class HtmlParserPort(ABC):
+    @abstractmethod
+    def parse(self, html: str, base_url: str) -> ParsedPage: ...
+
+
 class ContentExtractorPort(ABC):
     @abstractmethod
-    def extract_markdown(self, html: str, base_url: str) -> str: ...
+    def extract_markdown(self, page: ParsedPage) -> str: ...
 
 
 class ImageExtractorPort(ABC):
     @abstractmethod
-    def discover_image_urls(self, html: str, base_url: str) -> Iterable[str]: ...
+    def discover_image_urls(self, page: ParsedPage, max_px: int = 800) -> Iterable[str]: ...
 
 
     @abstractmethod
@@ -29,6 +47,14 @@ class ImageExtractorPort(ABC):
         """
 
 
+    def output_variant(self, max_px: int = 800) -> str:
+        """
+        Identify the output of resize_image_square_max for a given max_px, so
+        cached results are only reused for identical resize parameters.
+        """
+        return f"{type(self).__name__}-{max_px}"
+
+
 class StoragePort(ABC):
     @abstractmethod
     def list_destinations(self) -> list[str]: ...
@@ -43,4 +69,159 @@ class StoragePort(ABC):
 
 
     @abstractmethod
-    def save_binary(self, dest: str, filename: str, content: bytes) -> str: ...
\ No newline at end of file
+    def save_binary(self, dest: str, filename: str, content: bytes) -> str: ...
+
+
+    def save_link(self, dest: str, filename: str, source_path: str) -> str:
+        """
+        Place an existing file at dest/filename. Backends that can share files
+        (hard or symbolic links) should override this; the default copies bytes.
+        """
+        with open(source_path, "rb") as f:
+            return self.save_binary(dest, filename, f.read())
+
+
+    def load_text(self, dest: str, filename: str) -> Optional[str]:
+        """
+        Read back a text file written earlier, or None if it does not exist.
+        Backends that cannot read their output return None, which disables
+        incremental re-extraction.
+        """
+        return None
+
+
+    def exists(self, dest: str, filename: str) -> bool:
+        return False
+
+
+    # Async variants used by the extraction pipeline. The defaults call the
+    # blocking methods; backends whose writes may stall should offload them.
+    async def aensure_destination(self, name: str) -> str:
+        return self.ensure_destination(name)
+
+
+    async def asave_markdown(self, dest: str, filename: str, content: str) -> str:
+        return self.save_markdown(dest, filename, content)
+
+
+    async def asave_binary(self, dest: str, filename: str, content: bytes) -> str:
+        return self.save_binary(dest, filename, content)
+
+
+    async def asave_link(self, dest: str, filename: str, source_path: str) -> str:
+        return self.save_link(dest, filename, source_path)
+
+
+    async def aload_text(self, dest: str, filename: str) -> Optional[str]:
+        return self.load_text(dest, filename)
+
+
+    async def aexists(self, dest: str, filename: str) -> bool:
+        return self.exists(dest, filename)
+
+
+    async def afinalize(self, dest: str) -> None:
+        """
+        Called once after an extraction has written everything to dest.
+        """
+
+
+    async def aabort(self, dest: str) -> None:
+        """
+        Called instead of afinalize when an extraction into dest fails or is
+        cancelled. Backends holding unfinished output for dest discard it.
+        """
+
+
+class ImageStorePort(ABC):
+    @abstractmethod
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Return the path of the stored blob for key, or None.
+        """
+
+
+    @abstractmethod
+    def put(self, key: str, content: bytes, ext: str) -> str:
+        """
+        Store content under key and return the blob path.
+        """
+
+
+class MetricsPort(ABC):
+    @abstractmethod
+    def observe_stage(self, stage: str, seconds: float) -> None: ...
+
+
+    @abstractmethod
+    def add_bytes_fetched(self, kind: str, count: int) -> None: ...
+
+
+    @abstractmethod
+    def image_skipped(self, reason: str) -> None: ...
+
+
+    @abstractmethod
+    def error(self, stage: str) -> None: ...
+
+
+
+class JobStorePort(ABC):
+    """Durable extraction jobs shared by API and worker processes.
+
+    A worker claims a job for ``lease_s`` seconds and must renew the lease while
+    it runs; a job whose lease runs out is claimed again by another worker until
+    it has been attempted ``max_attempts`` times. Methods taking a worker id only
+    act while that worker still holds the job's lease.
+    """
+    @abstractmethod
+    def enqueue(self, url: str, destination: str) -> ExtractionJob: ...
+
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[ExtractionJob]: ...
+
+
+    @abstractmethod
+    def count_queued(self) -> int: ...
+
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_s: float) -> Optional[ExtractionJob]:
+        """
+        Atomically take the oldest runnable job, or return None if there is none.
+        """
+
+
+    @abstractmethod
+    def renew(self, job_id: str, worker_id: str, lease_s: float,
+              images_done: int = 0, images_total: Optional[int] = None) -> bool:
+        """
+        Extend the lease and record progress; False if the lease was lost.
+        """
+
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: ExtractionResult) -> bool: ...
+
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay_s: float = 0.0) -> bool:
+        """
+        Record a failed attempt: the job runs again after retry_delay_s if it has
+        attempts left, otherwise it ends with status "error".
+        """
+
+
+    @abstractmethod
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """
+        Give the job back unfinished (worker shutdown) without using up an attempt.
+        """
+
+
+    def prune(self, older_than_s: float) -> int:
+        """
+        Delete jobs that finished more than older_than_s seconds ago.
+        """
+        return 0
@@ -1,10 +1,17 @@
 from __future__ import annotations
-from typing import List, Dict
-from bs4 import BeautifulSoup
-import trafilatura
+from typing import List, Dict, Optional
+from ...domain.models import ParsedPage
 from ...domain.ports import ContentExtractorPort
 
 
+# Elements whose text BeautifulSoup's get_text() leaves out; mirrored so the
+# markdown is unchanged now that we read the shared lxml tree directly.
+_NON_TEXT_TAGS = {"script", "style", "template", "rt", "rp"}
+# Those of them that can contain elements: nothing below them has text either
+_HIDING_TAGS = ("template", "rt", "rp")
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
 class AccordionContentExtractor(ContentExtractorPort):
     """
     Enhanced content extractor that captures both main content and hidden accordion content.
@@ -12,13 +19,16 @@ class AccordionContentExtractor(ContentExtractorPort):
     Now includes specific extraction for "Ingredients" and "How to use" sections.
     """
     
-    def extract_markdown(self, html: str, base_url: str) -> str:
-        # First, get the main content using trafilatura
-        main_content = trafilatura.extract(html, url=base_url, output_format="markdown", include_links=True)
+    def extract_markdown(self, page: ParsedPage) -> str:
+        # trafilatura is imported on first use to keep app start-up fast
+        import trafilatura
+        base_url = page.url
+        # First, get the main content using trafilatura (it copies the tree before cleaning)
+        main_content = trafilatura.extract(page.tree, url=base_url, output_format="markdown", include_links=True)
         main_content = main_content or ""
         
         # Then extract accordion content
-        accordion_content = self._extract_accordion_content(html, base_url)
+        accordion_content = self._extract_accordion_content(page.tree)
         
         # Combine both contents
         if accordion_content:
@@ -29,28 +39,32 @@ class AccordionContentExtractor(ContentExtractorPort):
         else:
             return main_content or f"# Extracted Content\n\n_Source:_ {base_url}\n\n(No main content detected.)\n"
     
-    def _extract_accordion_content(self, html: str, base_url: str) -> str:
+    def _extract_accordion_content(self, tree) -> str:
         """Extract content from accordion elements (<details>/<summary>)."""
-        soup = BeautifulSoup(html, "lxml")
-        
         accordion_sections = []
         
-        # Find all <details> elements
-        details_elements = soup.find_all("details")
+        # Text under a <template> (or ruby annotation) is never rendered; most pages have none
+        check_ancestors = next(tree.iter(*_HIDING_TAGS), None) is not None
         
-        for details in details_elements:
+        # Find all <details> elements
+        for details in tree.iter("details"):
+            if check_ancestors and next(details.iterancestors(*_HIDING_TAGS), None) is not None:
+                continue
+            # Without script/style/template/ruby text below, text can be serialized in C
+            plain = next(details.iter(*_NON_TEXT_TAGS), None) is None
+            
             # Get the summary text (the accordion header)
-            summary = details.find("summary")
-            if not summary:
+            summary = details.find(".//summary")
+            if summary is None:
                 continue
                 
             # Clean up summary text - look for h2, h3, or direct text
             summary_text = ""
-            h_tag = summary.find(["h1", "h2", "h3", "h4", "h5", "h6"])
-            if h_tag:
-                summary_text = self._clean_text(h_tag.get_text())
+            h_tag = next(summary.iter(*_HEADING_TAGS), None)
+            if h_tag is not None:
+                summary_text = self._clean_text(self._get_text(h_tag, plain=plain))
             else:
-                summary_text = self._clean_text(summary.get_text())
+                summary_text = self._clean_text(self._get_text(summary, plain=plain))
             
             if not summary_text:
                 continue
@@ -59,25 +73,17 @@ class AccordionContentExtractor(ContentExtractorPort):
             content_text = ""
             
             # First, try to find accordion content divs
-            content_divs = details.find_all("div", class_=lambda x: x and ("content" in x.lower() or "accordion" in x.lower()))
+            content_divs = (div for div in details.iter("div") if self._is_content_class(div.get("class")))
             
             for content_div in content_divs:
-                div_text = self._clean_text(content_div.get_text())
+                div_text = self._clean_text(self._get_text(content_div, plain=plain))
                 if div_text and len(div_text.strip()) > 10:
                     content_text = div_text
                     break
             
             # If no content found in specific divs, try to get all content except summary
             if not content_text:
-                # Create a copy of details to avoid modifying the original
-                details_copy = BeautifulSoup(str(details), "lxml").find("details")
-                if details_copy:
-                    # Remove summary from the copy
-                    summary_copy = details_copy.find("summary")
-                    if summary_copy:
-                        summary_copy.decompose()
-                    
-                    content_text = self._clean_text(details_copy.get_text())
+                content_text = self._clean_text(self._get_text(details, skip=summary, plain=plain))
             
             # Only include sections with substantial content
             if content_text and len(content_text.strip()) > 10:
@@ -140,3 +146,44 @@ class AccordionContentExtractor(ContentExtractorPort):
         lines = [line for line in lines if line]  # Remove empty lines
         
         return '\n'.join(lines)
+    
+    def _is_content_class(self, class_attr: Optional[str]) -> bool:
+        if not class_attr:
+            return False
+        lowered = class_attr.lower()
+        return "content" in lowered or "accordion" in lowered
+    
+    def _get_text(self, element, skip=None, plain: bool = False) -> str:
+        """Concatenate descendant text like BeautifulSoup's get_text(), leaving out `skip`.
+        
+        `plain` asserts that no _NON_TEXT_TAGS element is below `element`, so libxml2's
+        text serializer (which would include their text) can do the work in C.
+        """
+        if len(element) == 0:
+            return element.text or ""
+        if plain:
+            from lxml import etree
+            if skip is None:
+                return etree.tostring(element, method="text", encoding="unicode", with_tail=False)
+            if skip.getparent() is element:
+                parts = [element.text or ""]
+                for child in element:
+                    if child is skip or not isinstance(child.tag, str):
+                        # The skipped element, comments and processing instructions: only their tail is text
+                        parts.append(child.tail or "")
+                    else:
+                        parts.append(etree.tostring(child, method="text", encoding="unicode", with_tail=True))
+                return "".join(parts)
+        parts: List[str] = []
+        self._collect_text(element, parts, skip)
+        return "".join(parts)
+    
+    def _collect_text(self, element, parts: List[str], skip) -> None:
+        if element.text and element.tag not in _NON_TEXT_TAGS:
+            parts.append(element.text)
+        for child in element:
+            # Comments and processing instructions have non-string tags
+            if child is not skip and isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+                self._collect_text(child, parts, skip)
+            if child.tail:
+                parts.append(child.tail)
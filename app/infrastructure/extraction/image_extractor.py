@@ -1,41 +1,306 @@
 from __future__ import annotations
-from typing import Iterable, Tuple
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup # via trafilatura dependency (lxml/bs4)
-from PIL import Image
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 import io
 
 
+from ...domain.models import ParsedPage
 from ...domain.ports import ImageExtractorPort
 
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+@dataclass(frozen=True)
+class ImageEncoder:
+    """Pillow save() settings for one output format at one preset."""
+    format: str  # Pillow format name
+    ext: str
+    options: Dict[str, Any]
+
+    @property
+    def name(self) -> str:
+        quality = self.options.get("quality")
+        return self.ext + (f"-q{quality}" if quality is not None else "") + "".join(
+            f"-{key}{int(value) if isinstance(value, bool) else value}"
+            for key, value in sorted(self.options.items()) if key != "quality")
+
+
+# Speed/size trade-offs per output format. "balanced" JPEG is the historical output.
+_PRESETS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "jpeg": {
+        "fast": {"quality": 85},
+        "balanced": {"quality": 88, "optimize": True},
+        "small": {"quality": 80, "optimize": True, "progressive": True},
+    },
+    "webp": {
+        "fast": {"quality": 80, "method": 2},
+        "balanced": {"quality": 82, "method": 4},
+        "small": {"quality": 75, "method": 6},
+    },
+    # Lossless; used for images with transparency when the main format cannot hold alpha
+    "png": {
+        "fast": {"compress_level": 1},
+        "balanced": {"compress_level": 6},
+        "small": {"optimize": True},
+    },
+}
+_FORMATS = {"jpeg": ("JPEG", "jpg"), "webp": ("WEBP", "webp"), "png": ("PNG", "png")}
+_PILLOW_EXT = {pillow_format: ext for pillow_format, ext in _FORMATS.values()}
+# Source formats by decoding cost, after the output format itself: JPEG can be
+# decoded at a reduced scale (draft), the others always decode in full
+_DECODE_ORDER = ("JPEG", "WEBP", "PNG", "GIF")
+# Covering candidates up to this factor wider than the narrowest one count as the
+# same size, so a cheaper format can win; beyond it the smaller download wins
+_SIZE_TOLERANCE = 1.25
+_URL_EXT = {"jpg": "JPEG", "jpeg": "JPEG", "webp": "WEBP", "png": "PNG", "gif": "GIF", "avif": "AVIF"}
+
+
+class _Candidate(NamedTuple):
+    url: str
+    width: Optional[int]  # from a "w" descriptor
+    density: Optional[float]  # from an "x" descriptor
+
+
+def parse_srcset(value: str) -> List[_Candidate]:
+    """Candidates of a srcset attribute. URLs may contain commas (image CDN
+    parameters); like browsers, a URL runs to the next whitespace."""
+    candidates: List[_Candidate] = []
+    pos, n = 0, len(value)
+    while pos < n:
+        while pos < n and (value[pos].isspace() or value[pos] == ","):
+            pos += 1
+        start = pos
+        while pos < n and not value[pos].isspace():
+            pos += 1
+        url = value[start:pos]
+        descriptors = ""
+        if url.endswith(","):
+            url = url.rstrip(",")
+        else:
+            start = pos
+            while pos < n and value[pos] != ",":
+                pos += 1
+            descriptors = value[start:pos]
+        if not url:
+            continue
+        width, density = None, None
+        for token in descriptors.split():
+            number, unit = token[:-1], token[-1:].lower()
+            try:
+                if unit == "w":
+                    width = int(number)
+                elif unit == "x":
+                    density = float(number)
+            except ValueError:
+                pass
+        if width is None and density is None:
+            density = 1.0
+        candidates.append(_Candidate(url, width, density))
+    return candidates
+
+
+def _source_format(mime: Optional[str]) -> Optional[str]:
+    """Pillow format of a <source type>: None if untyped, "" if Pillow cannot open it."""
+    if not mime:
+        return None
+    from PIL import Image
+    Image.init()
+    mime = mime.split(";")[0].strip().lower()
+    if mime == "image/jpg":
+        mime = "image/jpeg"  # not registered, but common in the wild
+    for fmt, registered in Image.MIME.items():
+        if registered == mime:
+            return fmt if fmt in Image.OPEN else ""
+    return ""
+
+
+def _url_format(url: str) -> Optional[str]:
+    path = urlsplit(url).path
+    return _URL_EXT.get(path.rsplit(".", 1)[-1].lower()) if "." in path else None
+
+
+def _int_attr(tag: Any, name: str) -> Optional[int]:
+    value = tag.get(name) if tag is not None else None
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def image_encoder(fmt: str, preset: str = "balanced", quality: Optional[int] = None) -> ImageEncoder:
+    if fmt not in _PRESETS:
+        raise ValueError(f"Unknown image format '{fmt}' (expected {', '.join(_PRESETS)})")
+    if preset not in _PRESETS[fmt]:
+        raise ValueError(f"Unknown image preset '{preset}' (expected {', '.join(_PRESETS[fmt])})")
+    options = dict(_PRESETS[fmt][preset])
+    if quality and "quality" in options:
+        options["quality"] = quality
+    pillow_format, ext = _FORMATS[fmt]
+    return ImageEncoder(format=pillow_format, ext=ext, options=options)
+
 
 class ImageExtractor(ImageExtractorPort):
-    def discover_image_urls(self, html: str, base_url: str) -> Iterable[str]:
-        soup = BeautifulSoup(html, "lxml")
+    def __init__(self, output_format: str = "jpeg", preset: str = "balanced", quality: Optional[int] = None,
+                 keep_alpha: bool = True, passthrough: bool = True) -> None:
+        self.encoder = image_encoder(output_format, preset, quality)
+        # WebP holds alpha itself; JPEG output falls back to PNG for transparent images
+        self.alpha_encoder = self.encoder if self.encoder.format == "WEBP" else image_encoder("png", preset)
+        # keep_alpha=False flattens transparent images into the main format
+        self.keep_alpha = keep_alpha
+        # passthrough: sources already in the output format and within max_px are stored as-is
+        self.passthrough = passthrough
+        # Rank of each source format when an image offers several
+        order = (self.encoder.format,) + tuple(f for f in _DECODE_ORDER if f != self.encoder.format)
+        self._format_order = {fmt: i for i, fmt in enumerate(order)}
+
+
+    def discover_image_urls(self, page: ParsedPage, max_px: int = 800) -> Iterable[str]:
+        """One URL per image on the page, in page order.
+
+        An <img> with a srcset, or a <picture> with <source> alternatives, offers
+        several candidates; the one chosen is the smallest that still covers
+        ``max_px``, in a format that is cheap to decode (see _pick_candidate).
+        """
         urls: list[str] = []
-        for tag in soup.find_all(["img", "source"]):
-            src = tag.get("src") or tag.get("data-src") or tag.get("srcset")
-            if not src:
-                continue
-            # handle srcset: take first candidate
-            if "," in src:
-                src = src.split(",")[0].split()[0]
-            abs_url = urljoin(base_url, src)
-            urls.append(abs_url)
-            # de-dup while preserving order
-            seen = set()
-            out = []
+        for tag in page.tree.iter("img", "picture"):
+            if tag.tag == "img":
+                if next(tag.iterancestors("picture"), None) is not None:
+                    continue  # fallback of its <picture>, handled there
+                img, sources = tag, []
+            else:
+                # libxml2 does not know <source> is a void element and nests what
+                # follows inside it, so match children by their nearest <picture>
+                img = next((i for i in tag.iter("img") if next(i.iterancestors("picture")) is tag), None)
+                # <source> elsewhere (<video>, <audio>) is not an image
+                sources = [s for s in tag.iter("source") if next(s.iterancestors("picture")) is tag]
+            src = self._pick_candidate(page.url, img, sources, max_px)
+            if src is not None:
+                urls.append(src)
+        # de-dup while preserving order
+        seen = set()
+        out = []
         for u in urls:
             if u not in seen:
                 seen.add(u)
-            out.append(u)
+                out.append(u)
         return out
 
 
+    def _pick_candidate(self, base_url: str, img: Any, sources: List[Any], max_px: int) -> Optional[str]:
+        """
+        Choose among every candidate of one image. Widths come from ``w``
+        descriptors, or from ``x`` densities times the width attribute. Preference:
+
+        1. candidates known to cover max_px (the needed width shrinks for portrait
+           images when width/height attributes give the aspect ratio), then those
+           of unknown width, then the ones known to be too small;
+        2. among covering candidates the narrowest, among the too small ones the
+           widest, and for unknown widths the lowest density (the page's own
+           layout size);
+        3. between candidates of about the same width (within _SIZE_TOLERANCE of
+           the narrowest covering one), and for unknown widths: the output format
+           (a small enough source is stored without decoding), then JPEG (decoded
+           at reduced scale), WebP, PNG, GIF, other formats.
+
+        <source> elements with a media query (art direction for other viewports)
+        are only considered when nothing else is left, and ones whose type Pillow
+        cannot open are skipped.
+        """
+        width, height = _int_attr(img, "width"), _int_attr(img, "height")
+        needed = max_px if not (width and height and height > width) else max_px * width / height
+        candidates: List[Tuple[_Candidate, Optional[str]]] = []
+        art_directed: List[Tuple[_Candidate, Optional[str]]] = []
+        for source in sources:
+            fmt = _source_format(source.get("type"))
+            if fmt == "":
+                continue
+            target = art_directed if source.get("media") else candidates
+            srcset = source.get("srcset") or source.get("data-srcset") or ""
+            target.extend((c, fmt) for c in parse_srcset(srcset))
+        if img is not None:
+            srcset = img.get("srcset") or img.get("data-srcset") or ""
+            candidates.extend((c, None) for c in parse_srcset(srcset))
+            src = (img.get("src") or img.get("data-src") or "").strip()
+            if src:
+                candidates.append((_Candidate(src, None, 1.0), None))
+
+        def effective_width(candidate: _Candidate) -> Optional[float]:
+            if candidate.width is None and candidate.density is not None and width:
+                return candidate.density * width
+            return candidate.width
+
+        for group in (candidates, art_directed):
+            usable = [item for item in group if not item[0].url.startswith("data:")]
+            if not usable:
+                continue
+            covering = [w for w in (effective_width(c) for c, _ in usable) if w is not None and w >= needed]
+            close_enough = min(covering) * _SIZE_TOLERANCE if covering else 0.0
+
+            def rank(item: Tuple[_Candidate, Optional[str]]) -> Tuple[float, ...]:
+                candidate, fmt = item
+                w = effective_width(candidate)
+                order = self._format_order.get(fmt or _url_format(candidate.url), len(self._format_order))
+                if w is None:
+                    return 1, order, candidate.density or 1.0
+                if w >= needed:
+                    # Format only decides between candidates of about the smallest covering size
+                    return (0, 0, order, w) if w <= close_enough else (0, 1, w)
+                return 2, -w, order
+
+            return urljoin(base_url, min(usable, key=rank)[0].url)
+        return None
+
+
+    def output_variant(self, max_px: int = 800) -> str:
+        variant = f"{self.encoder.name}-{max_px}"
+        if self.keep_alpha:
+            variant += f"-alpha-{self.alpha_encoder.name}"
+        if self.passthrough:
+            variant += "-passthrough"
+        return variant
+
+
     def resize_image_square_max(self, content: bytes, max_px: int = 800) -> Tuple[bytes, str]:
+        # Pillow and its format plugins load on first use
+        from PIL import Image
         with Image.open(io.BytesIO(content)) as im:
-            im = im.convert("RGB") # normalize
-            im.thumbnail((max_px, max_px)) # preserves aspect ratio within box
+            # Only the header has been read so far: an image that already fits and is
+            # in the output format is returned without decoding or another lossy pass
+            if self.passthrough and self._can_pass_through(im, max_px):
+                return content, _PILLOW_EXT[im.format]
+            # JPEG: let libjpeg decode at 1/2, 1/4 or 1/8 scale, still >= max_px,
+            # instead of materialising the full-resolution bitmap
+            im.draft("RGB", (max_px, max_px))
+            if im.mode in ("P", "1"):
+                # palette images resample badly
+                im = im.convert("RGBA" if "transparency" in im.info else "RGB")
+            # reducing_gap lets other formats shrink with a cheap integer reduce() first
+            im.thumbnail((max_px, max_px), reducing_gap=2.0) # preserves aspect ratio within box
+            if self.keep_alpha and _uses_alpha(im):
+                encoder, im = self.alpha_encoder, im.convert("RGBA")
+            else:
+                encoder, im = self.encoder, im.convert("RGB") # normalize
             buf = io.BytesIO()
-            im.save(buf, format="JPEG", quality=88, optimize=True)
-            return buf.getvalue(), "jpg"
\ No newline at end of file
+            im.save(buf, format=encoder.format, **encoder.options)
+            return buf.getvalue(), encoder.ext
+
+
+    def _can_pass_through(self, im: Image.Image, max_px: int) -> bool:
+        if max(im.size) > max_px or getattr(im, "is_animated", False):
+            return False
+        # Decoding the alpha channel is cheap at this size, and an opaque one is re-encoded
+        has_alpha = "transparency" in im.info or _uses_alpha(im)
+        encoder = self.alpha_encoder if self.keep_alpha and has_alpha else self.encoder
+        if im.format != encoder.format:
+            return False
+        # CMYK and other exotic JPEG modes are normalised to RGB
+        return im.format != "JPEG" or im.mode in ("RGB", "L")
+
+
+def _uses_alpha(im: Image.Image) -> bool:
+    if im.mode not in ("RGBA", "LA", "PA"):
+        return False
+    # Fully opaque alpha channels (common in exported PNGs) do not need a lossless format
+    return im.getchannel("A").getextrema()[0] < 255
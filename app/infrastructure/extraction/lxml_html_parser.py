@@ -0,0 +1,16 @@
+from ...domain.models import ParsedPage
+from ...domain.ports import HtmlParserPort
+
+
+class LxmlHtmlParser(HtmlParserPort):
+    """Parses a page once into an lxml tree that trafilatura can consume directly."""
+
+    def parse(self, html: str, base_url: str) -> ParsedPage:
+        # Deferred to the first parse, like the other heavy extraction imports
+        from lxml import html as lxml_html
+        from trafilatura import load_html
+        tree = load_html(html)
+        if tree is None:
+            # Empty or non-HTML input: hand extractors an empty document
+            tree = lxml_html.document_fromstring("<html><body></body></html>")
+        return ParsedPage(url=base_url, html=html, tree=tree)
@@ -1,9 +1,12 @@
+from ...domain.models import ParsedPage
 from ...domain.ports import ContentExtractorPort
-import trafilatura
 
 
 class TrafilaturaMarkdownExtractor(ContentExtractorPort):
-    def extract_markdown(self, html: str, base_url: str) -> str:
-        # Trafilatura prioritizes main content; request markdown output
-        md = trafilatura.extract(html, url=base_url, output_format="markdown", include_links=True)
-        return md or ""
\ No newline at end of file
+    def extract_markdown(self, page: ParsedPage) -> str:
+        # Deferred: trafilatura takes a few hundred ms to import (WARMUP pays it at startup)
+        import trafilatura
+        # Trafilatura prioritizes main content; request markdown output.
+        # It accepts the shared lxml tree and works on its own copy.
+        md = trafilatura.extract(page.tree, url=page.url, output_format="markdown", include_links=True)
+        return md or ""
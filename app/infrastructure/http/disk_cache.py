@@ -0,0 +1,207 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, replace
+from typing import Dict, Mapping, Optional, Tuple
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    url: str
+    size: int
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Absolute time (epoch seconds) until which the body is fresh; None = always revalidate
+    fresh_until: Optional[float] = None
+
+    def is_fresh(self, now: float) -> bool:
+        return self.fresh_until is not None and now < self.fresh_until
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class HttpCacheStats:
+    hits: int = 0           # served fresh from disk, no request sent
+    revalidations: int = 0  # 304 Not Modified, body served from disk
+    misses: int = 0         # body downloaded (not cached, stale and changed, or uncacheable)
+    stores: int = 0
+    evictions: int = 0
+    bytes_saved: int = 0    # body bytes not downloaded thanks to hits and revalidations
+    bytes_downloaded: int = 0
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def freshness_from_headers(headers: Mapping[str, str], now: float) -> Tuple[bool, Optional[float]]:
+    """Return (storable, fresh_until) from response headers.
+
+    Only Cache-Control is honoured: ``no-store`` disables caching, ``no-cache``
+    forces revalidation and ``max-age`` (minus ``Age``) sets the freshness lifetime.
+    """
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in directives:
+        return False, None
+    if "no-cache" in directives:
+        return True, None
+    max_age = directives.get("max-age")
+    if max_age is None:
+        return True, None
+    try:
+        age = int(headers.get("age", "0") or 0)
+        return True, now + max(0, int(max_age) - age)
+    except ValueError:
+        return True, None
+
+
+class DiskCache:
+    """Size-bounded LRU store of HTTP response bodies on local disk.
+
+    Each URL is stored as ``<sha256>.body`` plus a ``<sha256>.json`` metadata file.
+    Recency is tracked in memory and mirrored to the metadata file's mtime so the
+    LRU order survives restarts. Safe to call from worker threads.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = HttpCacheStats()
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+
+    def get(self, url: str) -> Optional[Tuple[CacheEntry, bytes]]:
+        key = self._key(url)
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                entry = CacheEntry(**json.load(f))
+            with open(self._body_path(key), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url or len(body) != entry.size:
+            return None
+        self._touch(key)
+        return entry, body
+
+
+    def put(self, entry: CacheEntry, body: bytes) -> None:
+        key = self._key(entry.url)
+        if len(body) > self.max_bytes:
+            return
+        self._write_atomic(self._body_path(key), body)
+        self._write_atomic(self._meta_path(key), json.dumps(asdict(entry)).encode("utf-8"))
+        with self._lock:
+            self._index[key] = len(body)
+            self._index.move_to_end(key)
+            self.stats.stores += 1
+            self._evict_locked()
+
+
+    def refresh(self, entry: CacheEntry, fresh_until: Optional[float]) -> None:
+        """Record a successful revalidation (304) with its new freshness lifetime."""
+        key = self._key(entry.url)
+        updated = replace(entry, fresh_until=fresh_until)
+        self._write_atomic(self._meta_path(key), json.dumps(asdict(updated)).encode("utf-8"))
+        self._touch(key)
+
+
+    def record(self, event: str, saved: int = 0, downloaded: int = 0) -> None:
+        with self._lock:
+            setattr(self.stats, event, getattr(self.stats, event) + 1)
+            self.stats.bytes_saved += saved
+            self.stats.bytes_downloaded += downloaded
+
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(self._index.values())
+
+
+    def _load_index(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-5]
+            try:
+                meta_mtime = os.path.getmtime(self._meta_path(key))
+                size = os.path.getsize(self._body_path(key))
+            except OSError:
+                continue
+            entries.append((meta_mtime, key, size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+        with self._lock:
+            self._evict_locked()
+
+
+    def _evict_locked(self) -> None:
+        total = sum(self._index.values())
+        while total > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            total -= size
+            self.stats.evictions += 1
+            for path in (self._meta_path(key), self._body_path(key)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+    def _touch(self, key: str) -> None:
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.body")
+
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
@@ -0,0 +1,219 @@
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+import httpx
+from ...domain.ports import HttpClientPort
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Responses that mean "try again later"; other errors (404, rejected bodies) are final
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Hosts tracked before idle ones are forgotten
+_MAX_HOSTS = 1024
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or an HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - (now if now is not None else time.time()))
+
+
+@dataclass
+class _HostState:
+    limit: float
+    in_flight: int = 0
+    # Loop time before which no request may start (Retry-After or a throttling pause)
+    paused_until: float = 0.0
+    # Loop time of the last decrease; responses to requests started earlier do not decrease again
+    decreased_at: float = float("-inf")
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class AdaptiveHostScheduler(HttpClientPort):
+    """
+    Per-host scheduling in front of another HttpClientPort.
+
+    Each host gets an adaptive concurrency limit (AIMD): every success raises it
+    by 1/limit, up to ``max_concurrency``; a throttling response (429, 5xx) or a
+    timeout halves it, at most once per round of requests in flight, down to one.
+    A Retry-After header pauses the whole host for as long as it asks; a request
+    that would have to wait past its deadline fails at once. Failed requests are retried with
+    full-jitter exponential backoff while attempts remain and the retry can start
+    before ``deadline_s`` has passed since the first one; refused connections,
+    other 4xx responses and rejected bodies fail at once.
+    """
+
+    def __init__(self, inner: HttpClientPort, initial_concurrency: int = 8, max_concurrency: int = 32,
+                 max_attempts: int = 4, base_delay_s: float = 0.5, max_delay_s: float = 30.0,
+                 deadline_s: float = 60.0) -> None:
+        self.inner = inner
+        self.max_concurrency = max(1, max_concurrency)
+        self.initial_concurrency = min(max(1, initial_concurrency), self.max_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.deadline_s = deadline_s
+        self._hosts: Dict[str, _HostState] = {}
+
+
+    async def get_text(self, url: str, timeout: float = 20.0) -> str:
+        return await self._schedule(url, timeout, lambda t: self.inner.get_text(url, timeout=t))
+
+
+    async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
+        return await self._schedule(url, timeout, lambda t: self.inner.get_bytes(url, timeout=t))
+
+
+    async def get_image_bytes(self, url: str, max_bytes: Optional[int] = None, timeout: float = 20.0) -> bytes:
+        return await self._schedule(url, timeout,
+                                    lambda t: self.inner.get_image_bytes(url, max_bytes=max_bytes, timeout=t))
+
+
+    def cache_stats(self):
+        return self.inner.cache_stats() if hasattr(self.inner, "cache_stats") else None
+
+
+    async def aclose(self) -> None:
+        if hasattr(self.inner, "aclose"):
+            await self.inner.aclose()
+
+
+    def host_limit(self, host: str) -> Optional[float]:
+        """Current concurrency limit for ``host`` (netloc), if it has been seen."""
+        state = self._hosts.get(host)
+        return state.limit if state is not None else None
+
+
+    async def _schedule(self, url: str, timeout: float, fetch: Callable[[float], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        host = urlsplit(url).netloc
+        deadline = loop.time() + self.deadline_s
+        attempt = 0
+        last_error: Optional[Exception] = None
+        while True:
+            attempt += 1
+            state = self._host(host)
+            try:
+                await self._acquire(state, url, deadline)
+            except TimeoutError:
+                if last_error is None:
+                    raise
+                # A retry that cannot start in time reports why it was needed
+                raise last_error from None
+            started = loop.time()
+            try:
+                result = await fetch(max(0.1, min(timeout, deadline - started)))
+            except Exception as e:
+                last_error = e
+                retryable, throttled, retry_after = self._classify(e)
+                await self._release(state, started, throttled=throttled, retry_after=retry_after)
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if not retryable or attempt >= self.max_attempts or loop.time() + delay >= deadline:
+                    raise
+                logger.info("Retrying %s in %.2fs after %s (attempt %d of %d)",
+                            url, delay, self._describe(e), attempt, self.max_attempts)
+                if retry_after is None:
+                    # Retry-After already pauses the host; a plain backoff only delays this request
+                    await asyncio.sleep(delay)
+                continue
+            await self._release(state, started, throttled=False)
+            return result
+
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            if len(self._hosts) >= _MAX_HOSTS:
+                self._forget_idle_hosts()
+            state = self._hosts[host] = _HostState(limit=float(self.initial_concurrency))
+        return state
+
+
+    async def _acquire(self, state: _HostState, url: str, deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        async with state.changed:
+            while True:
+                now = loop.time()
+                if now >= deadline:
+                    raise TimeoutError(f"Gave up on {url}: host busy past the {self.deadline_s:.0f}s deadline")
+                if now < state.paused_until:
+                    wait = min(state.paused_until, deadline) - now
+                elif state.in_flight < int(state.limit):
+                    state.in_flight += 1
+                    return
+                else:
+                    wait = deadline - now
+                try:
+                    await asyncio.wait_for(state.changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+
+
+    async def _release(self, state: _HostState, started: float, throttled: bool,
+                       retry_after: Optional[float] = None) -> None:
+        now = asyncio.get_running_loop().time()
+        async with state.changed:
+            state.in_flight -= 1
+            if throttled:
+                if started >= state.decreased_at:
+                    state.limit = max(1.0, state.limit / 2)
+                    state.decreased_at = now
+                if retry_after is not None:
+                    state.paused_until = max(state.paused_until, now + retry_after)
+            else:
+                state.limit = min(float(self.max_concurrency), state.limit + 1 / state.limit)
+            state.changed.notify_all()
+
+
+    def _classify(self, error: Exception) -> Tuple[bool, bool, Optional[float]]:
+        """(retryable, throttled, Retry-After seconds) for a failed request."""
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            if status not in _RETRY_STATUSES:
+                return False, False, None
+            # Not capped at max_delay_s: retrying sooner than asked is what the header is there to stop.
+            # A wait past the deadline fails the request with this response instead.
+            return True, True, parse_retry_after(error.response.headers.get("retry-after"))
+        if isinstance(error, httpx.TimeoutException):
+            return True, True, None
+        if isinstance(error, httpx.ConnectError):
+            # Nothing listening, DNS failure: retrying rarely helps and delays the caller
+            return False, False, None
+        if isinstance(error, httpx.TransportError):
+            # Connection dropped mid-response
+            return True, False, None
+        return False, False, None
+
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: concurrent retries against the same host spread out instead of arriving together
+        return random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** (attempt - 1)))
+
+
+    def _forget_idle_hosts(self) -> None:
+        now = asyncio.get_running_loop().time()
+        for host in [h for h, s in self._hosts.items() if s.in_flight == 0 and s.paused_until <= now]:
+            del self._hosts[host]
+
+
+    @staticmethod
+    def _describe(error: Exception) -> str:
+        if isinstance(error, httpx.HTTPStatusError):
+            return f"HTTP {error.response.status_code}"
+        return type(error).__name__
@@ -1,21 +1,114 @@
+import asyncio
+import time
+from typing import Optional, Tuple
 import httpx
+from ...domain.errors import FetchRejected
 from ...domain.ports import HttpClientPort
+from .disk_cache import CacheEntry, DiskCache, HttpCacheStats, freshness_from_headers
+
+
+# Content types accepted for images; many CDNs omit the type or send a generic one
+_IMAGE_TYPE_PREFIXES = ("image/",)
+_GENERIC_TYPES = ("", "application/octet-stream", "binary/octet-stream")
 
 
 class HttpxClient(HttpClientPort):
-    def __init__(self):
-        self._client = httpx.AsyncClient(follow_redirects=True, headers={
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 5.0, http2: bool = False, cache: Optional[DiskCache] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        # One pooled AsyncClient per process; HTTP/2 needs the optional `h2` package
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client = httpx.AsyncClient(follow_redirects=True, limits=limits, http2=http2, transport=transport, headers={
         "User-Agent": "webpage-extractor/0.1 (+https://example.com)"
         })
+        self._cache = cache
 
 
     async def get_text(self, url: str, timeout: float = 20.0) -> str:
-        resp = await self._client.get(url, timeout=timeout)
-        resp.raise_for_status()
-        return resp.text
+        body, encoding = await self._fetch(url, timeout)
+        return body.decode(encoding or "utf-8", errors="replace")
 
 
     async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
-        resp = await self._client.get(url, timeout=timeout)
-        resp.raise_for_status()
-        return resp.content
\ No newline at end of file
+        body, _ = await self._fetch(url, timeout)
+        return body
+
+
+    async def get_image_bytes(self, url: str, max_bytes: Optional[int] = None, timeout: float = 20.0) -> bytes:
+        body, _ = await self._fetch(url, timeout, max_bytes=max_bytes, image_only=True)
+        return body
+
+
+    def cache_stats(self) -> Optional[HttpCacheStats]:
+        return self._cache.stats if self._cache is not None else None
+
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+    async def _fetch(self, url: str, timeout: float, max_bytes: Optional[int] = None,
+                     image_only: bool = False) -> Tuple[bytes, Optional[str]]:
+        cache = self._cache
+        cached = await asyncio.to_thread(cache.get, url) if cache is not None else None
+        if cached is not None and cached[0].is_fresh(time.time()) and self._within(cached[0].size, max_bytes):
+            cache.record("hits", saved=cached[0].size)
+            return cached[1], cached[0].encoding
+
+        headers = cached[0].conditional_headers() if cached is not None else {}
+        # Stream so oversized or non-image bodies are refused before they are buffered
+        async with self._client.stream("GET", url, timeout=timeout, headers=headers) as resp:
+            now = time.time()
+            if resp.status_code == 304 and cached is not None:
+                entry, body = cached
+                _, fresh_until = freshness_from_headers(resp.headers, now)
+                await asyncio.to_thread(cache.refresh, entry, fresh_until)
+                cache.record("revalidations", saved=entry.size)
+                return body, entry.encoding
+
+            resp.raise_for_status()
+            if image_only:
+                self._check_image_type(url, resp)
+            declared = resp.headers.get("content-length")
+            if declared is not None and declared.isdigit() and not self._within(int(declared), max_bytes):
+                raise FetchRejected(url, "too-large", f"Content-Length {declared} exceeds limit of {max_bytes}")
+            body = await self._read_limited(url, resp, max_bytes)
+            encoding = resp.encoding
+
+        if cache is not None:
+            cache.record("misses", downloaded=len(body))
+            storable, fresh_until = freshness_from_headers(resp.headers, now)
+            etag, last_modified = resp.headers.get("etag"), resp.headers.get("last-modified")
+            # Without validators or a freshness lifetime a stored copy could never be reused
+            if storable and (etag or last_modified or fresh_until is not None):
+                entry = CacheEntry(url=url, size=len(body), encoding=encoding, etag=etag,
+                                   last_modified=last_modified, fresh_until=fresh_until)
+                await asyncio.to_thread(cache.put, entry, body)
+        return body, encoding
+
+
+    async def _read_limited(self, url: str, resp: httpx.Response, max_bytes: Optional[int]) -> bytes:
+        chunks = []
+        received = 0
+        async for chunk in resp.aiter_bytes():
+            received += len(chunk)
+            if not self._within(received, max_bytes):
+                raise FetchRejected(url, "too-large", f"body exceeds limit of {max_bytes} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+    def _check_image_type(self, url: str, resp: httpx.Response) -> None:
+        content_type = resp.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type in _GENERIC_TYPES or content_type.startswith(_IMAGE_TYPE_PREFIXES):
+            return
+        raise FetchRejected(url, "content-type", f"unexpected Content-Type {content_type!r}")
+
+
+    @staticmethod
+    def _within(size: int, max_bytes: Optional[int]) -> bool:
+        return max_bytes is None or size <= max_bytes
@@ -0,0 +1,181 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Iterator, Optional
+import json
+import os
+import sqlite3
+import time
+import uuid
+from ...domain.models import ExtractionJob, ExtractionResult
+from ...domain.ports import JobStorePort
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    images_done INTEGER NOT NULL DEFAULT 0,
+    images_total INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    run_after REAL NOT NULL,
+    worker_id TEXT,
+    lease_until REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+"""
+
+_COLUMNS = ("id", "url", "destination", "status", "attempts", "images_done", "images_total",
+            "created_at", "started_at", "finished_at", "result", "error")
+
+
+class SqliteJobStore(JobStorePort):
+    """
+    Job table in one SQLite file, shared by the API and any number of worker
+    processes. Every call opens its own short-lived connection, so one store can
+    be used from several threads; claims take SQLite's write lock (BEGIN
+    IMMEDIATE), so two workers never get the same job.
+
+    WAL journaling needs shared memory between the processes; on a volume
+    shared by several hosts use journal_mode="DELETE" (and a filesystem with
+    working POSIX locks).
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, journal_mode: str = "WAL",
+                 busy_timeout_s: float = 30.0) -> None:
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.busy_timeout_s = busy_timeout_s
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            conn.executescript(_SCHEMA)
+
+
+    def enqueue(self, url: str, destination: str) -> ExtractionJob:
+        job = ExtractionJob(id=uuid.uuid4().hex, url=url, destination=destination)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, url, destination, status, created_at, run_after) VALUES (?, ?, ?, ?, ?, ?)",
+                (job.id, job.url, job.destination, job.status, job.created_at, job.created_at),
+            )
+        return job
+
+
+    def get(self, job_id: str) -> Optional[ExtractionJob]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+
+    def count_queued(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+
+    def claim(self, worker_id: str, lease_s: float) -> Optional[ExtractionJob]:
+        now = time.time()
+        with self._transaction() as conn:
+            # A lease that ran out means the worker died (or stalled); give up once attempts are used up
+            conn.execute(
+                "UPDATE jobs SET status = 'error', finished_at = ?, worker_id = NULL, lease_until = NULL,"
+                " error = 'Worker lease expired on the last attempt'"
+                " WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE (status = 'queued' AND run_after <= ?)"
+                " OR (status = 'running' AND lease_until < ?) ORDER BY created_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, lease_until = ?, attempts = attempts + 1,"
+                " started_at = ?, images_done = 0, images_total = NULL WHERE id = ?",
+                (worker_id, now + lease_s, now, row[0]),
+            )
+            claimed = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (row[0],)).fetchone()
+        return self._to_job(claimed)
+
+
+    def renew(self, job_id: str, worker_id: str, lease_s: float,
+              images_done: int = 0, images_total: Optional[int] = None) -> bool:
+        return self._update_owned(job_id, worker_id,
+                                  "lease_until = ?, images_done = ?, images_total = ?",
+                                  (time.time() + lease_s, images_done, images_total))
+
+
+    def complete(self, job_id: str, worker_id: str, result: ExtractionResult) -> bool:
+        return self._update_owned(job_id, worker_id,
+                                  "status = 'done', finished_at = ?, result = ?, error = NULL,"
+                                  " worker_id = NULL, lease_until = NULL, images_done = COALESCE(images_total, images_done)",
+                                  (time.time(), json.dumps(asdict(result))))
+
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay_s: float = 0.0) -> bool:
+        now = time.time()
+        return self._update_owned(job_id, worker_id,
+                                  "status = CASE WHEN attempts < ? THEN 'queued' ELSE 'error' END,"
+                                  " finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END,"
+                                  " run_after = ?, error = ?, worker_id = NULL, lease_until = NULL",
+                                  (self.max_attempts, self.max_attempts, now, now + retry_delay_s, error))
+
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        return self._update_owned(job_id, worker_id,
+                                  "status = 'queued', attempts = attempts - 1, run_after = ?,"
+                                  " worker_id = NULL, lease_until = NULL",
+                                  (time.time(),))
+
+
+    def prune(self, older_than_s: float) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE status IN ('done', 'error') AND finished_at < ?",
+                                  (time.time() - older_than_s,))
+            return cursor.rowcount
+
+
+    def _update_owned(self, job_id: str, worker_id: str, assignments: str, params: tuple) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (*params, job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit: each statement is its own transaction unless _transaction() opens one
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_s, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+
+    def _to_job(self, row: tuple) -> ExtractionJob:
+        values = dict(zip(_COLUMNS, row))
+        result = values.pop("result")
+        return ExtractionJob(**values, result=ExtractionResult(**json.loads(result)) if result else None)
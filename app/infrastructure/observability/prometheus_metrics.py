@@ -0,0 +1,83 @@
+from dataclasses import asdict
+from typing import Callable, Iterable, Optional, Tuple
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily
+from ...domain.ports import MetricsPort
+from ..http.disk_cache import HttpCacheStats
+
+
+# Stages range from sub-millisecond (image discovery) to tens of seconds (slow hosts)
+_STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class PrometheusMetrics(MetricsPort):
+    """Extraction metrics in a private registry, rendered at /metrics."""
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None) -> None:
+        self.registry = registry or CollectorRegistry()
+        self._stage_seconds = Histogram(
+            "extract_stage_duration_seconds", "Time spent in each extraction stage.",
+            ["stage"], buckets=_STAGE_BUCKETS, registry=self.registry,
+        )
+        self._bytes_fetched = Counter(
+            "extract_bytes_fetched", "Bytes downloaded for pages and images.",
+            ["kind"], registry=self.registry,
+        )
+        self._images_skipped = Counter(
+            "extract_images_skipped", "Images dropped by the best-effort image pipeline.",
+            ["reason"], registry=self.registry,
+        )
+        self._errors = Counter(
+            "extract_errors", "Extraction stages that raised.",
+            ["stage"], registry=self.registry,
+        )
+
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self._stage_seconds.labels(stage=stage).observe(seconds)
+
+
+    def add_bytes_fetched(self, kind: str, count: int) -> None:
+        self._bytes_fetched.labels(kind=kind).inc(count)
+
+
+    def image_skipped(self, reason: str) -> None:
+        self._images_skipped.labels(reason=reason).inc()
+
+
+    def error(self, stage: str) -> None:
+        self._errors.labels(stage=stage).inc()
+
+
+    def register_http_cache(self, stats_source: Callable[[], Optional[HttpCacheStats]]) -> None:
+        self.registry.register(_HttpCacheCollector(stats_source))
+
+
+    def render(self) -> Tuple[bytes, str]:
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+
+class _HttpCacheCollector:
+    """Exposes the on-disk HTTP cache counters (see DiskCache) at scrape time."""
+
+    def __init__(self, stats_source: Callable[[], Optional[HttpCacheStats]]) -> None:
+        self._stats_source = stats_source
+
+
+    def describe(self) -> Iterable:
+        return []
+
+
+    def collect(self) -> Iterable:
+        stats = self._stats_source()
+        if stats is None:
+            return
+        values = asdict(stats)
+        events = CounterMetricFamily("http_cache_events", "HTTP cache lookups by outcome.", labels=["event"])
+        for event in ("hits", "revalidations", "misses", "stores", "evictions"):
+            events.add_metric([event], values[event])
+        yield events
+        yield CounterMetricFamily("http_cache_bytes_saved", "Body bytes served from the HTTP cache.",
+                                  value=values["bytes_saved"])
+        yield CounterMetricFamily("http_cache_bytes_downloaded", "Body bytes downloaded through the HTTP cache.",
+                                  value=values["bytes_downloaded"])
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import os
+import posixpath
+import tempfile
+import threading
+import time
+import zipfile
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple
+from ...domain.ports import StoragePort
+from ...config import settings
+from .filesystem_storage import check_writable, fsync_paths, map_host_base_dir, resolve_destination
+
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveStream:
+    """
+    Write-only, unseekable byte sink read back as an async iterator of chunks,
+    e.g. the body of a streaming HTTP response. write() may be called from any
+    thread; the chunks are handed to the event loop the stream was created on.
+    Bytes written after close() are dropped.
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024) -> None:
+        self.chunk_size = chunk_size
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._closed = False
+
+
+    def write(self, data: bytes) -> int:
+        with self._lock:
+            if self._closed:
+                # The reader is gone (or the archive was abandoned); e.g. ZipFile.__del__ writing late
+                return len(data)
+            self._buffer += data
+            if len(self._buffer) >= self.chunk_size:
+                self._send(bytes(self._buffer))
+                self._buffer.clear()
+        return len(data)
+
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                self._send(bytes(self._buffer))
+                self._buffer.clear()
+
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._send(None)
+
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        while (chunk := await self._queue.get()) is not None:
+            yield chunk
+
+
+    def _send(self, chunk: Optional[bytes]) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, chunk)
+
+
+class ZipArchiveStorage(StoragePort):
+    """
+    Writes each destination as one zip archive, <destination>.zip, instead of a
+    directory with an images/ folder of small files. Entries keep the paths the
+    directory layout would have had; images are stored (already compressed),
+    markdown is deflated. An archive appears under its final name, complete,
+    when the extraction finishes (afinalize); a failed or cancelled extraction
+    leaves nothing behind (aabort).
+
+    With ``sink``, everything goes into that single stream instead and nothing
+    touches the disk. The zip is then written front to back without seeking
+    (data descriptors follow each entry), so the sink can be a pipe or an
+    ArchiveStream; each destination is a folder in the archive, and close()
+    writes the central directory.
+
+    The output cannot be read back, so incremental re-extraction is disabled.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, sink: Optional[BinaryIO] = None,
+                 async_writes: bool = False, fsync: bool = False) -> None:
+        self.sink = sink
+        self.async_writes = async_writes
+        self.fsync = fsync
+        self.base_dir = None
+        if sink is None:
+            self.base_dir = map_host_base_dir(base_dir or settings.base_data_dir)
+            check_writable(self.base_dir)
+        # Archive path -> (open zip, temporary path it is written to)
+        self._open: Dict[str, Tuple[zipfile.ZipFile, str]] = {}
+        self._stream_zip = zipfile.ZipFile(sink, "w") if sink is not None else None
+        # zipfile writers are not thread-safe; images of one extraction are saved concurrently
+        self._lock = threading.Lock()
+
+
+    def list_destinations(self) -> list[str]:
+        if self.base_dir is None:
+            return []
+        return sorted(name[:-len(".zip")] for name in os.listdir(self.base_dir) if name.endswith(".zip"))
+
+
+    def ensure_destination(self, name: str) -> str:
+        if self._stream_zip is not None:
+            # Folder inside the streamed archive; "" puts the files at its root
+            folder = name.strip().strip("/ ")
+            if not folder:
+                return ""
+            folder = posixpath.normpath(folder)
+            if folder.startswith(".."):
+                raise ValueError("Destination escapes base directory")
+            return folder
+        path = resolve_destination(self.base_dir, name) + ".zip"
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            if path not in self._open:
+                fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".zip.tmp")
+                os.close(fd)
+                self._open[path] = (zipfile.ZipFile(tmp, "w"), tmp)
+        logger.debug("Archive ready: %s", path)
+        return path
+
+
+    def save_markdown(self, dest: str, filename: str, content: str) -> str:
+        return self._write(dest, filename, content.encode("utf-8"), zipfile.ZIP_DEFLATED)
+
+
+    def save_binary(self, dest: str, filename: str, content: bytes) -> str:
+        # Images are compressed already; deflating them again costs CPU for nothing
+        return self._write(dest, filename, content, zipfile.ZIP_STORED)
+
+
+    async def aensure_destination(self, name: str) -> str:
+        return await self._run_io(self.ensure_destination, name)
+
+
+    async def asave_markdown(self, dest: str, filename: str, content: str) -> str:
+        return await self._run_io(self.save_markdown, dest, filename, content)
+
+
+    async def asave_binary(self, dest: str, filename: str, content: bytes) -> str:
+        return await self._run_io(self.save_binary, dest, filename, content)
+
+
+    async def asave_link(self, dest: str, filename: str, source_path: str) -> str:
+        return await self._run_io(self.save_link, dest, filename, source_path)
+
+
+    async def afinalize(self, dest: str) -> None:
+        if self._stream_zip is None:
+            await self._run_io(self._finish_archive, dest)
+
+
+    async def aabort(self, dest: str) -> None:
+        if self._stream_zip is None:
+            await self._run_io(self._drop_archive, dest)
+
+
+    def close(self) -> None:
+        """Finish the streamed archive, and drop archives of extractions that never finished."""
+        with self._lock:
+            if self._stream_zip is not None:
+                self._stream_zip.close()
+            abandoned = list(self._open.values())
+            self._open.clear()
+        for zf, tmp in abandoned:
+            _discard(zf, tmp)
+
+
+    async def _run_io(self, fn, *args):
+        if self.async_writes:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+
+    def _write(self, dest: str, filename: str, content: bytes, compress_type: int) -> str:
+        streamed = self._stream_zip is not None
+        name = f"{dest}/{filename}" if streamed and dest else filename
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = compress_type
+        info.external_attr = 0o644 << 16
+        with self._lock:
+            if streamed:
+                self._stream_zip.writestr(info, content)
+                # Hand each finished entry to the reader rather than waiting for a full chunk
+                self.sink.flush()
+                path = name
+            else:
+                self._open[dest][0].writestr(info, content)
+                path = os.path.join(dest, filename)
+        logger.debug("Archived %s (%d bytes)", path, len(content))
+        return path
+
+
+    def _drop_archive(self, dest: str) -> None:
+        with self._lock:
+            entry = self._open.pop(dest, None)
+        if entry is not None:
+            _discard(*entry)
+            logger.debug("Dropped unfinished archive %s", dest)
+
+
+    def _finish_archive(self, dest: str) -> None:
+        with self._lock:
+            zf, tmp = self._open.pop(dest)
+        zf.close()
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, dest)
+        if self.fsync:
+            fsync_paths([dest])
+        logger.debug("Saved archive %s", dest)
+
+
+def _discard(zf: zipfile.ZipFile, tmp: str) -> None:
+    zf.close()
+    try:
+        os.remove(tmp)
+    except FileNotFoundError:
+        pass
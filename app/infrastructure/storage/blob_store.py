@@ -0,0 +1,135 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Set
+import glob
+import os
+import tempfile
+import time
+from ...domain.ports import ImageStorePort
+
+
+class ContentAddressedImageStore(ImageStorePort):
+    """
+    Stores resized images once, as <root>/<key[:2]>/<key>.<ext>.
+    Destination folders reference blobs through hard links; a destination on
+    another filesystem gets a copy instead (FilesystemStorage.save_link).
+    The last reuse of a blob is recorded in <key>.used next to it, not in the
+    blob's own mtime, which every hard-linked output shares.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+
+    def lookup(self, key: str) -> Optional[str]:
+        for path in glob.glob(os.path.join(self._shard(key), f"{key}.*")):
+            if not path.endswith(_NOT_BLOBS):
+                # A hit is about to be linked: mark it as used so collect_garbage's
+                # min_age keeps it until then
+                _touch(_used_marker(path))
+                return path if os.path.exists(path) else None
+        return None
+
+
+    def put(self, key: str, content: bytes, ext: str) -> str:
+        shard = self._shard(key)
+        os.makedirs(shard, exist_ok=True)
+        path = os.path.join(shard, f"{key}.{ext}")
+        fd, tmp = tempfile.mkstemp(dir=shard, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            # Concurrent writers of the same key produce identical bytes; last rename wins
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+
+    def iter_blobs(self) -> Iterable[str]:
+        for path in glob.glob(os.path.join(self.root, "??", "*")):
+            if not path.endswith(_NOT_BLOBS):
+                yield path
+
+
+    def _shard(self, key: str) -> str:
+        return os.path.join(self.root, key[:2])
+
+
+_USED = ".used"
+_NOT_BLOBS = (".tmp", _USED)
+
+
+def _used_marker(blob: str) -> str:
+    return os.path.splitext(blob)[0] + _USED
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        with open(path, "ab"):
+            pass
+
+
+@dataclass
+class GcReport:
+    removed: List[str] = field(default_factory=list)
+    kept: int = 0
+    bytes_freed: int = 0
+
+
+def collect_garbage(store: ContentAddressedImageStore, roots: Iterable[str] = (), min_age: float = 3600.0,
+                    dry_run: bool = False) -> GcReport:
+    """
+    Remove blobs that no destination references.
+
+    A blob is referenced when it has more than one hard link, or when a symlink
+    under one of `roots` resolves to it (outputs of versions that symlinked across
+    filesystems; current ones copy). Blobs written or looked up less than `min_age`
+    seconds ago are kept, so an extraction that is about to link one is not raced;
+    should it still lose the blob, it resizes the image again.
+    """
+    symlinked = _symlink_targets(roots)
+    report = GcReport()
+    now = time.time()
+    for path in store.iter_blobs():
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if st.st_nlink > 1 or os.path.realpath(path) in symlinked or now - _last_used(path, st) < min_age:
+            report.kept += 1
+            continue
+        if not dry_run:
+            os.remove(path)
+            try:
+                os.remove(_used_marker(path))
+            except FileNotFoundError:
+                pass
+        report.removed.append(path)
+        report.bytes_freed += st.st_size
+    return report
+
+
+def _last_used(path: str, st: os.stat_result) -> float:
+    try:
+        return max(st.st_mtime, os.stat(_used_marker(path)).st_mtime)
+    except FileNotFoundError:
+        return st.st_mtime
+
+
+def _symlink_targets(roots: Iterable[str]) -> Set[str]:
+    targets: Set[str] = set()
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if os.path.islink(path):
+                    targets.add(os.path.realpath(path))
+    return targets
@@ -1,29 +1,104 @@
+import asyncio
+import errno
+import logging
 import os
+import tempfile
+import threading
+import uuid
 from datetime import datetime
+from typing import Dict, List, Optional
 from ...domain.ports import StoragePort
 from ...config import settings
 
 
+logger = logging.getLogger(__name__)
+
+# Base directories already proven writable in this process; the probe is not repeated per request
+_writable_dirs: set[str] = set()
+_writable_lock = threading.Lock()
+
+
+def map_host_base_dir(base_dir: str) -> str:
+    if os.path.isabs(base_dir) and base_dir.startswith("/home/"):
+        base_dir = os.path.normpath(os.path.join("/host", base_dir.lstrip("/")))
+        logger.debug("Mapped base_dir to container path: %s", base_dir)
+    return base_dir
+
+
+def resolve_destination(base_dir: str, name: str) -> str:
+    """Path of the destination called ``name`` (a timestamped one if empty)."""
+    # allow alnum, dash, underscore, slash (subfolders), but keep inside base
+    safe = name.strip().strip("/ ")
+    if not safe:
+        safe = datetime.now().strftime("export-%Y%m%d-%H%M%S")
+
+    # If the name is an absolute path, map it to the host filesystem
+    if os.path.isabs(safe):
+        # Map host path to container path via /host/home mount
+        if safe.startswith("/home/"):
+            dest = os.path.normpath(os.path.join("/host", safe.lstrip("/")))
+        else:
+            # For other absolute paths, try to map them
+            dest = os.path.normpath(os.path.join("/host", safe.lstrip("/")))
+        logger.debug("Mapping host path %s to container path %s", safe, dest)
+    else:
+        dest = os.path.normpath(os.path.join(base_dir, safe))
+        # Only check for directory traversal if using relative path
+        if not dest.startswith(os.path.abspath(base_dir)):
+            raise ValueError("Destination escapes base directory")
+    return dest
+
+
+def check_writable(base_dir: str) -> None:
+    key = os.path.abspath(base_dir)
+    with _writable_lock:
+        if key in _writable_dirs:
+            return
+    # Ensure the directory exists and is accessible
+    try:
+        os.makedirs(base_dir, exist_ok=True)
+        # Test write access with a unique probe so concurrent requests cannot collide
+        fd, probe = tempfile.mkstemp(dir=base_dir, prefix=".test_write")
+        os.close(fd)
+        os.remove(probe)
+        logger.debug("Base directory accessible: %s", base_dir)
+    except (OSError, PermissionError) as e:
+        raise ValueError(f"Cannot access or create directory '{base_dir}': {e}")
+    with _writable_lock:
+        _writable_dirs.add(key)
+
+
+def fsync_paths(paths: List[str]) -> None:
+    directories = set()
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        directories.add(os.path.dirname(path))
+    # Persist the renames themselves
+    for directory in directories:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
 class FilesystemStorage(StoragePort):
-    def __init__(self, base_dir: str | None = None) -> None:
+    def __init__(self, base_dir: str | None = None, async_writes: bool = False, fsync: bool = False) -> None:
         self.base_dir = base_dir or settings.base_data_dir
-        
+        # async_writes: the asave_* methods run file I/O in a worker thread
+        # fsync: written files are flushed to disk in one batch by afinalize()
+        self.async_writes = async_writes
+        self.fsync = fsync
+        self._unsynced: Dict[str, List[str]] = {}
+        self._unsynced_lock = threading.Lock()
+
         # Map host paths to container paths
-        if os.path.isabs(self.base_dir) and self.base_dir.startswith("/home/"):
-            self.base_dir = os.path.normpath(os.path.join("/host", self.base_dir.lstrip("/")))
-            print(f"Mapped base_dir to container path: {self.base_dir}")
-        
-        # Ensure the directory exists and is accessible
-        try:
-            os.makedirs(self.base_dir, exist_ok=True)
-            # Test write access
-            test_file = os.path.join(self.base_dir, ".test_write")
-            with open(test_file, "w") as f:
-                f.write("test")
-            os.remove(test_file)
-            print(f"Base directory accessible: {self.base_dir}")
-        except (OSError, PermissionError) as e:
-            raise ValueError(f"Cannot access or create directory '{self.base_dir}': {e}")
+        self.base_dir = map_host_base_dir(self.base_dir)
+        check_writable(self.base_dir)
 
 
     def list_destinations(self) -> list[str]:
@@ -31,47 +106,123 @@ class FilesystemStorage(StoragePort):
 
 
     def ensure_destination(self, name: str) -> str:
-        # allow alnum, dash, underscore, slash (subfolders), but keep inside base
-        safe = name.strip().strip("/ ")
-        if not safe:
-            safe = datetime.now().strftime("export-%Y%m%d-%H%M%S")
-        
-        # If the name is an absolute path, map it to the host filesystem
-        if os.path.isabs(safe):
-            # Map host path to container path via /host/home mount
-            if safe.startswith("/home/"):
-                dest = os.path.normpath(os.path.join("/host", safe.lstrip("/")))
-            else:
-                # For other absolute paths, try to map them
-                dest = os.path.normpath(os.path.join("/host", safe.lstrip("/")))
-            print(f"Mapping host path {safe} to container path {dest}")
-            print(f"Checking if destination exists: {os.path.exists(dest)}")
-        else:
-            dest = os.path.normpath(os.path.join(self.base_dir, safe))
-            # Only check for directory traversal if using relative path
-            if not dest.startswith(os.path.abspath(self.base_dir)):
-                raise ValueError("Destination escapes base directory")
-        
-        print(f"Creating destination directory: {dest}")
-        os.makedirs(dest, exist_ok=True)
+        dest = resolve_destination(self.base_dir, name)
         os.makedirs(os.path.join(dest, "images"), exist_ok=True)
-        print(f"Destination directory created successfully: {dest}")
+        logger.debug("Destination directory ready: %s", dest)
         return dest
 
 
     def save_markdown(self, dest: str, filename: str, content: str) -> str:
+        return self._write_atomic(dest, filename, content.encode("utf-8"))
+
+
+    def save_binary(self, dest: str, filename: str, content: bytes) -> str:
+        return self._write_atomic(dest, filename, content)
+
+
+    def save_link(self, dest: str, filename: str, source_path: str) -> str:
         path = os.path.join(dest, filename)
-        print(f"Saving markdown to: {path}")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-        print(f"Markdown saved successfully: {path}")
+        # Unique per call: concurrent writers of the same target must not share a temp name
+        tmp = os.path.join(os.path.dirname(path), f".{uuid.uuid4().hex}.link-tmp")
+        try:
+            os.link(source_path, tmp)
+        except OSError as e:
+            # Hard links cannot cross filesystems (or may be unsupported); fall back to a copy.
+            # Not a symlink: blob garbage collection only sees hard links (st_nlink) as references
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+            with open(source_path, "rb") as f:
+                return self._write_atomic(dest, filename, f.read())
+        # Replace any previous output atomically
+        try:
+            os.replace(tmp, path)
+        finally:
+            # rename() is a no-op when path already links the same blob, leaving tmp behind
+            if os.path.lexists(tmp):
+                os.remove(tmp)
+        self._track_unsynced(dest, path)
+        logger.debug("Linked %s -> %s", path, source_path)
         return path
 
 
-    def save_binary(self, dest: str, filename: str, content: bytes) -> str:
+    def load_text(self, dest: str, filename: str) -> Optional[str]:
+        try:
+            with open(os.path.join(dest, filename), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+    def exists(self, dest: str, filename: str) -> bool:
+        return os.path.exists(os.path.join(dest, filename))
+
+
+    async def aensure_destination(self, name: str) -> str:
+        return await self._run_io(self.ensure_destination, name)
+
+
+    async def asave_markdown(self, dest: str, filename: str, content: str) -> str:
+        return await self._run_io(self.save_markdown, dest, filename, content)
+
+
+    async def asave_binary(self, dest: str, filename: str, content: bytes) -> str:
+        return await self._run_io(self.save_binary, dest, filename, content)
+
+
+    async def asave_link(self, dest: str, filename: str, source_path: str) -> str:
+        return await self._run_io(self.save_link, dest, filename, source_path)
+
+
+    async def aload_text(self, dest: str, filename: str) -> Optional[str]:
+        return await self._run_io(self.load_text, dest, filename)
+
+
+    async def aexists(self, dest: str, filename: str) -> bool:
+        return await self._run_io(self.exists, dest, filename)
+
+
+    async def afinalize(self, dest: str) -> None:
+        with self._unsynced_lock:
+            paths = self._unsynced.pop(dest, [])
+        if paths:
+            await self._run_io(fsync_paths, paths)
+
+
+    async def aabort(self, dest: str) -> None:
+        # Files already written stay (the next run overwrites them); just forget them
+        with self._unsynced_lock:
+            self._unsynced.pop(dest, None)
+
+
+    async def _run_io(self, fn, *args):
+        if self.async_writes:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+
+    def _write_atomic(self, dest: str, filename: str, content: bytes) -> str:
+        # Write to a temp file in the same directory, then rename over the target,
+        # so readers never see a partially written file
         path = os.path.join(dest, filename)
-        print(f"Saving binary file to: {path}")
-        with open(path, "wb") as f:
-            f.write(content)
-        print(f"Binary file saved successfully: {path}")
-        return path
\ No newline at end of file
+        directory = os.path.dirname(path)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self._track_unsynced(dest, path)
+        logger.debug("Saved %s (%d bytes)", path, len(content))
+        return path
+
+
+    def _track_unsynced(self, dest: str, path: str) -> None:
+        if self.fsync:
+            with self._unsynced_lock:
+                self._unsynced.setdefault(dest, []).append(path)
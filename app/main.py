@@ -1,6 +1,38 @@
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import logging
 from fastapi import FastAPI
 from .presentation.api import router
+from .containers import create_http_client, create_cpu_executor, create_metrics, create_job_queue, warm_up_extractors
+from .config import settings
 
 
-app = FastAPI(title="Webpage Extractor")
-app.include_router(router)
\ No newline at end of file
+logging.basicConfig(level=settings.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared across requests: pooled keep-alive connections, the CPU worker pool and the job workers
+    app.state.http_client = create_http_client()
+    app.state.cpu_executor = create_cpu_executor(settings.extraction_engine, settings.extraction_workers)
+    app.state.metrics = create_metrics(app.state.http_client)
+    app.state.job_queue = create_job_queue()
+    app.state.job_queue.start()
+    # In the background, so the server answers (GET /ready: 503) while it runs
+    app.state.warmup = asyncio.create_task(warm_up_extractors(app.state.cpu_executor)) if settings.warmup else None
+    try:
+        yield
+    finally:
+        if app.state.warmup is not None:
+            app.state.warmup.cancel()
+            with suppress(asyncio.CancelledError):
+                await app.state.warmup
+        # Stop job workers before the resources they use are closed
+        await app.state.job_queue.stop()
+        await app.state.http_client.aclose()
+        if app.state.cpu_executor is not None:
+            app.state.cpu_executor.shutdown(wait=True)
+
+
+app = FastAPI(title="Webpage Extractor", lifespan=lifespan)
+app.include_router(router)
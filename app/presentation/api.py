@@ -1,23 +1,35 @@
-from fastapi import APIRouter, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Request, Form, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from dataclasses import asdict
+from typing import AsyncIterator, Optional
+import asyncio
+import json
+import logging
 from datetime import datetime
 from urllib.parse import urlparse
-from ..application.extract_usecase import ExtractUseCase
-from ..infrastructure.storage.filesystem_storage import FilesystemStorage
-from ..infrastructure.http.httpx_client import HttpxClient
+from ..application.extract_usecase import ExtractUseCase, safe_filename
+from ..application.batch_usecase import BatchExtractUseCase
 from ..infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
-from ..infrastructure.extraction.image_extractor import ImageExtractor
+from ..infrastructure.observability.prometheus_metrics import PrometheusMetrics
 from ..config import settings
+from ..domain.ports import HttpClientPort, MetricsPort
+from ..domain.models import ExtractionEvent, ExtractionFinished, ExtractionJob, ImageProcessed, MarkdownReady
+from ..application.job_queue import DurableJobQueue, ExtractionJobQueue
+from ..domain.errors import JobQueueFull
+from ..infrastructure.storage.archive_storage import ArchiveStream
+from ..containers import build_usecase, build_page_usecase, create_archive_stream_storage, create_image_extractor, create_storage, HttpClientDep, CpuExecutorDep, MetricsDep, JobQueueDep, WarmupDep
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 templates = Jinja2Templates(directory="app/presentation/templates")
 
 
 @router.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    return templates.TemplateResponse("index.html", {
+    return templates.TemplateResponse(request, "index.html", {
         "request": request, 
         "result": None
     })
@@ -26,37 +38,257 @@ async def index(request: Request):
 @router.post("/extract", response_class=HTMLResponse)
 async def extract(request: Request,
                         url: str = Form(...),
-                        new_destination: str = Form("")):
+                        new_destination: str = Form(""),
+                        http: HttpClientPort = HttpClientDep,
+                        cpu_executor = CpuExecutorDep,
+                        metrics: MetricsPort = MetricsDep):
     try:
         # Use the new_destination as the full path, or default to exports folder
         dest_path = new_destination or "exports"
         
-        print(f"Extracting from URL: {url}")
-        print(f"Destination path: {dest_path}")
-        
-        # Create all dependencies manually
-        http = HttpxClient()
-        content_ext = AccordionContentExtractor()
-        image_ext = ImageExtractor()
-        
-        # Create storage with the user's destination path as base_dir
-        storage = FilesystemStorage(base_dir=dest_path)
+        logger.info("Extracting %s to %s", url, dest_path)
         
-        # Create use case with all dependencies
-        usecase = ExtractUseCase(http, content_ext, image_ext, storage)
+        # The HTTP client and CPU pool are shared; storage uses the user's destination path as base_dir
+        usecase = build_page_usecase(http, dest_path, cpu_executor, metrics)
         
         # Use empty destination_name to save directly in base_dir
         result = await usecase.execute(url=url, destination_name="")
-        return templates.TemplateResponse("index.html", {
+        return templates.TemplateResponse(request, "index.html", {
             "request": request, 
             "result": result
         })
     except Exception as e:
-        print(f"Error during extraction: {e}")
-        import traceback
-        traceback.print_exc()
-        return templates.TemplateResponse("index.html", {
+        logger.exception("Extraction failed for %s", url)
+        return templates.TemplateResponse(request, "index.html", {
             "request": request, 
             "result": None,
             "error": str(e)
-        })
\ No newline at end of file
+        })
+
+
+@router.post("/extract/stream")
+async def extract_stream(request: Request,
+                         url: str = Form(...),
+                         new_destination: str = Form(""),
+                         http: HttpClientPort = HttpClientDep,
+                         cpu_executor = CpuExecutorDep,
+                         metrics: MetricsPort = MetricsDep):
+    """Like /extract, but streams the markdown first and then one event per image.
+
+    Newline-delimited JSON by default; Server-Sent Events if the client accepts
+    text/event-stream.
+    """
+    dest_path = new_destination or "exports"
+    try:
+        usecase = build_page_usecase(http, dest_path, cpu_executor, metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    logger.info("Streaming extraction of %s to %s", url, dest_path)
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for event in usecase.stream(url, ""):
+                yield _format_event(_event_payload(event), sse)
+        except Exception as e:
+            # The 200 status has been sent already, so the failure is the last event
+            logger.exception("Streamed extraction failed for %s", url)
+            yield _format_event({"event": "error", "error": str(e) or type(e).__name__}, sse)
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    # X-Accel-Buffering stops nginx-style proxies from holding events back
+    return StreamingResponse(body(), media_type=media_type,
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.post("/extract/archive")
+async def extract_archive(url: str = Form(...),
+                          http: HttpClientPort = HttpClientDep,
+                          cpu_executor = CpuExecutorDep,
+                          metrics: MetricsPort = MetricsDep):
+    """Extract into a zip archive sent as the response while it is written; nothing is saved on disk."""
+    sink = ArchiveStream()
+    storage = create_archive_stream_storage(sink)
+    usecase = build_usecase(http, AccordionContentExtractor(), create_image_extractor(), storage, cpu_executor,
+                            metrics=metrics)
+    logger.info("Extracting %s as a streamed archive", url)
+
+    async def run() -> None:
+        try:
+            await usecase.execute(url=url, destination_name="")
+            # Without the central directory a failed extraction leaves an invalid zip, never a truncated valid one
+            storage.close()
+        finally:
+            sink.close()
+
+    task = asyncio.create_task(run())
+    chunks = sink.chunks()
+    # Wait for the first entry so a page that cannot be fetched still gets an error status
+    first = await anext(chunks, None)
+    if first is None:
+        # The stream ended before its first entry, so the extraction failed
+        try:
+            await task
+        except Exception as e:
+            logger.error("Archive extraction failed for %s: %s", url, e)
+            raise HTTPException(status_code=502, detail=str(e) or type(e).__name__)
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+            # Re-raises a failure after the first entry, which aborts the response
+            await task
+        except Exception:
+            logger.exception("Archive extraction failed for %s", url)
+            raise
+        finally:
+            task.cancel()
+
+    filename = f"{safe_filename(url)}.zip"
+    return StreamingResponse(body(), media_type="application/zip",
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+def _event_payload(event: ExtractionEvent) -> dict:
+    if isinstance(event, MarkdownReady):
+        return {"event": "markdown", **asdict(event)}
+    if isinstance(event, ImageProcessed):
+        return {"event": "image", **asdict(event)}
+    assert isinstance(event, ExtractionFinished)
+    return {"event": "result", "result": asdict(event.result)}
+
+
+def _format_event(payload: dict, sse: bool) -> str:
+    data = json.dumps(payload)
+    if sse:
+        return f"event: {payload['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def _read_batch_request(request: Request) -> tuple[list[str], str]:
+    """Accept {"urls": [...], "destination": ...} JSON, a newline-delimited text body,
+    or a multipart form with a `file` upload (or `urls` field) and `new_destination`."""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        payload = await request.json()
+        urls = payload.get("urls") if isinstance(payload, dict) else None
+        if not isinstance(urls, list):
+            raise HTTPException(status_code=400, detail="JSON body must contain a 'urls' list")
+        return [str(u) for u in urls], str(payload.get("destination") or "")
+    if content_type.startswith("multipart/form-data") or content_type.startswith("application/x-www-form-urlencoded"):
+        form = await request.form()
+        upload = form.get("file")
+        text = (await upload.read()).decode("utf-8") if hasattr(upload, "read") else str(form.get("urls") or "")
+        return _split_url_lines(text), str(form.get("new_destination") or "")
+    return _split_url_lines((await request.body()).decode("utf-8")), request.query_params.get("destination", "")
+
+
+def _split_url_lines(text: str) -> list[str]:
+    lines = (line.strip() for line in text.splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+@router.post("/extract/batch")
+async def extract_batch(request: Request,
+                        http: HttpClientPort = HttpClientDep,
+                        cpu_executor = CpuExecutorDep,
+                        metrics: MetricsPort = MetricsDep):
+    urls, new_destination = await _read_batch_request(request)
+    if not urls:
+        raise HTTPException(status_code=400, detail="No URLs given")
+    if len(urls) > settings.batch_max_urls:
+        raise HTTPException(status_code=413, detail=f"At most {settings.batch_max_urls} URLs per batch")
+
+    dest_path = new_destination or "exports"
+    logger.info("Batch extracting %d URLs to %s", len(urls), dest_path)
+    try:
+        storage = create_storage(base_dir=dest_path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    usecase = build_usecase(http, AccordionContentExtractor(), create_image_extractor(), storage, cpu_executor,
+                            metrics=metrics)
+    batch = BatchExtractUseCase(usecase, concurrency=settings.batch_concurrency,
+                                per_host_concurrency=settings.batch_per_host_concurrency)
+    # Each URL gets its own sub-folder of the destination
+    result = await batch.execute(urls)
+    return JSONResponse({
+        "total": len(result.items),
+        "succeeded": result.succeeded,
+        "failed": result.failed,
+        "elapsed_s": result.elapsed_s,
+        "items": [asdict(item) for item in result.items],
+    })
+
+
+@router.post("/extract/jobs", status_code=202)
+async def submit_extract_job(url: str = Form(...),
+                             new_destination: str = Form(""),
+                             http: HttpClientPort = HttpClientDep,
+                             cpu_executor = CpuExecutorDep,
+                             metrics: MetricsPort = MetricsDep,
+                             jobs: ExtractionJobQueue | DurableJobQueue = JobQueueDep):
+    """Queue an extraction and return its id at once; poll GET /extract/jobs/{id}."""
+    dest_path = new_destination or "exports"
+    try:
+        usecase = build_page_usecase(http, dest_path, cpu_executor, metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        job = await jobs.asubmit(url, dest_path, usecase)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    logger.info("Queued job %s for %s", job.id, url)
+    return JSONResponse(_job_payload(job), status_code=202,
+                        headers={"Location": f"/extract/jobs/{job.id}"})
+
+
+@router.get("/extract/jobs/{job_id}")
+async def extract_job_status(job_id: str, jobs: ExtractionJobQueue | DurableJobQueue = JobQueueDep):
+    job = await jobs.aget(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return JSONResponse(_job_payload(job))
+
+
+def _job_payload(job: ExtractionJob) -> dict:
+    return {
+        "id": job.id,
+        "url": job.url,
+        "destination": job.destination,
+        "status": job.status,
+        "attempts": job.attempts,
+        "images_done": job.images_done,
+        "images_total": job.images_total,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "result": asdict(job.result) if job.result is not None else None,
+        "error": job.error,
+    }
+
+
+@router.get("/ready")
+async def readiness(warmup: Optional[asyncio.Task] = WarmupDep):
+    """Readiness probe: 503 until the startup warm-up (WARMUP) has finished."""
+    if warmup is None:
+        return JSONResponse({"status": "ready", "warmup_s": None})
+    if not warmup.done():
+        return JSONResponse({"status": "warming up"}, status_code=503)
+    return JSONResponse({"status": "ready", "warmup_s": round(warmup.result(), 3)})
+
+
+@router.get("/stats/http-cache")
+async def http_cache_stats(http: HttpClientPort = HttpClientDep):
+    stats = http.cache_stats() if hasattr(http, "cache_stats") else None
+    if stats is None:
+        return JSONResponse({"enabled": False})
+    return JSONResponse({"enabled": True, **asdict(stats)})
+
+
+
+@router.get("/metrics")
+async def metrics_endpoint(metrics: PrometheusMetrics = MetricsDep):
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,66 @@
+"""Run extraction jobs from the SQLite job store, for JOB_BACKEND=sqlite.
+
+    python -m app.worker [--db PATH] [--concurrency N] [--worker-id ID] [--drain]
+
+Start one process per core to spare, on this host or on others sharing the
+database volume; the API then only enqueues jobs. SIGTERM or Ctrl-C hands
+running jobs back to the queue.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+from .application.job_worker import JobWorker
+from .config import settings
+from .containers import build_page_usecase, create_cpu_executor, create_http_client, create_job_store
+
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker(args: argparse.Namespace) -> JobWorker:
+    store = create_job_store(args.db)
+    http = create_http_client()
+    # Threads keep parsing and resizing off the event loop, so leases are renewed on time;
+    # the process itself is the unit of parallelism
+    cpu_executor = create_cpu_executor(args.engine, args.concurrency)
+    worker = JobWorker(store, lambda dest_path: build_page_usecase(http, dest_path, cpu_executor),
+                       worker_id=args.worker_id, concurrency=args.concurrency, lease_s=settings.job_lease_s,
+                       poll_interval_s=args.poll_interval, retry_delay_s=settings.job_retry_delay_s)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    logger.info("Worker %s polling %s", args.worker_id, args.db)
+    try:
+        await worker.run(stop, drain=args.drain)
+    finally:
+        await http.aclose()
+        if cpu_executor is not None:
+            cpu_executor.shutdown(wait=True)
+    return worker
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run queued extraction jobs.")
+    parser.add_argument("--db", default=settings.job_db_path, help="job database (default: JOB_DB_PATH)")
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency,
+                        help="jobs run at once by this process (default: WORKER_CONCURRENCY)")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}",
+                        help="name recorded on claimed jobs (default: host:pid)")
+    parser.add_argument("--engine", choices=("inline", "thread"), default="thread",
+                        help="where CPU-bound stages run within this process")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between polls of an empty queue")
+    parser.add_argument("--drain", action="store_true", help="exit once no job is ready to run")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=settings.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = asyncio.run(run_worker(args))
+    print(f"Worker {args.worker_id}: {worker.processed} jobs done, {worker.failed} failed attempts")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""Accordion extraction speed: the current engine against earlier revisions.
+
+    python -m benchmarks.bench_accordion [--rev 4dc90ae] [--repeat 5]
+
+Each ``--rev`` loads AccordionContentExtractor from that git revision (the
+baseline BeautifulSoup version needs ``beautifulsoup4`` installed). Pages are
+the corpus product page plus synthetic pages with many, deeply nested
+accordions. Outputs must be identical; the time is the best of ``--repeat``
+runs of the accordion pass alone (trafilatura is not included).
+"""
+from __future__ import annotations
+import argparse
+import inspect
+import os
+import subprocess
+import time
+import types
+from typing import Callable, Dict, List, Tuple
+
+from app.infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
+from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+
+from .server import CORPUS_DIR
+
+_MODULE_PATH = "app/infrastructure/extraction/accordion_content_extractor.py"
+
+
+def synthetic_page(accordions: int, depth: int, script: bool = False) -> str:
+    """``accordions`` <details>, each wrapping its content in ``depth`` nested content divs
+    (with ``script``, each also holds an inline script whose text must be left out)."""
+    sections = []
+    for i in range(accordions):
+        title = ("Ingredients", "How to use", f"Details {i}")[i % 3]
+        body = f"<p>Paragraph {i} with <b>bold</b> text<!-- c --> and a tail.</p>" * 3
+        if script:
+            body += f"<script>track({i})</script>"
+        for level in range(depth):
+            body = f'<div class="accordion__content level-{level}">{body}<span>level {level}</span></div>'
+        sections.append(f"<details><summary><h3>{title}</h3></summary>{body}</details>")
+    return "<html><body><main><h1>Synthetic</h1>" + "".join(sections) + "</main></body></html>"
+
+
+def load_revision(rev: str) -> type:
+    source = subprocess.run(["git", "show", f"{rev}:{_MODULE_PATH}"], capture_output=True, text=True,
+                            check=True).stdout
+    module = types.ModuleType(f"accordion_{rev}")
+    # Relative imports resolve against the current package
+    module.__package__ = "app.infrastructure.extraction"
+    exec(compile(source, f"{rev}:{_MODULE_PATH}", "exec"), module.__dict__)
+    return module.AccordionContentExtractor
+
+
+def runner(extractor_cls: type, html: str, url: str) -> Callable[[], str]:
+    extractor = extractor_cls()
+    params = inspect.signature(extractor._extract_accordion_content).parameters
+    if "html" in params:
+        # Baseline: parses the HTML itself with BeautifulSoup
+        return lambda: extractor._extract_accordion_content(html, url)
+    tree = LxmlHtmlParser().parse(html, url).tree
+    return lambda: extractor._extract_accordion_content(tree)
+
+
+def best_ms(fn: Callable[[], str], repeat: int) -> Tuple[float, str]:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn()
+        timings.append(time.perf_counter() - started)
+    return round(min(timings) * 1000, 2), out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark accordion extraction engines.")
+    parser.add_argument("--rev", action="append", default=[],
+                        help="git revision to compare against (repeatable; default: the baseline)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(os.path.join(CORPUS_DIR, "product_accordion.html"), encoding="utf-8") as f:
+        pages: Dict[str, str] = {"product_accordion": f.read()}
+    pages["synthetic_500x3"] = synthetic_page(500, 3)
+    pages["synthetic_100x40"] = synthetic_page(100, 40)
+    pages["synthetic_scripts"] = synthetic_page(300, 3, script=True)
+
+    engines: Dict[str, type] = {"current": AccordionContentExtractor}
+    for rev in args.rev or ["4dc90ae"]:
+        engines[rev] = load_revision(rev)
+
+    others = [name for name in engines if name != "current"]
+    print(f"{'page':<20}" + "".join(f"{name:>14}" for name in engines)
+          + "".join(f"{'vs ' + name:>14}" for name in others))
+    for page_name, html in pages.items():
+        url = f"https://shop.example.com/p/{page_name}"
+        results = {name: best_ms(runner(cls, html, url), args.repeat) for name, cls in engines.items()}
+        reference = results["current"][1]
+        for name, (_, out) in results.items():
+            if out != reference:
+                raise SystemExit(f"{name} output differs from current on {page_name}")
+        current_ms = max(results["current"][0], 1e-6)
+        row = "".join(f"{ms:>12.2f}ms" for ms, _ in results.values())
+        speedups = "".join(f"{results[name][0] / current_ms:>13.1f}x" for name in others)
+        print(f"{page_name:<20}{row}{speedups}")
+
+
+if __name__ == "__main__":
+    main()
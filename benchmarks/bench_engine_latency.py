@@ -0,0 +1,140 @@
+"""Request latency while heavy extractions run, per extraction engine.
+
+Starts ``--jobs`` concurrent extractions of a large synthetic product page
+(long article, many accordions, large JPEGs) and meanwhile probes ``GET /``
+of the app every ``--probe-interval`` seconds. With the ``inline`` engine the
+probes queue behind parsing and Pillow work; with ``thread``/``process`` the
+event loop stays responsive (``process`` also avoids GIL contention).
+
+    python -m benchmarks.bench_engine_latency --engines inline thread process
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import io
+import json
+import statistics
+import time
+
+import httpx
+from PIL import Image
+
+from app.application.extract_usecase import ExtractUseCase
+from app.containers import create_cpu_executor
+from app.domain.ports import HttpClientPort, StoragePort
+from app.infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
+from app.infrastructure.extraction.image_extractor import ImageExtractor
+from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+from app.main import app
+
+
+def heavy_page(paragraphs: int = 3000, accordions: int = 300, images: int = 12) -> str:
+    body = [f"<p>Paragraph {i}: " + "lorem ipsum dolor sit amet " * 12 + "</p>" for i in range(paragraphs)]
+    body += [
+        f"<details><summary><h3>Section {i}</h3></summary>"
+        f"<div class='accordion__content'><p>{'Aqua, Glycerin, Shea Butter, ' * 8}</p></div></details>"
+        for i in range(accordions)
+    ]
+    body += [f"<img src='/img/{i}.jpg'/>" for i in range(images)]
+    return "<html><body><main><h1>Heavy page</h1>" + "".join(body) + "</main></body></html>"
+
+
+def large_jpeg(width: int = 4000, height: int = 3000) -> bytes:
+    buf = io.BytesIO()
+    Image.linear_gradient("L").resize((width, height)).convert("RGB").save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+class InMemoryHttp(HttpClientPort):
+    def __init__(self, html: str, image: bytes, latency: float = 0.005):
+        self.html, self.image, self.latency = html, image, latency
+
+    async def get_text(self, url: str, timeout: float = 20.0) -> str:
+        await asyncio.sleep(self.latency)
+        return self.html
+
+    async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
+        await asyncio.sleep(self.latency)
+        return self.image
+
+
+class NullStorage(StoragePort):
+    def list_destinations(self) -> list[str]:
+        return []
+
+    def ensure_destination(self, name: str) -> str:
+        return name
+
+    def save_markdown(self, dest: str, filename: str, content: str) -> str:
+        return filename
+
+    def save_binary(self, dest: str, filename: str, content: bytes) -> str:
+        return filename
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+async def run_engine(engine: str, workers: int, jobs: int, probe_interval: float,
+                     http: HttpClientPort) -> dict:
+    executor = create_cpu_executor(engine, workers)
+    usecase = ExtractUseCase(http, LxmlHtmlParser(), AccordionContentExtractor(), ImageExtractor(),
+                             NullStorage(), cpu_executor=executor)
+    latencies: list[float] = []
+    try:
+        if executor is not None:
+            # Warm the pool (process start-up, imports) outside the measurement
+            await usecase.execute("https://bench.local/warmup", "")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as client:
+            started = time.perf_counter()
+            work = asyncio.gather(*[usecase.execute(f"https://bench.local/p/{i}", "") for i in range(jobs)])
+            # Latency is measured from each probe's scheduled send time, so time the
+            # loop spends blocked counts against the probe (no coordinated omission).
+            due = started
+            while not work.done():
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/")
+                latencies.append(time.perf_counter() - due)
+                due += probe_interval
+            await work
+            elapsed = time.perf_counter() - started
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+    return {
+        "engine": engine,
+        "workers": workers,
+        "jobs": jobs,
+        "extraction_wall_s": round(elapsed, 3),
+        "probes": len(latencies),
+        "probe_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "probe_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "probe_max_ms": round(max(latencies) * 1000, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", nargs="+", default=["inline", "thread", "process"])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent heavy extractions")
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    http = InMemoryHttp(heavy_page(), large_jpeg())
+    rows = [await run_engine(e, args.workers, args.jobs, args.probe_interval, http) for e in args.engines]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'engine':<8} {'wall s':>8} {'probes':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for r in rows:
+        print(f"{r['engine']:<8} {r['extraction_wall_s']:>8} {r['probes']:>7} "
+              f"{r['probe_p50_ms']:>8} {r['probe_p95_ms']:>8} {r['probe_max_ms']:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
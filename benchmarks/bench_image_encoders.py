@@ -0,0 +1,86 @@
+"""CPU time and output size of the image encoders, per format and preset.
+
+    python -m benchmarks.bench_image_encoders [--repeat 3] [--output encoders.json]
+
+Runs ImageExtractor.resize_image_square_max over a fixed set of generated
+sources (large and already-small photos, a transparent logo, a large PNG and a
+WebP) for every IMAGE_FORMAT x IMAGE_PRESET, with and without passthrough.
+"""
+from __future__ import annotations
+import argparse
+import json
+import time
+from typing import Dict, List, Tuple
+
+from PIL import Image
+
+from app.infrastructure.extraction.image_extractor import ImageExtractor
+
+from .server import generate_image
+
+# (name, width, height, Pillow format)
+SOURCES: List[Tuple[str, int, int, str]] = [
+    ("hero_2400x1600.jpg", 2400, 1600, "JPEG"),
+    ("product_1200x1200.jpg", 1200, 1200, "JPEG"),
+    ("thumb_640x480.jpg", 640, 480, "JPEG"),
+    ("logo_240x80.png", 240, 80, "PNG"),
+    ("banner_1600x600.png", 1600, 600, "PNG"),
+    ("photo_1600x1200.webp", 1600, 1200, "WEBP"),
+]
+
+
+def _cpu_ms(extractor: ImageExtractor, content: bytes, repeat: int) -> Tuple[float, bytes, str]:
+    started = time.process_time()
+    for _ in range(repeat):
+        out, ext = extractor.resize_image_square_max(content, 800)
+    return (time.process_time() - started) * 1000 / repeat, out, ext
+
+
+def bench(repeat: int) -> Dict[str, Dict[str, object]]:
+    sources = {name: generate_image(w, h, fmt, seed=name) for name, w, h, fmt in SOURCES}
+    results: Dict[str, Dict[str, object]] = {}
+    for fmt in ("jpeg", "webp"):
+        for preset in ("fast", "balanced", "small"):
+            for passthrough in (True, False):
+                extractor = ImageExtractor(output_format=fmt, preset=preset, passthrough=passthrough)
+                per_image: Dict[str, Dict[str, object]] = {}
+                for name, content in sources.items():
+                    ms, out, ext = _cpu_ms(extractor, content, repeat)
+                    per_image[name] = {"cpu_ms": round(ms, 2), "bytes": len(out), "ext": ext,
+                                       "passed_through": out is content}
+                key = f"{fmt}-{preset}" + ("" if passthrough else "-reencode")
+                results[key] = {
+                    "cpu_ms": round(sum(v["cpu_ms"] for v in per_image.values()), 2),
+                    "bytes": sum(v["bytes"] for v in per_image.values()),
+                    "images": per_image,
+                }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark image encoders and presets.")
+    parser.add_argument("--repeat", type=int, default=3, help="encodes per image and configuration")
+    parser.add_argument("--output", help="also write JSON results to this file")
+    args = parser.parse_args()
+
+    results = bench(args.repeat)
+    source_bytes = sum(len(generate_image(w, h, fmt, seed=name)) for name, w, h, fmt in SOURCES)
+    print(f"{len(SOURCES)} sources, {source_bytes / 1024:.0f} KiB in total (Pillow {Image.__version__})")
+    print(f"{'configuration':<24}{'cpu ms':>10}{'KiB out':>10}  passed through")
+    for key, result in results.items():
+        passed = [name for name, v in result["images"].items() if v["passed_through"]]
+        print(f"{key:<24}{result['cpu_ms']:>10.1f}{result['bytes'] / 1024:>10.1f}  {', '.join(passed) or '-'}")
+    default, reencode = results["jpeg-balanced"]["images"], results["jpeg-balanced-reencode"]["images"]
+    print(f"\n{'jpeg-balanced per source':<24}{'cpu ms':>10}{'KiB out':>10}{'re-encode ms':>14}{'KiB':>8}")
+    for name in default:
+        print(f"{name:<24}{default[name]['cpu_ms']:>10.2f}{default[name]['bytes'] / 1024:>10.1f}"
+              f"{reencode[name]['cpu_ms']:>14.2f}{reencode[name]['bytes'] / 1024:>8.1f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
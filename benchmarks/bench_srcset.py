@@ -0,0 +1,102 @@
+"""Bytes downloaded for the images of each fixture page: srcset/<picture>
+candidate selection against an earlier revision of ImageExtractor.
+
+    python -m benchmarks.bench_srcset [--rev 1d0f4f3] [--max-px 800] [--output srcset.json]
+
+``--rev`` loads ImageExtractor from that git revision (the default one took
+the first srcset candidate and every <source> of a <picture>). Every URL either
+version discovers is fetched from the corpus server; failed requests (e.g.
+formats the server does not produce) count as requests but not bytes.
+"Undersized" images are smaller than --max-px on their longest side, so they
+lose detail compared with a candidate that covers it.
+"""
+from __future__ import annotations
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import types
+from typing import Dict, List
+
+import httpx
+from PIL import Image
+
+from app.infrastructure.extraction.image_extractor import ImageExtractor
+from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+
+from .server import CORPUS_DIR, PAGES, CorpusServer
+
+_MODULE_PATH = "app/infrastructure/extraction/image_extractor.py"
+
+
+def load_revision(rev: str) -> type:
+    source = subprocess.run(["git", "show", f"{rev}:{_MODULE_PATH}"], capture_output=True, text=True,
+                            check=True).stdout
+    module = types.ModuleType(f"image_extractor_{rev}")
+    # Relative imports resolve against the current package
+    module.__package__ = "app.infrastructure.extraction"
+    # dataclasses look the module up while processing string annotations
+    sys.modules[module.__name__] = module
+    exec(compile(source, f"{rev}:{_MODULE_PATH}", "exec"), module.__dict__)
+    return module.ImageExtractor
+
+
+def measure(client: httpx.Client, urls: List[str], max_px: int) -> Dict[str, int]:
+    totals = {"images": len(urls), "failed": 0, "bytes": 0, "undersized": 0}
+    for url in urls:
+        resp = client.get(url)
+        if resp.status_code != 200:
+            totals["failed"] += 1
+            continue
+        totals["bytes"] += len(resp.content)
+        with Image.open(io.BytesIO(resp.content)) as im:
+            if max(im.size) < max_px:
+                totals["undersized"] += 1
+    return totals
+
+
+def bench(rev: str, max_px: int) -> Dict[str, Dict[str, Dict[str, int]]]:
+    extractors = {rev: load_revision(rev)(), "current": ImageExtractor()}
+    parser = LxmlHtmlParser()
+    results: Dict[str, Dict[str, Dict[str, int]]] = {}
+    with CorpusServer() as server, httpx.Client() as client:
+        for name in PAGES:
+            with open(os.path.join(CORPUS_DIR, f"{name}.html"), encoding="utf-8") as f:
+                page = parser.parse(f.read(), server.page_url(name))
+            results[name] = {}
+            for label, extractor in extractors.items():
+                if label == "current":
+                    urls = list(extractor.discover_image_urls(page, max_px=max_px))
+                else:
+                    urls = list(extractor.discover_image_urls(page))
+                results[name][label] = measure(client, urls, max_px)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark srcset/<picture> candidate selection.")
+    parser.add_argument("--rev", default="1d0f4f3", help="git revision to compare against")
+    parser.add_argument("--max-px", type=int, default=800, help="target size images are resized to")
+    parser.add_argument("--output", help="also write JSON results to this file")
+    args = parser.parse_args()
+
+    results = bench(args.rev, args.max_px)
+    print(f"{'page':<20}{'version':<10}{'images':>8}{'failed':>8}{'undersized':>12}{'KiB':>10}")
+    totals = {label: 0 for label in (args.rev, "current")}
+    for name, by_version in results.items():
+        for label, r in by_version.items():
+            totals[label] += r["bytes"]
+            print(f"{name:<20}{label:<10}{r['images']:>8}{r['failed']:>8}{r['undersized']:>12}{r['bytes'] / 1024:>10.0f}")
+    before, after = totals[args.rev], totals["current"]
+    saved = before - after
+    print(f"\nTotal: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB, "
+          f"{saved / 1024:.0f} KiB saved ({100 * saved / before if before else 0:.1f}%)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "bytes_saved": saved}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
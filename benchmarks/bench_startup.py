@@ -0,0 +1,105 @@
+"""Cold start: import time of app.main, and time to ready and to the first
+extraction of a freshly started server, with and without WARMUP.
+
+    python -m benchmarks.bench_startup [--repeat 5] [--page article] [--output startup.json]
+
+Import time is measured in a new interpreter each time (median of --repeat).
+For each WARMUP setting a uvicorn process is started and timed until GET /ready
+answers 200, then the same corpus page is extracted twice through
+POST /extract/archive: the first request pays whatever initialisation is left,
+the second shows the steady state. Results can be compared across revisions
+with benchmarks.compare.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import httpx
+
+from .server import CorpusServer
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IMPORT = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def import_time(repeat: int) -> Dict[str, float]:
+    times = [float(subprocess.run([sys.executable, "-c", _IMPORT], cwd=_ROOT, capture_output=True, text=True,
+                                  check=True).stdout) for _ in range(repeat)]
+    return {"median_s": round(statistics.median(times), 4), "min_s": round(min(times), 4)}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def cold_start(page_url: str, warmup: bool, timeout: float = 60.0) -> Dict[str, float]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, WARMUP="true" if warmup else "false", BASE_DATA_DIR=data_dir, LOG_LEVEL="WARNING")
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+                                 "--log-level", "warning"], cwd=_ROOT, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            with httpx.Client(timeout=timeout) as client:
+                while True:
+                    if proc.poll() is not None:
+                        raise RuntimeError("uvicorn exited during startup")
+                    if time.perf_counter() - started > timeout:
+                        raise TimeoutError("server did not become ready")
+                    try:
+                        if client.get(f"{base}/ready").status_code == 200:
+                            break
+                    except httpx.TransportError:
+                        pass
+                    time.sleep(0.01)
+                ready = time.perf_counter() - started
+                latencies = []
+                for _ in range(2):
+                    t = time.perf_counter()
+                    client.post(f"{base}/extract/archive", data={"url": page_url}).raise_for_status()
+                    latencies.append(time.perf_counter() - t)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+    return {"ready_s": round(ready, 4), "first_request_s": round(latencies[0], 4),
+            "second_request_s": round(latencies[1], 4)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark import time and first-request latency.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters for the import time")
+    parser.add_argument("--page", default="article", help="corpus page extracted by the timed requests")
+    parser.add_argument("--output", help="also write JSON results to this file")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {"import": import_time(args.repeat)}
+    with CorpusServer() as server:
+        for warmup in (False, True):
+            results["warmup" if warmup else "no_warmup"] = cold_start(server.page_url(args.page), warmup)
+
+    print(f"import app.main: {results['import']['median_s'] * 1000:.0f} ms median, "
+          f"{results['import']['min_s'] * 1000:.0f} ms best of {args.repeat}")
+    print(f"{'WARMUP':<12}{'ready ms':>10}{'1st request ms':>16}{'2nd request ms':>16}")
+    for key in ("no_warmup", "warmup"):
+        r = results[key]
+        print(f"{key:<12}{r['ready_s'] * 1000:>10.0f}{r['first_request_s'] * 1000:>16.0f}"
+              f"{r['second_request_s'] * 1000:>16.0f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Job throughput against the number of worker processes sharing one SQLite queue.
+
+    python -m benchmarks.bench_workers [--workers 1 2 4] [--jobs 48] [--concurrency 2]
+
+For each worker count, starts that many ``python -m app.worker`` processes on a
+fresh job database, waits until all of them poll, enqueues ``--jobs`` extractions
+of the corpus pages (served by CorpusServer) and times until every job is done.
+Process start-up is not included; efficiency is speedup / workers.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from app.infrastructure.jobs.sqlite_job_store import SqliteJobStore
+
+from .server import PAGES, CorpusServer
+
+
+def start_workers(count: int, db: str, concurrency: int, data_dir: str) -> List[subprocess.Popen]:
+    env = {**os.environ, "BASE_DATA_DIR": data_dir, "LOG_LEVEL": "INFO", "INCREMENTAL_EXTRACTION": "false",
+           "HTTP_CACHE_DIR": "", "IMAGE_STORE_DIR": ""}
+    procs = [
+        subprocess.Popen([sys.executable, "-m", "app.worker", "--db", db, "--concurrency", str(concurrency),
+                          "--worker-id", f"bench-{i}", "--poll-interval", "0.02"],
+                         env=env, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True)
+        for i in range(count)
+    ]
+    for proc in procs:
+        # Wait for the start-up log line, then keep draining stderr so the worker never blocks on it
+        for line in proc.stderr:
+            if " polling " in line:
+                break
+        else:
+            raise SystemExit(f"worker exited during start-up ({proc.wait()})")
+        threading.Thread(target=proc.stderr.read, daemon=True).start()
+    return procs
+
+
+def run(server: CorpusServer, workers: int, jobs: int, concurrency: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory(prefix="bench-workers-") as tmp:
+        db = os.path.join(tmp, "jobs.sqlite3")
+        store = SqliteJobStore(db)
+        procs = start_workers(workers, db, concurrency, tmp)
+        try:
+            started = time.perf_counter()
+            ids = [store.enqueue(server.page_url(PAGES[i % len(PAGES)]), os.path.join(tmp, "out", f"job_{i:04d}")).id
+                   for i in range(jobs)]
+            while True:
+                states = [store.get(job_id) for job_id in ids]
+                if all(job.finished for job in states):
+                    break
+                time.sleep(0.02)
+            elapsed = time.perf_counter() - started
+        finally:
+            for proc in procs:
+                proc.send_signal(signal.SIGTERM)
+            for proc in procs:
+                proc.wait()
+        failed = sum(job.status != "done" for job in states)
+        return {"workers": workers, "jobs": jobs, "failed": failed, "elapsed_s": round(elapsed, 3),
+                "jobs_per_s": round(jobs / elapsed, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark job throughput per worker process count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--jobs", type=int, default=48)
+    parser.add_argument("--concurrency", type=int, default=2, help="jobs per worker process (WORKER_CONCURRENCY)")
+    parser.add_argument("--latency", type=float, default=0.01, help="simulated server latency per request")
+    parser.add_argument("--output", help="also write JSON results to this file")
+    args = parser.parse_args()
+
+    with CorpusServer(latency=args.latency) as server:
+        # Warm-up: the server generates each image on first request
+        run(server, 1, len(PAGES), 1)
+        results = [run(server, workers, args.jobs, args.concurrency) for workers in args.workers]
+
+    base = results[0]["jobs_per_s"] / results[0]["workers"]
+    print(f"{args.jobs} jobs over {len(PAGES)} corpus pages, {os.cpu_count()} CPUs, {args.concurrency} jobs per worker")
+    if max(args.workers) > (os.cpu_count() or 1):
+        print("(worker counts above the CPU count cannot scale further)")
+    print(f"{'workers':>8}{'elapsed s':>11}{'jobs/s':>9}{'speedup':>9}{'efficiency':>12}{'failed':>8}")
+    for result in results:
+        speedup = result["jobs_per_s"] / base
+        result["speedup"] = round(speedup, 2)
+        print(f"{result['workers']:>8}{result['elapsed_s']:>11.2f}{result['jobs_per_s']:>9.2f}"
+              f"{speedup:>8.2f}x{speedup / result['workers']:>11.0%}{result['failed']:>8}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
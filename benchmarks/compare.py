@@ -0,0 +1,46 @@
+"""Compare two benchmark result files from ``benchmarks.run``.
+
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 5]
+
+Prints every numeric metric present in both files with its relative change;
+changes beyond the threshold are flagged.
+"""
+from __future__ import annotations
+import argparse
+import json
+from typing import Dict, Iterator, Tuple
+
+
+def flatten(data: object, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if prefix == "" and key == "meta":
+                continue
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=5.0, help="flag changes above this percentage")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        old: Dict[str, float] = dict(flatten(json.load(f)))
+    with open(args.candidate, encoding="utf-8") as f:
+        new: Dict[str, float] = dict(flatten(json.load(f)))
+
+    width = max((len(k) for k in old if k in new), default=10)
+    print(f"{'metric':<{width}} {'baseline':>12} {'candidate':>12} {'change':>9}")
+    for key in sorted(k for k in old if k in new):
+        before, after = old[key], new[key]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = " *" if abs(change) > args.threshold else ""
+        print(f"{key:<{width}} {before:>12.3f} {after:>12.3f} {change:>+8.1f}%{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Benchmark suite: end-to-end extraction, per-extractor CPU time and peak memory.
+
+Serves the fixture corpus (article, accordion-heavy product page, image
+gallery) from a local CorpusServer and writes machine-readable results:
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.compare baseline.json bench.json
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from app.application.extract_usecase import ExtractUseCase
+from app.containers import create_cpu_executor
+from app.infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
+from app.infrastructure.extraction.image_extractor import ImageExtractor
+from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+from app.infrastructure.extraction.trafilatura_markdown_extractor import TrafilaturaMarkdownExtractor
+from app.infrastructure.http.httpx_client import HttpxClient
+from app.infrastructure.storage.filesystem_storage import FilesystemStorage
+
+from .server import PAGES, CorpusServer
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    ms = [s * 1000 for s in seconds]
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 2),
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p90_ms": round(percentile(ms, 90), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2),
+    }
+
+
+def build_usecase(http: HttpxClient, out_dir: str, executor) -> ExtractUseCase:
+    storage = FilesystemStorage(base_dir=out_dir, async_writes=True)
+    return ExtractUseCase(http, LxmlHtmlParser(), AccordionContentExtractor(), ImageExtractor(), storage,
+                          cpu_executor=executor)
+
+
+async def bench_end_to_end(server: CorpusServer, iterations: int, concurrency: int, engine: str,
+                           workers: int) -> Dict[str, object]:
+    """Throughput and latency percentiles of ExtractUseCase.execute over the corpus."""
+    executor = create_cpu_executor(engine, workers)
+    http = HttpxClient()
+    latencies: Dict[str, List[float]] = {name: [] for name in PAGES}
+    slots = asyncio.Semaphore(concurrency)
+    try:
+        with tempfile.TemporaryDirectory() as out_dir:
+            usecase = build_usecase(http, out_dir, executor)
+            # Warm-up: imports, process start-up and server-side image generation
+            for name in PAGES:
+                await usecase.execute(server.page_url(name), f"warmup/{name}")
+
+            async def one(name: str, i: int) -> None:
+                async with slots:
+                    started = time.perf_counter()
+                    await usecase.execute(server.page_url(name), f"run-{i}/{name}")
+                    latencies[name].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[one(name, i) for i in range(iterations) for name in PAGES])
+            wall = time.perf_counter() - started
+    finally:
+        await http.aclose()
+        if executor is not None:
+            executor.shutdown(wait=True)
+    all_latencies = [s for values in latencies.values() for s in values]
+    return {
+        "engine": engine,
+        "workers": workers,
+        "concurrency": concurrency,
+        "extractions": len(all_latencies),
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(len(all_latencies) / wall, 3),
+        "latency": latency_summary(all_latencies),
+        "per_page": {name: latency_summary(values) for name, values in latencies.items()},
+    }
+
+
+def _cpu_ms(fn: Callable[[], object], repeat: int) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return round((time.process_time() - started) * 1000 / repeat, 3)
+
+
+def _fetch(url: str) -> bytes:
+    try:
+        with urllib.request.urlopen(url) as resp:
+            return resp.read()
+    except urllib.error.HTTPError:
+        return b""  # e.g. formats the stand-in cannot generate
+
+
+def bench_extractor_cpu(server: CorpusServer, repeat: int, max_images: int) -> Dict[str, Dict[str, float]]:
+    """Mean CPU milliseconds per call of each extraction stage, per corpus page."""
+    parser = LxmlHtmlParser()
+    accordion = AccordionContentExtractor()
+    trafilatura_ext = TrafilaturaMarkdownExtractor()
+    images = ImageExtractor()
+    results: Dict[str, Dict[str, float]] = {}
+    for name in PAGES:
+        url = server.page_url(name)
+        html = _fetch(url).decode("utf-8")
+        page = parser.parse(html, url)
+        image_bodies = [_fetch(u) for u in list(images.discover_image_urls(page))[:max_images]]
+        image_bodies = [b for b in image_bodies if b]
+        results[name] = {
+            "parse_ms": _cpu_ms(lambda: parser.parse(html, url), repeat),
+            "accordion_extract_markdown_ms": _cpu_ms(lambda: accordion.extract_markdown(page), repeat),
+            "accordion_sections_only_ms": _cpu_ms(lambda: accordion._extract_accordion_content(page.tree), repeat),
+            "trafilatura_extract_markdown_ms": _cpu_ms(lambda: trafilatura_ext.extract_markdown(page), repeat),
+            "image_discover_ms": _cpu_ms(lambda: images.discover_image_urls(page), repeat),
+            "image_resize_ms_per_image": round(
+                _cpu_ms(lambda: [images.resize_image_square_max(b, 800) for b in image_bodies], 1)
+                / max(1, len(image_bodies)), 3),
+            "images_resized": len(image_bodies),
+        }
+    return results
+
+
+async def bench_memory(server: CorpusServer) -> Dict[str, object]:
+    """Peak traced Python allocations of one inline extraction per page, plus process max RSS.
+
+    tracemalloc does not see Pillow's and lxml's native buffers; max RSS does, but it
+    also includes the in-process stand-in server generating large corpus images.
+    """
+    http = HttpxClient()
+    peaks: Dict[str, float] = {}
+    try:
+        with tempfile.TemporaryDirectory() as out_dir:
+            usecase = build_usecase(http, out_dir, None)
+            for name in PAGES:
+                tracemalloc.start()
+                await usecase.execute(server.page_url(name), f"mem/{name}")
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peaks[name] = round(peak / 2**20, 2)
+    finally:
+        await http.aclose()
+    return {
+        "traced_peak_mib": peaks,
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def metadata(args: argparse.Namespace) -> Dict[str, object]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the extraction benchmark suite.")
+    parser.add_argument("--iterations", type=int, default=5, help="end-to-end passes over the corpus")
+    parser.add_argument("--concurrency", type=int, default=4, help="extractions in flight")
+    parser.add_argument("--engine", default="thread", choices=["inline", "thread", "process"])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cpu-repeat", type=int, default=5, help="calls per CPU-time measurement")
+    parser.add_argument("--max-images", type=int, default=8, help="images resized per page for CPU timing")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated server latency per request (s)")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["e2e", "cpu", "memory"])
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    results: Dict[str, object] = {"meta": metadata(args)}
+    with CorpusServer(latency=args.latency) as server:
+        if "e2e" not in args.skip:
+            results["end_to_end"] = await bench_end_to_end(server, args.iterations, args.concurrency,
+                                                           args.engine, args.workers)
+        if "cpu" not in args.skip:
+            results["cpu"] = bench_extractor_cpu(server, args.cpu_repeat, args.max_images)
+        if "memory" not in args.skip:
+            results["memory"] = await bench_memory(server)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Wrote {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
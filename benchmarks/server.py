@@ -0,0 +1,149 @@
+"""In-process HTTP stand-in serving the fixture corpus and generated images.
+
+    /pages/<name>              benchmarks/corpus/<name>.html
+    /img/<W>x<H>/<name>.<ext>  a W x H image generated on first request (jpg, png, webp)
+
+Responses carry Content-Length, Content-Type and an ETag (If-None-Match gives
+304), so the HTTP client, its cache and the image pipeline see realistic
+traffic without touching the network.
+"""
+from __future__ import annotations
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+PAGES = ("article", "product_accordion", "gallery")
+
+_IMAGE_PATH = re.compile(r"^/img/(\d+)x(\d+)/([\w.-]+)\.(jpg|jpeg|png|webp)$")
+_FORMATS = {"jpg": ("JPEG", "image/jpeg"), "jpeg": ("JPEG", "image/jpeg"),
+            "png": ("PNG", "image/png"), "webp": ("WEBP", "image/webp")}
+
+
+def generate_image(width: int, height: int, fmt: str = "JPEG", seed: str = "") -> bytes:
+    """A photo-like image: smooth colour gradients with low-frequency texture,
+    so encoded sizes are in a realistic range rather than tiny (flat) or huge (noise)."""
+    shift = int(hashlib.md5(seed.encode()).hexdigest()[:2], 16)
+    texture = Image.effect_noise((max(1, width // 16), max(1, height // 16)), 48).resize((width, height), Image.BICUBIC)
+    red = Image.linear_gradient("L").resize((width, height)).point(lambda v: (v + shift) % 256)
+    green = Image.radial_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (red, green, texture))
+    if fmt == "PNG" and width <= 256:
+        image = image.convert("RGBA")  # logos and badges with alpha
+    buf = io.BytesIO()
+    image.save(buf, format=fmt, **({"quality": 85} if fmt in ("JPEG", "WEBP") else {}))
+    return buf.getvalue()
+
+
+class CorpusServer:
+    """Threaded HTTP server on 127.0.0.1 with an ephemeral port.
+
+        with CorpusServer() as server:
+            server.url("/pages/article")
+    """
+
+    def __init__(self, latency: float = 0.0, corpus_dir: str = CORPUS_DIR) -> None:
+        self.latency = latency
+        self.corpus_dir = corpus_dir
+        self.requests = 0
+        self.bytes_sent = 0
+        self._images: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def page_url(self, name: str) -> str:
+        return self.url(f"/pages/{name}")
+
+    def start(self) -> "CorpusServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="corpus-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "CorpusServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def resolve(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """Body and content type for a path, or None (404)."""
+        path = path.split("?", 1)[0]
+        if path.startswith("/pages/"):
+            name = os.path.basename(path[len("/pages/"):])
+            file = os.path.join(self.corpus_dir, f"{name}.html")
+            if not os.path.isfile(file):
+                return None
+            with open(file, "rb") as f:
+                return f.read(), "text/html; charset=utf-8"
+        match = _IMAGE_PATH.match(path)
+        if not match:
+            return None
+        with self._lock:
+            cached = self._images.get(path)
+        if cached is None:
+            width, height, name, ext = int(match[1]), int(match[2]), match[3], match[4]
+            fmt, content_type = _FORMATS[ext]
+            cached = (generate_image(width, height, fmt, seed=name), content_type)
+            with self._lock:
+                self._images[path] = cached
+        return cached
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+                resolved = server.resolve(self.path)
+                if resolved is None:
+                    self._send(404, b"not found", "text/plain")
+                    return
+                body, content_type = resolved
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, b"", content_type, etag)
+                    return
+                self._send(200, body, content_type, etag)
+
+            def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if etag:
+                    self.send_header("ETag", etag)
+                if status != 304:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+                with server._lock:
+                    server.requests += 1
+                    server.bytes_sent += len(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
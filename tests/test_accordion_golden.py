@@ -0,0 +1,39 @@
+"""Golden outputs of the accordion extractor.
+
+Each ``tests/golden/<name>.md`` is what the original BeautifulSoup implementation
+(baseline commit) produced for ``tests/golden/<name>.html`` or the benchmark page
+``benchmarks/corpus/<name>.html``; the lxml engine must reproduce it exactly.
+"""
+import glob
+import os
+import pytest
+from app.infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
+from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_DIR = os.path.join(ROOT, "tests", "golden")
+CORPUS_DIR = os.path.join(ROOT, "benchmarks", "corpus")
+CASES = sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(GOLDEN_DIR, "*.md")))
+
+
+def _page_html(name: str) -> str:
+    for directory in (GOLDEN_DIR, CORPUS_DIR):
+        path = os.path.join(directory, f"{name}.html")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+    raise FileNotFoundError(name)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_accordion_markdown_matches_golden(name):
+    url = f"https://shop.example.com/p/{name}"
+    page = LxmlHtmlParser().parse(_page_html(name), url)
+    with open(os.path.join(GOLDEN_DIR, f"{name}.md"), encoding="utf-8") as f:
+        expected = f.read()
+    assert AccordionContentExtractor()._extract_accordion_content(page.tree) == expected
+
+
+def test_golden_corpus_covers_accordion_cases():
+    assert {"nested_accordions", "inline_markup", "product_accordion"} <= set(CASES)
@@ -0,0 +1,16 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.infrastructure.http.host_scheduler import AdaptiveHostScheduler
+from app.infrastructure.http.httpx_client import HttpxClient
+
+
+def test_lifespan_shares_and_closes_http_client():
+    with TestClient(app) as client:
+        scheduler = app.state.http_client
+        assert isinstance(scheduler, AdaptiveHostScheduler)
+        http = scheduler.inner
+        assert isinstance(http, HttpxClient)
+        assert client.get("/").status_code == 200
+        assert app.state.http_client is scheduler
+        assert not http._client.is_closed
+    assert http._client.is_closed
@@ -0,0 +1,98 @@
+import io
+import os
+import zipfile
+import pytest
+from fastapi.testclient import TestClient
+from app.application.extract_usecase import ExtractUseCase
+from app.containers import http_client_provider
+from app.infrastructure.storage.archive_storage import ArchiveStream, ZipArchiveStorage
+from app.main import app
+from test_extract_usecase import FakeHttp, FakeParser, FakeContent, ManyImages, RealImageHttp
+
+
+@pytest.mark.asyncio
+async def test_each_destination_becomes_one_zip(tmp_path):
+    storage = ZipArchiveStorage(base_dir=str(tmp_path), async_writes=True)
+    usecase = ExtractUseCase(FakeHttp(), FakeParser(), FakeContent(), ManyImages(), storage)
+    res = await usecase.execute("https://example.com/article", "shop/article")
+
+    assert os.listdir(tmp_path) == ["shop"]
+    assert os.listdir(tmp_path / "shop") == ["article.zip"]
+    with zipfile.ZipFile(tmp_path / "shop" / "article.zip") as zf:
+        assert sorted(zf.namelist()) == sorted(["https---example-com-article.md", *res.image_filenames])
+        assert zf.read("https---example-com-article.md").decode("utf-8") == res.markdown
+        assert zf.getinfo("images/img_001.jpg").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("https---example-com-article.md").compress_type == zipfile.ZIP_DEFLATED
+    assert ZipArchiveStorage(base_dir=str(tmp_path / "shop")).list_destinations() == ["article"]
+
+
+def test_unfinished_archive_is_dropped_on_close(tmp_path):
+    storage = ZipArchiveStorage(base_dir=str(tmp_path))
+    dest = storage.ensure_destination("broken")
+    storage.save_binary(dest, "images/img_001.jpg", b"\xff\xd8")
+    storage.close()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_leaves_no_temp_archive(tmp_path):
+    class UnreachableHttp(FakeHttp):
+        async def get_text(self, url, timeout=20.0):
+            raise ConnectionError("unreachable")
+
+    storage = ZipArchiveStorage(base_dir=str(tmp_path), async_writes=True)
+    usecase = ExtractUseCase(UnreachableHttp(), FakeParser(), FakeContent(), ManyImages(), storage)
+    for i in range(3):
+        with pytest.raises(ConnectionError):
+            await usecase.execute(f"https://example.com/{i}", "shop/article")
+    assert os.listdir(tmp_path / "shop") == []
+
+    # Closing the stream part-way (a client that went away) drops the archive too
+    usecase = ExtractUseCase(FakeHttp(), FakeParser(), FakeContent(), ManyImages(), storage)
+    events = usecase.stream("https://example.com/article", "shop/article")
+    await events.__anext__()
+    await events.aclose()
+    assert os.listdir(tmp_path / "shop") == []
+
+
+@pytest.mark.asyncio
+async def test_streamed_zip_is_written_without_seeking():
+    sink = ArchiveStream(chunk_size=16)
+    storage = ZipArchiveStorage(sink=sink, async_writes=True)
+    usecase = ExtractUseCase(FakeHttp(), FakeParser(), FakeContent(), ManyImages(), storage)
+    first = await usecase.execute("https://example.com/a", "a")
+    second = await usecase.execute("https://example.com/b", "b")
+    storage.close()
+    sink.close()
+
+    data = b"".join([chunk async for chunk in sink.chunks()])
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        names = zf.namelist()
+    assert "a/https---example-com-a.md" in names and "b/https---example-com-b.md" in names
+    assert len(names) == 2 + len(first.image_filenames) + len(second.image_filenames)
+    with pytest.raises(ValueError):
+        storage.ensure_destination("../escape")
+
+
+def test_archive_endpoint_streams_zip(tmp_path):
+    app.dependency_overrides[http_client_provider] = RealImageHttp
+    try:
+        with TestClient(app) as client:
+            resp = client.post("/extract/archive", data={"url": "https://example.com/article"})
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    assert resp.headers["content-disposition"] == 'attachment; filename="https---example-com-article.zip"'
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        names = zf.namelist()
+        assert "images/img_001.jpg" in names
+        assert "Hello" in zf.read("https---example-com-article.md").decode("utf-8")
+
+
+def test_archive_endpoint_reports_unreachable_page():
+    with TestClient(app) as client:
+        # Nothing listens on port 9
+        resp = client.post("/extract/archive", data={"url": "http://127.0.0.1:9/page"})
+    assert resp.status_code == 502
@@ -0,0 +1,67 @@
+import asyncio
+from collections import Counter
+import pytest
+import os
+from app.application.batch_usecase import BatchExtractUseCase, batch_folder_name
+from app.application.extract_usecase import ExtractUseCase
+from app.infrastructure.storage.filesystem_storage import FilesystemStorage
+from app.domain.models import ExtractionResult
+from test_extract_usecase import FakeHttp, FakeParser, FakeContent, NoopImage
+
+
+class TrackingUseCase:
+    """Stands in for ExtractUseCase and records concurrency per host."""
+    def __init__(self):
+        self.in_flight = Counter()
+        self.max_per_host = Counter()
+        self.max_total = 0
+        self.destinations = []
+
+    async def execute(self, url: str, destination_name: str) -> ExtractionResult:
+        host = url.split("/")[2]
+        self.in_flight[host] += 1
+        self.max_per_host[host] = max(self.max_per_host[host], self.in_flight[host])
+        self.max_total = max(self.max_total, sum(self.in_flight.values()))
+        self.destinations.append(destination_name)
+        try:
+            await asyncio.sleep(0.01)
+            if url.endswith("/broken"):
+                raise ValueError("404 Not Found")
+            return ExtractionResult(markdown="# ok", image_filenames=["images/img_001.jpg"])
+        finally:
+            self.in_flight[host] -= 1
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_global_and_per_host_limits():
+    urls = [f"https://a.example.com/p/{i}" for i in range(6)] + [f"https://b.example.com/p/{i}" for i in range(6)]
+    urls += ["https://b.example.com/broken", urls[0]]
+    usecase = TrackingUseCase()
+    result = await BatchExtractUseCase(usecase, concurrency=3, per_host_concurrency=2).execute(urls, "catalog")
+
+    assert [item.url for item in result.items] == urls[:-1]  # duplicate dropped, order kept
+    assert usecase.max_per_host["a.example.com"] == 2
+    assert usecase.max_per_host["b.example.com"] == 2
+    assert usecase.max_total == 3
+    assert result.succeeded == 12 and result.failed == 1
+    broken = result.items[-1]
+    assert broken.status == "error" and broken.error == "404 Not Found"
+    assert result.items[0].destination == "catalog/" + batch_folder_name(urls[0])
+    assert batch_folder_name(urls[0]).startswith("https---a-example-com-p-0-")
+    assert result.items[0].image_count == 1
+
+
+@pytest.mark.asyncio
+async def test_urls_with_the_same_safe_filename_get_separate_folders(tmp_path):
+    prefix = "https://www.example-retailer.com/en-gb/skincare/moisturisers/hydrating-day-cream-50ml"
+    urls = [prefix + "/pageA", prefix + "/pageB", "https://shop.test/p?id=1", "https://shop.test/p/id=1"]
+    usecase = ExtractUseCase(FakeHttp(), FakeParser(), FakeContent(), NoopImage(), FilesystemStorage(base_dir=str(tmp_path)))
+    result = await BatchExtractUseCase(usecase).execute(urls, "catalog")
+
+    assert result.succeeded == 4
+    destinations = {item.destination for item in result.items}
+    assert len(destinations) == 4
+    for destination in destinations:
+        files = os.listdir(tmp_path / destination)
+        assert sum(name.endswith(".md") for name in files) == 1
+        assert os.listdir(tmp_path / destination / "images") == ["img_001.jpg"]
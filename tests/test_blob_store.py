@@ -0,0 +1,133 @@
+import errno
+import os
+import pytest
+from app.application.extract_usecase import ExtractUseCase
+from app.domain.models import ParsedPage
+from app.domain.ports import HttpClientPort, HtmlParserPort, ContentExtractorPort, ImageExtractorPort
+from app.infrastructure.storage.blob_store import ContentAddressedImageStore, collect_garbage
+from app.infrastructure.storage.filesystem_storage import FilesystemStorage
+
+
+class LogoHttp(HttpClientPort):
+    async def get_text(self, url: str, timeout: float = 20.0) -> str:
+        return "<html></html>"
+    async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
+        return b"logo-bytes" if url.endswith("logo.png") else url.encode()
+
+
+class StubParser(HtmlParserPort):
+    def parse(self, html: str, base_url: str) -> ParsedPage:
+        return ParsedPage(url=base_url, html=html, tree=None)
+
+
+class StubContent(ContentExtractorPort):
+    def extract_markdown(self, page: ParsedPage) -> str:
+        return "# Page"
+
+
+class CountingImage(ImageExtractorPort):
+    def __init__(self):
+        self.resized = 0
+    def discover_image_urls(self, page: ParsedPage):
+        return ["https://cdn.test/logo.png", page.url + "/hero.jpg"]
+    def resize_image_square_max(self, content: bytes, max_px: int = 800):
+        self.resized += 1
+        return b"resized:" + content, "jpg"
+
+
+@pytest.mark.asyncio
+async def test_shared_images_are_resized_once_and_hardlinked(tmp_path):
+    store = ContentAddressedImageStore(str(tmp_path / "blobs"))
+    storage = FilesystemStorage(base_dir=str(tmp_path / "out"))
+    image_ext = CountingImage()
+    usecase = ExtractUseCase(LogoHttp(), StubParser(), StubContent(), image_ext, storage, image_store=store)
+
+    await usecase.execute("https://shop.test/a", "a")
+    await usecase.execute("https://shop.test/b", "b")
+    res = await usecase.execute("https://shop.test/a", "a")  # re-run over existing output
+
+    assert res.image_filenames == ["images/img_001.jpg", "images/img_002.jpg"]
+    assert image_ext.resized == 3  # shared logo once, each hero once
+    logo_a = tmp_path / "out" / "a" / "images" / "img_001.jpg"
+    logo_b = tmp_path / "out" / "b" / "images" / "img_001.jpg"
+    assert logo_a.read_bytes() == b"resized:logo-bytes"
+    assert os.path.samefile(logo_a, logo_b)
+
+    assert collect_garbage(store, min_age=0).removed == []
+    for name in ("a", "b"):
+        for f in (tmp_path / "out" / name / "images").iterdir():
+            f.unlink()
+    report = collect_garbage(store, min_age=0)
+    assert len(report.removed) == 3
+    assert list(store.iter_blobs()) == []
+
+
+def test_gc_keeps_blobs_referenced_by_symlinks(tmp_path):
+    store = ContentAddressedImageStore(str(tmp_path / "blobs"))
+    blob = store.put("ab" * 32, b"data", "jpg")
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    os.symlink(blob, dest / "img_001.jpg")
+    assert collect_garbage(store, roots=[str(dest)], min_age=0).removed == []
+    assert collect_garbage(store, roots=[], min_age=0, dry_run=True).removed == [blob]
+    assert store.lookup("ab" * 32) == blob
+
+
+def test_destination_on_another_filesystem_gets_a_copy(tmp_path, monkeypatch):
+    store = ContentAddressedImageStore(str(tmp_path / "blobs"))
+    blob = store.put("cd" * 32, b"data", "jpg")
+    storage = FilesystemStorage(base_dir=str(tmp_path / "out"))
+    dest = storage.ensure_destination("exports")
+
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", cross_device)
+    path = storage.save_link(dest, "images/img_001.jpg", blob)
+
+    assert not os.path.islink(path)
+    # The output does not depend on the blob, so collecting it is harmless
+    assert collect_garbage(store, roots=[], min_age=0).removed == [blob]
+    with open(path, "rb") as f:
+        assert f.read() == b"data"
+
+
+def test_lookup_protects_old_blobs_from_collection(tmp_path):
+    store = ContentAddressedImageStore(str(tmp_path / "blobs"))
+    blob = store.put("ef" * 32, b"data", "jpg")
+    os.utime(blob, (0, 0))
+    assert store.lookup("ef" * 32) == blob
+    assert collect_garbage(store, min_age=3600).removed == []
+    # Outputs hard-linked to the blob share its mtime, so reuse must not change it
+    assert os.stat(blob).st_mtime == 0
+    assert list(store.iter_blobs()) == [blob]
+
+
+def test_collecting_a_blob_removes_its_use_marker(tmp_path):
+    store = ContentAddressedImageStore(str(tmp_path / "blobs"))
+    blob = store.put("ef" * 32, b"data", "jpg")
+    assert store.lookup("ef" * 32) == blob
+    assert collect_garbage(store, min_age=0).removed == [blob]
+    assert os.listdir(os.path.dirname(blob)) == []
+
+
+@pytest.mark.asyncio
+async def test_blob_collected_between_lookup_and_link_is_resized_again(tmp_path):
+    class CollectedStore(ContentAddressedImageStore):
+        def lookup(self, key):
+            path = super().lookup(key)
+            if path is not None:
+                os.remove(path)  # the garbage collector got there first
+            return path
+
+    store = CollectedStore(str(tmp_path / "blobs"))
+    storage = FilesystemStorage(base_dir=str(tmp_path / "out"))
+    image_ext = CountingImage()
+    usecase = ExtractUseCase(LogoHttp(), StubParser(), StubContent(), image_ext, storage, image_store=store)
+
+    await usecase.execute("https://shop.test/a", "a")
+    res = await usecase.execute("https://shop.test/b", "b")
+
+    assert res.image_filenames == ["images/img_001.jpg", "images/img_002.jpg"]
+    assert image_ext.resized == 4  # the shared logo was resized again instead of dropped
+    assert (tmp_path / "out" / "b" / "images" / "img_001.jpg").read_bytes() == b"resized:logo-bytes"
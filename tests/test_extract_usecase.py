@@ -1,7 +1,8 @@
+import asyncio
 import pytest
 from app.application.extract_usecase import ExtractUseCase
-from app.domain.ports import HttpClientPort, ContentExtractorPort, ImageExtractorPort, StoragePort
-from app.domain.models import ExtractionResult
+from app.domain.ports import HttpClientPort, HtmlParserPort, ContentExtractorPort, ImageExtractorPort, StoragePort
+from app.domain.models import ExtractionResult, ParsedPage
 
 
 class FakeHttp(HttpClientPort):
@@ -23,28 +24,36 @@ class FakeHttp(HttpClientPort):
         )
 
 
+class FakeParser(HtmlParserPort):
+    def __init__(self):
+        self.calls = 0
+    def parse(self, html: str, base_url: str) -> ParsedPage:
+        self.calls += 1
+        return ParsedPage(url=base_url, html=html, tree=None)
+
+
 class FakeContent(ContentExtractorPort):
-    def extract_markdown(self, html: str, base_url: str) -> str:
+    def extract_markdown(self, page: ParsedPage) -> str:
         return "# Title\n\nHello **world**."
 
 
-    class CaptureStorage(StoragePort):
-        def __init__(self):
-            self.saved = {}
-        def list_destinations(self):
-            return []
-        def ensure_destination(self, name: str) -> str:
-            return "/tmp/dest"
-        def save_markdown(self, dest: str, filename: str, content: str) -> str:
-            self.saved[filename] = content
-            return "/tmp/dest/" + filename
-        def save_binary(self, dest: str, filename: str, content: bytes) -> str:
-            self.saved[filename] = content
-            return "/tmp/dest/" + filename
+class CaptureStorage(StoragePort):
+    def __init__(self):
+        self.saved = {}
+    def list_destinations(self):
+        return []
+    def ensure_destination(self, name: str) -> str:
+        return "/tmp/dest"
+    def save_markdown(self, dest: str, filename: str, content: str) -> str:
+        self.saved[filename] = content
+        return "/tmp/dest/" + filename
+    def save_binary(self, dest: str, filename: str, content: bytes) -> str:
+        self.saved[filename] = content
+        return "/tmp/dest/" + filename
 
 
 class NoopImage(ImageExtractorPort):
-    def discover_image_urls(self, html: str, base_url: str):
+    def discover_image_urls(self, page: ParsedPage):
         return ["https://example.com/a.jpg"]
     def resize_image_square_max(self, content: bytes, max_px: int = 800):
         return content, "jpg"
@@ -52,7 +61,70 @@ class NoopImage(ImageExtractorPort):
 
 @pytest.mark.asyncio
 async def test_execute_happy_path():
-    usecase = ExtractUseCase(FakeHttp(), FakeContent(), NoopImage(), CaptureStorage())
+    parser = FakeParser()
+    usecase = ExtractUseCase(FakeHttp(), parser, FakeContent(), NoopImage(), CaptureStorage())
     res: ExtractionResult = await usecase.execute("https://example.com/article", "exports/test")
     assert "# Title" in res.markdown
-    assert len(res.image_filenames) == 1
\ No newline at end of file
+    assert len(res.image_filenames) == 1
+    assert parser.calls == 1
+
+class SlowHttp(FakeHttp):
+    """Completes image downloads out of order and fails one of them."""
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+    async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            idx = int(url.rsplit("/", 1)[-1].split(".")[0])
+            await asyncio.sleep(0.01 * (6 - idx))
+            if idx == 3:
+                raise IOError("broken image")
+            return await super().get_bytes(url, timeout)
+        finally:
+            self.in_flight -= 1
+
+
+class ManyImages(NoopImage):
+    def discover_image_urls(self, page: ParsedPage):
+        return [f"https://example.com/{i}.jpg" for i in range(1, 6)]
+
+
+@pytest.mark.asyncio
+async def test_execute_parallel_images_keep_order_and_skip_failures():
+    http = SlowHttp()
+    storage = CaptureStorage()
+    usecase = ExtractUseCase(http, FakeParser(), FakeContent(), ManyImages(), storage, image_concurrency=2)
+    res = await usecase.execute("https://example.com/article", "exports/test")
+    assert res.image_filenames == ["images/img_001.jpg", "images/img_002.jpg", "images/img_004.jpg", "images/img_005.jpg"]
+    assert http.max_in_flight == 2
+    assert "images/img_003.jpg" not in storage.saved
+
+
+class RealImageHttp(FakeHttp):
+    async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
+        from PIL import Image
+        import io
+        buf = io.BytesIO()
+        Image.new("RGB", (1200, 900), "white").save(buf, format="JPEG")
+        return buf.getvalue()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("engine", ["thread", "process"])
+async def test_execute_runs_cpu_stages_on_engine_pool(engine):
+    from app.containers import create_cpu_executor
+    from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+    from app.infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
+    from app.infrastructure.extraction.image_extractor import ImageExtractor
+
+    executor = create_cpu_executor(engine, 2)
+    try:
+        usecase = ExtractUseCase(RealImageHttp(), LxmlHtmlParser(), AccordionContentExtractor(), ImageExtractor(),
+                                 CaptureStorage(), cpu_executor=executor)
+        res = await usecase.execute("https://example.com/article", "exports/test")
+    finally:
+        executor.shutdown(wait=True)
+    assert "Hello" in res.markdown
+    assert res.image_filenames == ["images/img_001.jpg"]
@@ -0,0 +1,92 @@
+from lxml import etree
+from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+from app.infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
+from app.infrastructure.extraction.image_extractor import ImageExtractor, parse_srcset
+
+
+PAGE = """
+<html><body>
+<main><h1>Hydrating Cream</h1>
+<p>A rich, fast-absorbing cream for dry skin that keeps it soft all day long.</p>
+<img src="/img/a.jpg"/><img data-src="/img/b.jpg"/><img src="/img/a.jpg"/>
+<picture><source srcset="/img/c-400.jpg 400w, /img/c-800.jpg 800w"/></picture>
+<details><summary><h3>Ingredients</h3></summary>
+<div class="accordion__content">Aqua, Glycerin, Shea Butter<!-- note -->, Parfum</div></details>
+<details><summary>How to use</summary><p>Apply morning and evening.</p><script>track()</script></details>
+</main></body></html>
+"""
+
+
+def test_extractors_share_one_parsed_tree():
+    page = LxmlHtmlParser().parse(PAGE, "https://shop.example.com/p/cream")
+    before = etree.tostring(page.tree)
+
+    markdown = AccordionContentExtractor().extract_markdown(page)
+    urls = ImageExtractor().discover_image_urls(page)
+
+    assert "## Ingredients\nAqua, Glycerin, Shea Butter, Parfum" in markdown
+    assert "## How to use\nApply morning and evening." in markdown
+    assert "track()" not in markdown
+    assert urls == [
+        "https://shop.example.com/img/a.jpg",
+        "https://shop.example.com/img/b.jpg",
+        "https://shop.example.com/img/c-800.jpg",
+    ]
+    # Extractors must not modify the shared tree
+    assert etree.tostring(page.tree) == before
+
+
+RESPONSIVE = """
+<html><body>
+<img srcset="/a-400.jpg 400w, /a-1200.jpg 1200w, /a-4000.jpg 4000w" src="/a-4000.jpg">
+<img srcset="/b.jpg 1x, /b@2x.jpg 2x, /b@3x.jpg 3x" src="/b.jpg" width="500" height="300">
+<img srcset="/c-600.jpg 600w, /c-900.jpg 900w" width="600" height="900">
+<img src="data:image/gif;base64,R0lGOD" data-srcset="/d-300.jpg 300w, /d-1000.jpg 1000w">
+<picture>
+  <source type="image/x-unknown" srcset="/e.xyz 800w">
+  <source media="(max-width: 600px)" srcset="/e-mobile.jpg 800w">
+  <source type="image/webp" srcset="/e-800.webp 800w, /e-1600.webp 1600w">
+  <img src="/e.jpg" srcset="/e-800.jpg 800w, /e-1600.jpg 1600w">
+</picture>
+<picture><source type="image/webp" srcset="/f-1600.webp 1600w"><img src="/f-400.jpg" width="400"></picture>
+<video><source src="/clip.mp4" type="video/mp4"></video>
+</body></html>
+"""
+
+
+def test_responsive_images_pick_smallest_covering_candidate():
+    page = LxmlHtmlParser().parse(RESPONSIVE, "https://shop.example.com/")
+    urls = ImageExtractor().discover_image_urls(page)
+    assert urls == [
+        "https://shop.example.com/a-1200.jpg",
+        "https://shop.example.com/b@2x.jpg",  # 2 x 500 = 1000 >= 800
+        "https://shop.example.com/c-600.jpg",  # portrait: 600 wide is 900 tall
+        "https://shop.example.com/d-1000.jpg",
+        "https://shop.example.com/e-800.jpg",  # JPEG over WebP at the same size
+        "https://shop.example.com/f-1600.webp",  # the JPEG fallback is too small
+    ]
+    # WebP output prefers WebP sources; a larger target moves up the srcset
+    assert ImageExtractor(output_format="webp").discover_image_urls(page)[4] == "https://shop.example.com/e-800.webp"
+    assert ImageExtractor().discover_image_urls(page, max_px=1600)[0] == "https://shop.example.com/a-4000.jpg"
+
+
+def test_smaller_covering_candidate_beats_preferred_format():
+    page = LxmlHtmlParser().parse("""<html><body>
+    <img src="/a.jpg" srcset="/a-800.webp 800w, /a-1000.png 1000w, /a-4000.jpg 4000w">
+    <img srcset="/b-820.webp 820w, /b-900.jpg 900w, /b-3000.png 3000w">
+    <picture><source type="image/png" srcset="/c-850.png 850w"><img srcset="/c-2400.jpg 2400w"></picture>
+    </body></html>""", "https://shop.example.com/")
+    assert ImageExtractor().discover_image_urls(page) == [
+        "https://shop.example.com/a-800.webp",  # not the 4000px JPEG original
+        "https://shop.example.com/b-900.jpg",  # about the same size: JPEG decodes cheaper
+        "https://shop.example.com/c-850.png",
+    ]
+
+
+def test_parse_srcset_keeps_commas_inside_urls():
+    assert [(c.url, c.width, c.density) for c in parse_srcset(
+        "https://cdn.example.com/c_fill,w_300/a.jpg 300w,/b.jpg 1.5x, /c.jpg")] == [
+        ("https://cdn.example.com/c_fill,w_300/a.jpg", 300, None),
+        ("/b.jpg", None, 1.5),
+        ("/c.jpg", None, 1.0),
+    ]
@@ -0,0 +1,96 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.infrastructure.storage import filesystem_storage
+from app.infrastructure.storage.filesystem_storage import FilesystemStorage
+
+
+@pytest.mark.asyncio
+async def test_async_writes_are_atomic_and_off_the_loop(tmp_path, monkeypatch):
+    storage = FilesystemStorage(base_dir=str(tmp_path), async_writes=True)
+    dest = storage.ensure_destination("page")
+    writer_threads = []
+    real_write = storage._write_atomic
+    def spy(*args):
+        writer_threads.append(threading.get_ident())
+        return real_write(*args)
+    monkeypatch.setattr(storage, "_write_atomic", spy)
+
+    await storage.asave_binary(dest, "images/img_001.jpg", b"old")
+    await storage.asave_binary(dest, "images/img_001.jpg", b"new")
+    await storage.asave_markdown(dest, "page.md", "# Page")
+
+    assert (tmp_path / "page" / "images" / "img_001.jpg").read_bytes() == b"new"
+    assert (tmp_path / "page" / "page.md").read_text(encoding="utf-8") == "# Page"
+    assert threading.get_ident() not in writer_threads
+    leftovers = [n for _, _, files in os.walk(tmp_path) for n in files if n.endswith(".tmp")]
+    assert leftovers == []
+
+
+@pytest.mark.asyncio
+async def test_destination_is_created_off_the_loop(tmp_path, monkeypatch):
+    storage = FilesystemStorage(base_dir=str(tmp_path), async_writes=True)
+    makedirs_threads = []
+    real_makedirs = os.makedirs
+    def spy(*args, **kwargs):
+        makedirs_threads.append(threading.get_ident())
+        return real_makedirs(*args, **kwargs)
+    monkeypatch.setattr(filesystem_storage.os, "makedirs", spy)
+
+    dest = await storage.aensure_destination("page")
+
+    assert os.path.isdir(os.path.join(dest, "images"))
+    assert makedirs_threads and threading.get_ident() not in makedirs_threads
+
+
+@pytest.mark.asyncio
+async def test_fsync_is_batched_in_finalize(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(filesystem_storage.os, "fsync", lambda fd: synced.append(fd))
+    storage = FilesystemStorage(base_dir=str(tmp_path), fsync=True)
+    dest = storage.ensure_destination("page")
+    for i in range(3):
+        await storage.asave_binary(dest, f"images/img_{i:03d}.jpg", b"x")
+    assert synced == []
+    await storage.afinalize(dest)
+    assert len(synced) == 3 + 1  # three files, one directory
+    await storage.afinalize(dest)
+    assert len(synced) == 4
+
+
+@pytest.mark.asyncio
+async def test_linked_images_are_fsynced_in_finalize(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(filesystem_storage.os, "fsync", lambda fd: synced.append(fd))
+    storage = FilesystemStorage(base_dir=str(tmp_path), fsync=True)
+    dest = storage.ensure_destination("page")
+    blob = tmp_path / "blob.jpg"
+    blob.write_bytes(b"blob")
+    await storage.asave_link(dest, "images/img_001.jpg", str(blob))
+    await storage.afinalize(dest)
+    assert len(synced) == 1 + 1  # the link, its directory
+
+
+def test_writability_probe_runs_once_per_base_dir(tmp_path, monkeypatch):
+    probes = []
+    real_mkstemp = filesystem_storage.tempfile.mkstemp
+    def counting_mkstemp(*args, **kwargs):
+        if kwargs.get("prefix") == ".test_write":
+            probes.append(kwargs["dir"])
+        return real_mkstemp(*args, **kwargs)
+    monkeypatch.setattr(filesystem_storage.tempfile, "mkstemp", counting_mkstemp)
+    FilesystemStorage(base_dir=str(tmp_path / "out"))
+    FilesystemStorage(base_dir=str(tmp_path / "out"))
+    assert probes == [str(tmp_path / "out")]
+
+
+def test_concurrent_links_to_one_target_all_succeed(tmp_path):
+    storage = FilesystemStorage(base_dir=str(tmp_path))
+    dest = storage.ensure_destination("page")
+    blob = tmp_path / "blob.jpg"
+    blob.write_bytes(b"blob")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(lambda _: storage.save_link(dest, "images/img_001.jpg", str(blob)), range(64)))
+    assert set(paths) == {os.path.join(dest, "images", "img_001.jpg")}
+    assert os.listdir(os.path.join(dest, "images")) == ["img_001.jpg"]
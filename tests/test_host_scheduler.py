@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+from app.infrastructure.http.host_scheduler import AdaptiveHostScheduler, parse_retry_after
+from app.infrastructure.http.httpx_client import HttpxClient
+
+
+class ThrottlingServer:
+    """Local stub of a CDN that throttles.
+
+        /retry-after  429 with Retry-After: 1 on the first request, then 200
+        /slow-down    always 429 with Retry-After: 120
+        /flaky        503 twice, then 200
+        /down         always 503
+        /missing      404
+        /limited/...  429 whenever more than ``capacity`` requests are in flight
+    """
+
+    def __init__(self, capacity: int = 2):
+        self.capacity = capacity
+        self.hits = {}
+        self.times = []
+        self.in_flight = 0
+        self.max_served_in_flight = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+
+    def url(self, path: str) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    hits = server.hits[self.path] = server.hits.get(self.path, 0) + 1
+                    server.times.append(time.monotonic())
+                if self.path == "/retry-after" and hits == 1:
+                    return self._send(429, {"Retry-After": "1"})
+                if self.path == "/slow-down":
+                    return self._send(429, {"Retry-After": "120"})
+                if self.path == "/flaky" and hits <= 2 or self.path == "/down":
+                    return self._send(503)
+                if self.path == "/missing":
+                    return self._send(404)
+                if self.path.startswith("/limited/"):
+                    with server.lock:
+                        server.in_flight += 1
+                        busy = server.in_flight > server.capacity
+                        if busy:
+                            server.throttled += 1
+                        else:
+                            server.max_served_in_flight = max(server.max_served_in_flight, server.in_flight)
+                    try:
+                        if busy:
+                            return self._send(429)
+                        time.sleep(0.02)
+                        return self._send(200, body=b"ok")
+                    finally:
+                        with server.lock:
+                            server.in_flight -= 1
+                return self._send(200, body=b"ok")
+
+            def _send(self, status, headers=None, body=b""):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    with ThrottlingServer() as s:
+        yield s
+
+
+def make_scheduler(**kwargs) -> AdaptiveHostScheduler:
+    options = dict(initial_concurrency=8, max_concurrency=8, base_delay_s=0.01, deadline_s=5.0)
+    options.update(kwargs)
+    return AdaptiveHostScheduler(HttpxClient(), **options)
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after(server):
+    http = make_scheduler()
+    try:
+        assert await http.get_text(server.url("/retry-after")) == "ok"
+    finally:
+        await http.aclose()
+    assert server.hits["/retry-after"] == 2
+    assert server.times[1] - server.times[0] >= 0.9
+
+
+@pytest.mark.asyncio
+async def test_retry_after_beyond_the_deadline_is_not_shortened(server):
+    # max_delay_s only bounds the backoff; a server asking for 120s gets them
+    http = make_scheduler(max_delay_s=0.2, deadline_s=1.0)
+    started = time.monotonic()
+    try:
+        with pytest.raises(httpx.HTTPStatusError) as error:
+            await http.get_bytes(server.url("/slow-down"))
+        assert error.value.response.status_code == 429
+        # The host stays paused: other requests to it give up instead of hitting it
+        with pytest.raises(TimeoutError):
+            await http.get_bytes(server.url("/ok"))
+    finally:
+        await http.aclose()
+    assert time.monotonic() - started < 2.0
+    assert server.hits == {"/slow-down": 1}
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_but_not_client_errors(server):
+    http = make_scheduler()
+    try:
+        assert await http.get_bytes(server.url("/flaky")) == b"ok"
+        with pytest.raises(httpx.HTTPStatusError):
+            await http.get_bytes(server.url("/missing"))
+    finally:
+        await http.aclose()
+    assert server.hits["/flaky"] == 3
+    assert server.hits["/missing"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_at_the_deadline(server):
+    http = make_scheduler(max_attempts=1000, base_delay_s=0.05, max_delay_s=0.1, deadline_s=0.5)
+    started = time.monotonic()
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await http.get_bytes(server.url("/down"))
+    finally:
+        await http.aclose()
+    assert time.monotonic() - started < 1.5
+    assert 1 < server.hits["/down"] < 1000
+
+
+@pytest.mark.asyncio
+async def test_adapts_concurrency_to_a_throttling_host(server):
+    http = make_scheduler(max_attempts=20, max_delay_s=0.2)
+    host = server.url("").split("//", 1)[1]
+    try:
+        first = await asyncio.gather(*[http.get_image_bytes(server.url(f"/limited/a{i}")) for i in range(30)])
+        throttled_first = server.throttled
+        limit = http.host_limit(host)
+        second = await asyncio.gather(*[http.get_image_bytes(server.url(f"/limited/b{i}")) for i in range(30)])
+        throttled_second = server.throttled - throttled_first
+    finally:
+        await http.aclose()
+    assert first == [b"ok"] * 30 and second == [b"ok"] * 30
+    # The limit came down from 8 towards the host's capacity, so the second wave is throttled far less
+    assert limit < 8
+    assert throttled_second < throttled_first
+
+
+def test_parse_retry_after():
+    now = time.time()
+    assert parse_retry_after("120") == 120.0
+    assert 29 <= parse_retry_after(formatdate(now + 30, usegmt=True), now=now) <= 31
+    assert parse_retry_after(formatdate(now - 30, usegmt=True), now=now) == 0.0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
@@ -0,0 +1,76 @@
+import httpx
+import pytest
+from app.infrastructure.http.disk_cache import DiskCache
+from app.infrastructure.http.httpx_client import HttpxClient
+
+
+class Origin:
+    """Mock origin that honours conditional requests and counts body downloads."""
+    def __init__(self):
+        self.version = "v1"
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        etag = f'"{path}-{self.version}"'
+        if path == "/fresh.jpg":
+            return httpx.Response(200, content=b"x" * 100, headers={"Cache-Control": "max-age=3600"})
+        if path == "/nostore.jpg":
+            return httpx.Response(200, content=b"n" * 10, headers={"Cache-Control": "no-store", "ETag": etag})
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        body = f"<html><body>page {self.version}</body></html>".encode("utf-8")
+        return httpx.Response(200, content=body, headers={"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+
+def make_client(tmp_path, origin, max_bytes=10_000):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=max_bytes)
+    return HttpxClient(cache=cache, transport=httpx.MockTransport(origin)), cache
+
+
+@pytest.mark.asyncio
+async def test_revalidates_with_etag_and_serves_fresh_hits(tmp_path):
+    origin = Origin()
+    client, cache = make_client(tmp_path, origin)
+    try:
+        assert await client.get_text("https://shop.test/p") == "<html><body>page v1</body></html>"
+        assert await client.get_text("https://shop.test/p") == "<html><body>page v1</body></html>"
+        assert origin.requests[-1].headers["if-none-match"] == '"/p-v1"'
+
+        origin.version = "v2"
+        assert "page v2" in await client.get_text("https://shop.test/p")
+
+        await client.get_bytes("https://shop.test/fresh.jpg")
+        sent = len(origin.requests)
+        assert await client.get_bytes("https://shop.test/fresh.jpg") == b"x" * 100
+        assert len(origin.requests) == sent  # max-age hit: no request at all
+
+        await client.get_bytes("https://shop.test/nostore.jpg")
+        await client.get_bytes("https://shop.test/nostore.jpg")
+    finally:
+        await client.aclose()
+
+    stats = cache.stats
+    assert (stats.hits, stats.revalidations, stats.misses) == (1, 1, 5)
+    assert stats.bytes_saved == 100 + len(b"<html><body>page v1</body></html>")
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_keeps_cache_within_size(tmp_path):
+    origin = Origin()
+    client, cache = make_client(tmp_path, origin, max_bytes=250)
+    try:
+        for i in range(5):
+            await client.get_bytes(f"https://shop.test/fresh.jpg?i={i}")
+        # Touch the oldest surviving entry so it outlives the next insert
+        await client.get_bytes("https://shop.test/fresh.jpg?i=3")
+        await client.get_bytes("https://shop.test/fresh.jpg?i=5")
+    finally:
+        await client.aclose()
+    assert cache.total_bytes <= 250
+    assert cache.get("https://shop.test/fresh.jpg?i=3") is not None
+    assert cache.get("https://shop.test/fresh.jpg?i=4") is None
+    # The index is rebuilt from disk in LRU order
+    reopened = DiskCache(str(tmp_path / "cache"), max_bytes=250)
+    assert reopened.total_bytes == cache.total_bytes
@@ -0,0 +1,70 @@
+import io
+import pytest
+from PIL import Image
+from app.infrastructure.extraction.image_extractor import ImageExtractor
+
+
+def _encode(size, mode="RGB", fmt="JPEG", transparent=False) -> bytes:
+    im = Image.linear_gradient("L").resize(size).convert(mode)
+    if transparent:
+        im.putalpha(Image.linear_gradient("L").resize(size))
+    buf = io.BytesIO()
+    im.save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def _open(content: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(content))
+
+
+def test_small_jpeg_passes_through_unchanged():
+    source = _encode((640, 480))
+    out, ext = ImageExtractor().resize_image_square_max(source, 800)
+    assert (out, ext) == (source, "jpg")
+
+    out, ext = ImageExtractor(passthrough=False).resize_image_square_max(source, 800)
+    assert ext == "jpg" and out != source and _open(out).size == (640, 480)
+
+
+def test_large_jpeg_is_resized():
+    out, ext = ImageExtractor().resize_image_square_max(_encode((2000, 1000)), 800)
+    assert ext == "jpg" and _open(out).size == (800, 400)
+
+
+@pytest.mark.parametrize("keep_alpha,ext,mode", [(True, "png", "RGBA"), (False, "jpg", "RGB")])
+def test_transparent_images_keep_alpha_as_png(keep_alpha, ext, mode):
+    source = _encode((1600, 400), "RGBA", "PNG", transparent=True)
+    out, out_ext = ImageExtractor(keep_alpha=keep_alpha).resize_image_square_max(source, 800)
+    assert out_ext == ext and _open(out).mode == mode and _open(out).size == (800, 200)
+
+    # A logo that already fits passes through only while alpha is kept
+    small = _encode((240, 80), "RGBA", "PNG", transparent=True)
+    out, out_ext = ImageExtractor(keep_alpha=keep_alpha).resize_image_square_max(small, 800)
+    assert out_ext == ext and (out == small) == keep_alpha
+
+
+def test_opaque_png_is_converted_to_the_output_format():
+    source = _encode((1600, 400), "RGBA", "PNG")
+    assert ImageExtractor().resize_image_square_max(source, 800)[1] == "jpg"
+    assert ImageExtractor().resize_image_square_max(_encode((240, 80), "RGB", "PNG"), 800)[1] == "jpg"
+    assert ImageExtractor().resize_image_square_max(_encode((240, 80), "RGBA", "PNG"), 800)[1] == "jpg"
+
+
+def test_webp_output_keeps_alpha_and_passes_webp_through():
+    extractor = ImageExtractor(output_format="webp", preset="fast")
+    out, ext = extractor.resize_image_square_max(_encode((640, 480)), 800)
+    assert ext == "webp" and _open(out).format == "WEBP"
+    assert extractor.resize_image_square_max(out, 800) == (out, "webp")
+    out, ext = extractor.resize_image_square_max(_encode((1600, 400), "RGBA", "PNG", transparent=True), 800)
+    assert ext == "webp" and _open(out).mode == "RGBA"
+
+
+def test_output_variant_reflects_encoder_settings():
+    variants = {ImageExtractor(output_format=fmt, preset=preset, quality=quality).output_variant(800)
+                for fmt in ("jpeg", "webp") for preset in ("fast", "balanced", "small") for quality in (None, 70)}
+    assert len(variants) == 12
+    assert ImageExtractor().output_variant(800) != ImageExtractor(passthrough=False).output_variant(800)
+    with pytest.raises(ValueError):
+        ImageExtractor(output_format="gif")
+    with pytest.raises(ValueError):
+        ImageExtractor(preset="fastest")
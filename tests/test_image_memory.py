@@ -0,0 +1,60 @@
+import io
+import subprocess
+import sys
+import textwrap
+import httpx
+import pytest
+from PIL import Image
+from app.domain.errors import FetchRejected
+from app.infrastructure.http.httpx_client import HttpxClient
+
+
+PEAK_RSS_SCRIPT = textwrap.dedent("""
+    import resource, sys
+    from PIL import Image
+    from app.infrastructure.extraction.image_extractor import ImageExtractor
+    data = open(sys.argv[1], "rb").read()
+    extractor = ImageExtractor()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out, ext = extractor.resize_image_square_max(data, 800)
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(after - before, *Image.open(__import__("io").BytesIO(out)).size)
+""")
+
+
+def test_large_jpeg_resize_peak_rss(tmp_path):
+    path = tmp_path / "hero.jpg"
+    Image.linear_gradient("L").resize((6000, 4000)).convert("RGB").save(path, format="JPEG", quality=90)
+    # Fresh interpreter so ru_maxrss reflects only this resize (Linux reports KiB)
+    out = subprocess.run([sys.executable, "-c", PEAK_RSS_SCRIPT, str(path)],
+                         capture_output=True, text=True, check=True).stdout.split()
+    peak_kib, width, height = (int(v) for v in out)
+    assert (width, height) == (800, 533)
+    # A full-resolution RGB decode alone needs ~70 MiB
+    assert peak_kib < 32 * 1024, f"resize grew peak RSS by {peak_kib} KiB"
+
+
+def _image_server(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/page.jpg":
+        return httpx.Response(200, content=b"<html>", headers={"Content-Type": "text/html"})
+    if request.url.path == "/declared.jpg":
+        return httpx.Response(200, content=b"x" * 5000, headers={"Content-Type": "image/jpeg"})
+
+    async def chunks():
+        for _ in range(10):
+            yield b"x" * 1000
+    return httpx.Response(200, content=chunks(), headers={"Content-Type": "image/jpeg"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path,reason", [("/page.jpg", "content-type"), ("/declared.jpg", "too-large"),
+                                         ("/chunked.jpg", "too-large")])
+async def test_image_fetch_rejects_before_buffering(path, reason):
+    client = HttpxClient(transport=httpx.MockTransport(_image_server))
+    try:
+        with pytest.raises(FetchRejected) as exc:
+            await client.get_image_bytes("https://cdn.test" + path, max_bytes=4096)
+        assert exc.value.reason == reason
+        assert len(await client.get_image_bytes("https://cdn.test/chunked.jpg", max_bytes=20_000)) == 10_000
+    finally:
+        await client.aclose()
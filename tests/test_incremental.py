@@ -0,0 +1,82 @@
+import json
+import os
+import pytest
+from app.application.extract_usecase import ExtractUseCase
+from app.domain.ports import HttpClientPort
+from app.infrastructure.storage.filesystem_storage import FilesystemStorage
+from test_extract_usecase import FakeParser, FakeContent, NoopImage
+
+
+class SiteHttp(HttpClientPort):
+    """Serves a mutable page and image set and counts image downloads."""
+    def __init__(self):
+        self.html = "<html><body><p>v1</p></body></html>"
+        self.images = {f"https://example.com/{i}.jpg": f"image-{i}".encode() for i in range(1, 4)}
+        self.image_fetches = []
+    async def get_text(self, url: str, timeout: float = 20.0) -> str:
+        return self.html
+    async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
+        self.image_fetches.append(url)
+        return self.images[url]
+
+
+class SiteImages(NoopImage):
+    def __init__(self, http: SiteHttp):
+        self.http = http
+    def discover_image_urls(self, page):
+        return list(self.http.images)
+
+
+def _usecase(http, parser, tmp_path):
+    storage = FilesystemStorage(base_dir=str(tmp_path))
+    return ExtractUseCase(http, parser, FakeContent(), SiteImages(http), storage, incremental=True)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_skipped(tmp_path):
+    http, parser = SiteHttp(), FakeParser()
+    first = await _usecase(http, parser, tmp_path).execute("https://example.com/p", "out")
+    assert not first.skipped and first.skipped_images == []
+    manifest = json.loads((tmp_path / "out" / "https---example-com-p.manifest.json").read_text())
+    assert [image["url"] for image in manifest["images"]] == list(http.images)
+
+    http.image_fetches.clear()
+    again = await _usecase(http, parser, tmp_path).execute("https://example.com/p", "out")
+    assert again.skipped
+    assert again.markdown == first.markdown
+    assert again.image_filenames == again.skipped_images == first.image_filenames
+    assert http.image_fetches == [] and parser.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_page_rewrites_only_new_changed_or_missing_images(tmp_path):
+    http, parser = SiteHttp(), FakeParser()
+    await _usecase(http, parser, tmp_path).execute("https://example.com/p", "out")
+
+    http.html = "<html><body><p>v2</p></body></html>"
+    del http.images["https://example.com/2.jpg"]
+    http.images["https://example.com/2-new.jpg"] = b"image-2-new"
+    http.images = dict(sorted(http.images.items(), key=lambda item: item[0]))  # 1, 2-new, 3
+    os.remove(tmp_path / "out" / "images" / "img_003.jpg")
+    http.image_fetches.clear()
+
+    res = await _usecase(http, parser, tmp_path).execute("https://example.com/p", "out")
+    assert not res.skipped and parser.calls == 2
+    # Every image is revalidated; only the unchanged one at its old position is kept
+    assert sorted(http.image_fetches) == sorted(http.images)
+    assert res.skipped_images == ["images/img_001.jpg"]
+    assert (tmp_path / "out" / "images" / "img_002.jpg").read_bytes() == b"image-2-new"
+    assert (tmp_path / "out" / "images" / "img_003.jpg").exists()
+
+
+@pytest.mark.asyncio
+async def test_image_replaced_at_the_same_url_is_updated(tmp_path):
+    http, parser = SiteHttp(), FakeParser()
+    await _usecase(http, parser, tmp_path).execute("https://example.com/p", "out")
+
+    http.html = "<html><body><p>v2</p></body></html>"
+    http.images["https://example.com/1.jpg"] = b"image-1-reshot"
+    res = await _usecase(http, parser, tmp_path).execute("https://example.com/p", "out")
+
+    assert res.skipped_images == ["images/img_002.jpg", "images/img_003.jpg"]
+    assert (tmp_path / "out" / "images" / "img_001.jpg").read_bytes() == b"image-1-reshot"
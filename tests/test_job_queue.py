@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from app.application.extract_usecase import ExtractUseCase
+from app.application.job_queue import ExtractionJobQueue
+from app.domain.errors import JobQueueFull
+from app.domain.models import ExtractionResult
+from test_extract_usecase import FakeParser, FakeContent, CaptureStorage, FakeHttp, ManyImages
+
+
+class GatedUseCase:
+    """Stands in for ExtractUseCase; each extraction waits until released."""
+    def __init__(self, images: int = 3):
+        self.images = images
+        self.release = asyncio.Event()
+        self.running = 0
+        self.max_running = 0
+
+    async def execute(self, url: str, destination_name: str, progress=None) -> ExtractionResult:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            progress(0, self.images)
+            await self.release.wait()
+            if url.endswith("/broken"):
+                raise ValueError("404 Not Found")
+            for done in range(1, self.images + 1):
+                progress(done, self.images)
+            return ExtractionResult(markdown="# ok", image_filenames=[f"images/img_{i:03d}.jpg" for i in range(self.images)])
+        finally:
+            self.running -= 1
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_pool_size_bounds_running_jobs_and_full_queue_rejects():
+    usecase = GatedUseCase()
+    queue = ExtractionJobQueue(workers=2, max_queued=2)
+    queue.start()
+    try:
+        jobs = [queue.submit(f"https://example.com/{i}", "out", usecase) for i in range(2)]
+        await _wait_for(lambda: usecase.running == 2)
+        jobs += [queue.submit(f"https://example.com/{i}", "out", usecase) for i in range(2, 4)]
+        with pytest.raises(JobQueueFull):
+            queue.submit("https://example.com/overflow", "out", usecase)
+
+        assert [job.status for job in jobs] == ["running", "running", "queued", "queued"]
+        assert jobs[0].images_done == 0 and jobs[0].images_total == 3
+
+        usecase.release.set()
+        await _wait_for(lambda: all(job.finished for job in jobs))
+        assert usecase.max_running == 2
+        assert all(job.status == "done" and job.images_done == 3 for job in jobs)
+        assert queue.get(jobs[0].id).result.image_filenames[0] == "images/img_000.jpg"
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_reports_error_and_expires():
+    usecase = GatedUseCase()
+    usecase.release.set()
+    queue = ExtractionJobQueue(workers=1, max_queued=1, retention_s=0.05)
+    queue.start()
+    try:
+        job = queue.submit("https://example.com/broken", "out", usecase)
+        await _wait_for(lambda: job.finished)
+        assert job.status == "error" and job.error == "404 Not Found"
+        await asyncio.sleep(0.1)
+        assert queue.get(job.id) is None
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_execute_reports_image_progress():
+    reports = []
+    usecase = ExtractUseCase(FakeHttp(), FakeParser(), FakeContent(), ManyImages(), CaptureStorage())
+    res = await usecase.execute("https://example.com/article", "exports/test",
+                                progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(done, 5) for done in range(6)]
+    assert len(res.image_filenames) == 5
+
+
+def test_job_endpoints(tmp_path):
+    import time
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        # Nothing listens on port 9, so the job fails quickly without network access
+        resp = client.post("/extract/jobs", data={"url": "http://127.0.0.1:9/page", "new_destination": str(tmp_path)})
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+        assert resp.headers["location"] == f"/extract/jobs/{job_id}"
+        deadline = time.monotonic() + 5
+        while (status := client.get(f"/extract/jobs/{job_id}").json())["status"] in ("queued", "running"):
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+        assert status["status"] == "error" and status["result"] is None
+        assert client.get("/extract/jobs/unknown").status_code == 404
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.application.job_worker import JobWorker
+from app.domain.models import ExtractionResult
+from app.infrastructure.jobs.sqlite_job_store import SqliteJobStore
+
+
+def _result(n: int = 1) -> ExtractionResult:
+    return ExtractionResult(markdown="# ok", image_filenames=[f"images/img_{i:03d}.jpg" for i in range(1, n + 1)])
+
+
+def test_claim_renew_complete(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.enqueue("https://example.com/a", "out")
+    assert store.count_queued() == 1
+
+    claimed = store.claim("w1", lease_s=60)
+    assert claimed.id == job.id and claimed.status == "running" and claimed.attempts == 1
+    assert store.claim("w2", lease_s=60) is None
+    assert store.renew(job.id, "w1", 60, images_done=1, images_total=2)
+    assert not store.renew(job.id, "w2", 60)
+    assert store.complete(job.id, "w1", _result(2))
+
+    done = store.get(job.id)
+    assert done.status == "done" and done.images_done == 2 and done.finished_at is not None
+    assert done.result == _result(2)
+    assert store.prune(older_than_s=-1) == 1 and store.get(job.id) is None
+
+
+def test_concurrent_claims_never_share_a_job(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+    ids = {store.enqueue(f"https://example.com/{i}", "out").id for i in range(40)}
+
+    def drain(worker: str):
+        claimed = []
+        while (job := store.claim(worker, lease_s=60)) is not None:
+            claimed.append(job.id)
+        return claimed
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        claimed = [job_id for ids_ in pool.map(drain, [f"w{i}" for i in range(8)]) for job_id in ids_]
+    assert sorted(claimed) == sorted(ids)
+
+
+def test_expired_lease_is_reclaimed_until_attempts_run_out(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+    job = store.enqueue("https://example.com/a", "out")
+    store.claim("dead", lease_s=-1)
+
+    retried = store.claim("w2", lease_s=-1)
+    assert retried.id == job.id and retried.attempts == 2
+    # The first worker no longer owns the job
+    assert not store.complete(job.id, "dead", _result())
+
+    assert store.claim("w3", lease_s=60) is None
+    assert store.get(job.id).status == "error"
+
+
+def test_fail_retries_then_errors_and_release_keeps_attempts(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+    job = store.enqueue("https://example.com/a", "out")
+
+    store.claim("w1", lease_s=60)
+    assert store.fail(job.id, "w1", "timeout", retry_delay_s=60)
+    assert store.get(job.id).status == "queued"
+    assert store.claim("w1", lease_s=60) is None  # waiting for the retry delay
+
+    other = store.enqueue("https://example.com/b", "out")
+    store.claim("w1", lease_s=60)
+    assert store.release(other.id, "w1")
+    assert store.get(other.id).attempts == 0 and store.get(other.id).status == "queued"
+
+    store = SqliteJobStore(store.path, max_attempts=1)
+    store.claim("w1", lease_s=60)
+    assert store.fail(other.id, "w1", "404 Not Found")
+    failed = store.get(other.id)
+    assert failed.status == "error" and failed.error == "404 Not Found"
+
+
+class FakeUseCase:
+    def __init__(self, gate: asyncio.Event = None):
+        self.gate = gate
+
+    async def execute(self, url: str, destination_name: str, progress=None) -> ExtractionResult:
+        progress(0, 2)
+        if self.gate is not None:
+            await self.gate.wait()
+        if url.endswith("/broken"):
+            raise ValueError("404 Not Found")
+        progress(2, 2)
+        return _result(2)
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_and_retries_failures(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+    ok = [store.enqueue(f"https://example.com/{i}", "out").id for i in range(5)]
+    broken = store.enqueue("https://example.com/broken", "out").id
+    destinations = []
+
+    def factory(dest_path):
+        destinations.append(dest_path)
+        return FakeUseCase()
+
+    worker = JobWorker(store, factory, "w1", concurrency=3, retry_delay_s=0)
+    await worker.run(drain=True)
+
+    assert worker.processed == 5 and worker.failed == 2
+    assert all(store.get(job_id).status == "done" for job_id in ok)
+    assert store.get(ok[0]).result.image_filenames == ["images/img_001.jpg", "images/img_002.jpg"]
+    assert store.get(broken).status == "error" and store.get(broken).attempts == 2
+    assert set(destinations) == {"out"}
+
+
+@pytest.mark.asyncio
+async def test_stopping_worker_releases_running_job(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.enqueue("https://example.com/a", "out")
+    worker = JobWorker(store, lambda dest_path: FakeUseCase(asyncio.Event()), "w1", lease_s=0.3)
+    stop = asyncio.Event()
+    running = asyncio.create_task(worker.run(stop))
+
+    deadline = time.monotonic() + 2
+    while store.get(job.id).images_total != 2:
+        # Progress arrives with the lease renewals
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.02)
+    stop.set()
+    await running
+
+    released = store.get(job.id)
+    assert released.status == "queued" and released.attempts == 0
+
+
+def test_sqlite_backend_only_enqueues(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.config import settings
+    from app.main import app
+    from app.worker import main as worker_main
+
+    db = str(tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(settings, "job_backend", "sqlite")
+    monkeypatch.setattr(settings, "job_db_path", db)
+    with TestClient(app) as client:
+        resp = client.post("/extract/jobs", data={"url": "http://127.0.0.1:9/page", "new_destination": str(tmp_path)})
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+        time.sleep(0.1)
+        assert client.get(f"/extract/jobs/{job_id}").json()["status"] == "queued"
+
+    # Nothing listens on port 9: the attempt fails and the job waits for its retry
+    assert worker_main(["--db", db, "--drain"]) == 0
+    job = SqliteJobStore(db).get(job_id)
+    assert job.status == "queued" and job.attempts == 1 and job.error
@@ -0,0 +1,53 @@
+import json
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from app.application.extract_usecase import ExtractUseCase
+from app.infrastructure.observability.prometheus_metrics import PrometheusMetrics
+from app.main import app
+from test_extract_usecase import FakeHttp, FakeParser, FakeContent, CaptureStorage, NoopImage
+
+
+class BrokenImage(NoopImage):
+    def resize_image_square_max(self, content: bytes, max_px: int = 800):
+        raise OSError("cannot identify image file")
+
+
+@pytest.mark.asyncio
+async def test_stage_timings_and_skipped_images_are_exported():
+    metrics = PrometheusMetrics()
+    usecase = ExtractUseCase(FakeHttp(), FakeParser(), FakeContent(), BrokenImage(), CaptureStorage(),
+                             metrics=metrics)
+    res = await usecase.execute("https://example.com/article", "exports/test")
+    assert res.image_filenames == []
+
+    body, content_type = metrics.render()
+    text = body.decode()
+    assert content_type.startswith("text/plain")
+    for stage in ("fetch_page", "parse", "extract_content", "discover_images", "download_image",
+                  "resize_image", "save_markdown"):
+        assert f'extract_stage_duration_seconds_count{{stage="{stage}"}} 1.0' in text
+    assert 'extract_images_skipped_total{reason="resize_image_failed"} 1.0' in text
+    assert 'extract_bytes_fetched_total{kind="page"}' in text
+    # Best-effort image failures are skips, not stage errors
+    assert "extract_errors_total{" not in text
+
+
+@pytest.mark.asyncio
+async def test_trace_log_is_one_json_line(caplog):
+    usecase = ExtractUseCase(FakeHttp(), FakeParser(), FakeContent(), NoopImage(), CaptureStorage(),
+                             trace_logs=True)
+    with caplog.at_level(logging.INFO, logger="app.trace"):
+        await usecase.execute("https://example.com/article", "exports/test")
+    [record] = [r for r in caplog.records if r.name == "app.trace"]
+    trace = json.loads(record.getMessage())
+    assert trace["status"] == "ok"
+    assert trace["host"] == "example.com"
+    assert {"fetch_page", "parse", "save_markdown"} <= set(trace["stage_totals_ms"])
+
+
+def test_metrics_endpoint():
+    with TestClient(app) as client:
+        resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert "extract_stage_duration_seconds" in resp.text
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import pytest
+from contextlib import aclosing
+from fastapi.testclient import TestClient
+from app.application.extract_usecase import ExtractUseCase
+from app.containers import http_client_provider
+from app.domain.models import ExtractionFinished, ImageProcessed, MarkdownReady
+from app.main import app
+from test_extract_usecase import FakeHttp, FakeParser, FakeContent, CaptureStorage, ManyImages, RealImageHttp, SlowHttp
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_markdown_first_then_images_as_they_finish():
+    storage = CaptureStorage()
+    usecase = ExtractUseCase(SlowHttp(), FakeParser(), FakeContent(), ManyImages(), storage, image_concurrency=5)
+    events = [event async for event in usecase.stream("https://example.com/article", "exports/test")]
+
+    assert events[0] == MarkdownReady(markdown="# Title\n\nHello **world**.", image_count=5)
+    images = events[1:-1]
+    assert all(isinstance(event, ImageProcessed) for event in images)
+    # SlowHttp finishes the last image first; image 3 is broken
+    assert [event.index for event in images] == [5, 4, 3, 2, 1]
+    assert [event.done for event in images] == [1, 2, 3, 4, 5]
+    assert images[2].filename is None and images[0].filename == "images/img_005.jpg"
+
+    assert isinstance(events[-1], ExtractionFinished)
+    result = events[-1].result
+    assert result.image_filenames == ["images/img_001.jpg", "images/img_002.jpg", "images/img_004.jpg", "images/img_005.jpg"]
+    assert storage.saved["https---example-com-article.md"] == result.markdown
+
+
+class StalledHttp(FakeHttp):
+    """Serves image 1 at once; the others never finish."""
+    def __init__(self):
+        self.cancelled = 0
+    async def get_bytes(self, url: str, timeout: float = 20.0) -> bytes:
+        if not url.endswith("/1.jpg"):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return await super().get_bytes(url, timeout)
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_pending_images():
+    http = StalledHttp()
+    storage = CaptureStorage()
+    usecase = ExtractUseCase(http, FakeParser(), FakeContent(), ManyImages(), storage)
+    async with aclosing(usecase.stream("https://example.com/article", "exports/test")) as events:
+        assert isinstance(await anext(events), MarkdownReady)
+        first = await anext(events)
+        assert first.index == 1 and first.filename == "images/img_001.jpg"
+    assert http.cancelled == 4
+    assert not any(name.endswith(".md") for name in storage.saved)
+
+
+def test_stream_endpoint_sends_ndjson_and_sse(tmp_path):
+    app.dependency_overrides[http_client_provider] = RealImageHttp
+    try:
+        with TestClient(app) as client:
+            resp = client.post("/extract/stream", data={"url": "https://example.com/article",
+                                                        "new_destination": str(tmp_path)})
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("application/x-ndjson")
+            events = [json.loads(line) for line in resp.text.splitlines()]
+            assert [event["event"] for event in events] == ["markdown", "image", "result"]
+            assert "Hello" in events[0]["markdown"] and events[0]["image_count"] == 1
+            assert events[1]["filename"] == events[2]["result"]["image_filenames"][0]
+
+            # A fresh destination, or the unchanged page would be skipped
+            resp = client.post("/extract/stream", headers={"Accept": "text/event-stream"},
+                               data={"url": "https://example.com/article", "new_destination": str(tmp_path / "sse")})
+            assert resp.headers["content-type"].startswith("text/event-stream")
+            blocks = [block.split("\n") for block in resp.text.strip().split("\n\n")]
+            assert [block[0] for block in blocks] == ["event: markdown", "event: image", "event: result"]
+            assert json.loads(blocks[-1][1].removeprefix("data: "))["result"]["skipped"] is False
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_stream_endpoint_reports_failure_as_last_event(tmp_path):
+    with TestClient(app) as client:
+        # Nothing listens on port 9
+        resp = client.post("/extract/stream", data={"url": "http://127.0.0.1:9/page", "new_destination": str(tmp_path)})
+        assert resp.status_code == 200
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert [event["event"] for event in events] == ["error"]
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+import app.main as main
+from app.application.extract_usecase import analyze_page
+from app.application.warmup import SAMPLE_PAGE, SAMPLE_URL, warm_up
+from app.config import settings
+from app.infrastructure.extraction.accordion_content_extractor import AccordionContentExtractor
+from app.infrastructure.extraction.image_extractor import ImageExtractor
+from app.infrastructure.extraction.lxml_html_parser import LxmlHtmlParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_app_leaves_heavy_libraries_unloaded():
+    code = ("import sys, app.main; "
+            "print(','.join(m for m in ('trafilatura', 'lxml', 'PIL', 'bs4') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_sample_page_exercises_every_extractor():
+    markdown, urls, _ = analyze_page(LxmlHtmlParser(), AccordionContentExtractor(), ImageExtractor(),
+                                     SAMPLE_PAGE, SAMPLE_URL)
+    assert "shea butter" in markdown
+    assert "## Ingredients" in markdown
+    assert len(urls) == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_up_reports_failures_without_raising():
+    class BrokenImages(ImageExtractor):
+        def resize_image_square_max(self, content, max_px=800):
+            raise OSError("no codec")
+
+    assert await warm_up(LxmlHtmlParser(), [AccordionContentExtractor()], BrokenImages()) >= 0
+
+
+def test_ready_waits_for_warm_up(monkeypatch):
+    gate = threading.Event()
+
+    async def slow_warm_up(cpu_executor):
+        await asyncio.to_thread(gate.wait, 5)
+        return 0.25
+
+    monkeypatch.setattr(settings, "warmup", True)
+    monkeypatch.setattr(main, "warm_up_extractors", slow_warm_up)
+    with TestClient(main.app) as client:
+        assert client.get("/ready").status_code == 503
+        # The server answers other requests meanwhile
+        assert client.get("/").status_code == 200
+        gate.set()
+        deadline = time.monotonic() + 5
+        while (resp := client.get("/ready")).status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    assert resp.json() == {"status": "ready", "warmup_s": 0.25}
+
+
+def test_ready_without_warm_up(monkeypatch):
+    monkeypatch.setattr(settings, "warmup", False)
+    with TestClient(main.app) as client:
+        assert client.get("/ready").json() == {"status": "ready", "warmup_s": None}